@@ -0,0 +1,154 @@
+"""
+@file       accumulator.py
+@author     Matthew Yu (matthewjkyu@gmail.com)
+@brief      Constant memory statistics over streams of samples.
+@version    0.4.0
+@date       2026-10-19
+"""
+
+import numpy as np
+
+
+class RunningStats:
+    """Count, mean, variance, minimum and maximum of every sample seen so far,
+    updated a chunk at a time by merging the statistics of the chunk into the
+    running ones. Memory does not grow with the length of the stream.
+
+    Samples are stacked along the first axis of each chunk; the remaining axes,
+    such as one per scenario of a batch, are kept separate.
+    """
+
+    def __init__(self) -> None:
+        self.setup()
+
+    def setup(self) -> None:
+        """Forget every sample seen."""
+        self.count = 0
+        self.mean = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+        self._m2 = 0.0
+
+    def update(self, values) -> None:
+        """Add a chunk of samples.
+
+        Args:
+            values (float | np.ndarray): Sample, or samples along the first
+                axis.
+        """
+        values = np.asarray(values, dtype=float)
+        if values.ndim == 0:
+            values = values[np.newaxis]
+        num = len(values)
+        if num == 0:
+            return
+
+        mean = values.mean(axis=0)
+        m2 = ((values - mean) ** 2).sum(axis=0)
+        count = self.count + num
+        delta = mean - self.mean
+        self.mean = self.mean + delta * num / count
+        self._m2 = self._m2 + m2 + delta**2 * self.count * num / count
+        self.count = count
+        self.min = np.minimum(self.min, values.min(axis=0))
+        self.max = np.maximum(self.max, values.max(axis=0))
+
+    def get_var(self):
+        """Get the population variance of the samples seen.
+
+        Returns:
+            float | np.ndarray: Variance, or NaN if no samples were seen.
+        """
+        if self.count == 0:
+            return np.nan
+        return self._m2 / self.count
+
+    def get_std(self):
+        """Get the population standard deviation of the samples seen.
+
+        Returns:
+            float | np.ndarray: Standard deviation, or NaN if no samples were
+                seen.
+        """
+        return np.sqrt(self.get_var())
+
+
+class WindowStats:
+    """Statistics over the last few samples of a stream, held in a ring buffer
+    of a fixed size.
+
+    Samples are stacked along the first axis of each chunk, as for
+    RunningStats.
+    """
+
+    def __init__(self, size: int) -> None:
+        """Create a window.
+
+        Args:
+            size (int): Number of samples in the window.
+        """
+        if size <= 0:
+            raise Exception("Window must hold at least one sample.")
+
+        self._size = size
+        self.setup()
+
+    def setup(self) -> None:
+        """Forget every sample seen."""
+        self._buffer = None
+        self._idx = 0
+        self.count = 0
+
+    def update(self, values) -> None:
+        """Add a chunk of samples.
+
+        Args:
+            values (float | np.ndarray): Sample, or samples along the first
+                axis.
+        """
+        values = np.asarray(values, dtype=float)
+        if values.ndim == 0:
+            values = values[np.newaxis]
+        values = values[-self._size :]
+        num = len(values)
+        if num == 0:
+            return
+
+        if self._buffer is None:
+            self._buffer = np.zeros((self._size, *values.shape[1:]))
+
+        # Write the chunk in at most two slices, around the end of the ring.
+        head = min(num, self._size - self._idx)
+        self._buffer[self._idx : self._idx + head] = values[:head]
+        self._buffer[: num - head] = values[head:]
+        self._idx = (self._idx + num) % self._size
+        self.count = min(self.count + num, self._size)
+
+    def get_values(self) -> np.ndarray:
+        """Get the samples in the window, oldest first.
+
+        Returns:
+            np.ndarray: Samples along the first axis.
+        """
+        if self._buffer is None:
+            return np.zeros(0)
+        if self.count < self._size:
+            return self._buffer[: self.count]
+        return np.roll(self._buffer, -self._idx, axis=0)
+
+    def get_sum(self):
+        """Get the sum of the samples in the window."""
+        return self.get_values().sum(axis=0)
+
+    def get_mean(self):
+        """Get the mean of the samples in the window, or NaN if empty."""
+        if self.count == 0:
+            return np.nan
+        return self.get_values().mean(axis=0)
+
+    def get_std(self):
+        """Get the standard deviation of the samples in the window, or NaN if
+        empty."""
+        if self.count == 0:
+            return np.nan
+        return self.get_values().std(axis=0)
@@ -0,0 +1,102 @@
+"""
+@file       analyzer.py
+@author     Matthew Yu (matthewjkyu@gmail.com)
+@brief      Streaming analysis of simulation traces.
+@version    0.4.0
+@date       2026-10-19
+"""
+
+from analysis.efficiency import EfficiencyAnalysis
+from analysis.power import PowerAnalysis
+from analysis.stability import StabilityAnalysis
+from pv.pv_system import PVSystem
+
+
+class Analyzer:
+    """Power, efficiency and stability analysis of a simulation, fed the
+    trace chunk by chunk as the simulation produces it. Memory is constant in
+    the length of the run.
+
+    Traces are keyed by the simulator COLUMNS, with one sample per row, or
+    one row of scenarios for a batch.
+    """
+
+    def __init__(self, dt: float, system: PVSystem = None, window: int = 1000):
+        """Create an analyzer.
+
+        Args:
+            dt (float): Time each sample stands for, such as the simulator
+                step times the stride of the trace. Seconds.
+            system (PVSystem, optional): System simulated, for the mismatch
+                loss. Defaults to None, skipping the mismatch loss.
+            window (int, optional): Number of samples in the windowed
+                statistics.
+        """
+        self._system = system
+        self.power = PowerAnalysis(dt, window)
+        self.efficiency = EfficiencyAnalysis(window)
+        self.stability = StabilityAnalysis(window)
+
+    def setup(self) -> None:
+        """Forget every sample seen."""
+        self.power.setup()
+        self.efficiency.setup()
+        self.stability.setup()
+
+    def update(self, trace: dict, p_mpp=None, p_pv_mpp=None) -> None:
+        """Add a chunk of the trace in constant conditions.
+
+        Args:
+            trace (dict[str, np.ndarray]): Trace chunk keyed by column.
+            p_mpp (float | np.ndarray, optional): Maximum power of the system
+                over the chunk. Watts. Defaults to None, skipping the
+                efficiency.
+            p_pv_mpp (float | np.ndarray, optional): Sum of the maximum power
+                of each PV on its own over the chunk. Watts.
+        """
+        power = trace["Power (W)"]
+        self.power.update(power, p_mpp, p_pv_mpp)
+        if p_mpp is not None:
+            self.efficiency.update(power, p_mpp)
+        self.stability.update(trace["Voltage (V)"], trace["Reference (V)"])
+
+    def consume(self, stream) -> dict:
+        """Analyze a whole simulation stream, such as Simulator.stream.
+
+        Args:
+            stream (iter[(float, OperatingCurve, dict)]): Environment time,
+                operating curve of the system and trace of each chunk.
+
+        Returns:
+            dict[str, float]: Summary. See get_summary.
+        """
+        for time, curve, trace in stream:
+            p_pv_mpp = None
+            if self._system is not None:
+                p_pv_mpp = sum(
+                    self._system.get_pv_curve(id, time, len(curve.volts)).p_mpp
+                    for id in self._system.get_pv_ids()
+                )
+            self.update(trace, curve.p_mpp, p_pv_mpp)
+
+        return self.get_summary()
+
+    def get_summary(self) -> dict:
+        """Get every metric.
+
+        Returns:
+            dict[str, float | np.ndarray]: Metrics, by name.
+        """
+        return {
+            "Energy (J)": self.power.get_energy(),
+            "Available Energy (J)": self.power.get_available_energy(),
+            "Mismatch Loss (J)": self.power.get_mismatch_loss(),
+            "Mean Power (W)": self.power.get_mean_power(),
+            "Peak Power (W)": self.power.get_peak_power(),
+            "Efficiency": self.efficiency.get_efficiency(),
+            "Window Efficiency": self.efficiency.get_window_efficiency(),
+            "Min Efficiency": self.efficiency.get_min_efficiency(),
+            "Ripple (V)": self.stability.get_ripple(),
+            "Oscillation": self.stability.get_oscillation(),
+            "Tracking Error (V)": self.stability.get_tracking_error(),
+        }
@@ -0,0 +1,78 @@
+"""
+@file       efficiency.py
+@author     Matthew Yu (matthewjkyu@gmail.com)
+@brief      Streaming analysis of MPPT tracking efficiency.
+@version    0.4.0
+@date       2026-10-19
+"""
+
+import numpy as np
+
+from analysis.accumulator import WindowStats
+
+
+class EfficiencyAnalysis:
+    """Tracking efficiency of the controller: the power harvested as a
+    fraction of the power available at the maximum power point of the system.
+    The overall efficiency is taken over energy rather than averaged per
+    sample, so that low light samples weigh in proportion to their power.
+    """
+
+    def __init__(self, window: int = 1000) -> None:
+        """Create an efficiency analysis.
+
+        Args:
+            window (int, optional): Number of samples in the windowed
+                efficiency.
+        """
+        self._window = [WindowStats(window), WindowStats(window)]
+        self.setup()
+
+    def setup(self) -> None:
+        """Forget every sample seen."""
+        self._min = np.inf
+        for window in self._window:
+            window.setup()
+        self._harvested = 0.0
+        self._available = 0.0
+
+    def update(self, power, p_mpp) -> None:
+        """Add a chunk of samples in constant conditions.
+
+        Args:
+            power (np.ndarray): Power harvested, along the first axis. Watts.
+            p_mpp (float | np.ndarray): Maximum power of the system over the
+                chunk. Watts.
+        """
+        power = np.asarray(power, dtype=float)
+        p_mpp = np.broadcast_to(np.asarray(p_mpp, dtype=float), power.shape)
+        self._harvested = self._harvested + power.sum(axis=0)
+        self._available = self._available + p_mpp.sum(axis=0)
+        self._window[0].update(power)
+        self._window[1].update(p_mpp)
+
+        # Samples without any power available have no efficiency.
+        if len(power):
+            with np.errstate(divide="ignore", invalid="ignore"):
+                instant = np.where(p_mpp > 0.0, power / p_mpp, np.inf)
+            self._min = np.minimum(self._min, instant.min(axis=0))
+
+    def get_efficiency(self):
+        """Get the efficiency over every sample seen, or NaN if no power was
+        available."""
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(
+                self._available > 0.0, self._harvested / self._available, np.nan
+            )[()]
+
+    def get_window_efficiency(self):
+        """Get the efficiency over the last window, or NaN if no power was
+        available."""
+        harvested, available = [window.get_sum() for window in self._window]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(available > 0.0, harvested / available, np.nan)[()]
+
+    def get_min_efficiency(self):
+        """Get the lowest efficiency of any sample with power available, or
+        NaN if there is none."""
+        return np.where(np.isinf(self._min), np.nan, self._min)[()]
@@ -0,0 +1,88 @@
+"""
+@file       power.py
+@author     Matthew Yu (matthewjkyu@gmail.com)
+@brief      Streaming analysis of power and energy yield.
+@version    0.4.0
+@date       2026-10-19
+"""
+
+import numpy as np
+
+from analysis.accumulator import RunningStats, WindowStats
+
+
+class PowerAnalysis:
+    """Energy harvested from the source over a run, against the energy
+    available at the maximum power point of the system, and the energy lost
+    to mismatch: the gap between the system maximum power point and the sum
+    of the maximum power points of its PVs taken on their own.
+
+    Each sample stands for a fixed span of time, such as the simulator step
+    times the stride of the trace.
+    """
+
+    def __init__(self, dt: float, window: int = 1000) -> None:
+        """Create a power analysis.
+
+        Args:
+            dt (float): Time each sample stands for. Seconds.
+            window (int, optional): Number of samples in the windowed
+                statistics.
+        """
+        self._dt = dt
+        self._power = RunningStats()
+        self._window = WindowStats(window)
+        self.setup()
+
+    def setup(self) -> None:
+        """Forget every sample seen."""
+        self._power.setup()
+        self._window.setup()
+        self._energy = 0.0
+        self._available = 0.0
+        self._mismatch = 0.0
+
+    def update(self, power, p_mpp=None, p_pv_mpp=None) -> None:
+        """Add a chunk of samples in constant conditions.
+
+        Args:
+            power (np.ndarray): Power harvested, along the first axis. Watts.
+            p_mpp (float | np.ndarray, optional): Maximum power of the system
+                over the chunk. Watts.
+            p_pv_mpp (float | np.ndarray, optional): Sum of the maximum power
+                of each PV on its own over the chunk. Watts.
+        """
+        power = np.asarray(power, dtype=float)
+        span = len(power) * self._dt
+        self._energy = self._energy + power.sum(axis=0) * self._dt
+        if p_mpp is not None:
+            self._available = self._available + np.asarray(p_mpp) * span
+            if p_pv_mpp is not None:
+                self._mismatch = self._mismatch + (np.asarray(p_pv_mpp) - p_mpp) * span
+        self._power.update(power)
+        self._window.update(power)
+
+    def get_energy(self):
+        """Get the energy harvested. Joules."""
+        return self._energy
+
+    def get_available_energy(self):
+        """Get the energy available at the system maximum power point.
+        Joules."""
+        return self._available
+
+    def get_mismatch_loss(self):
+        """Get the energy lost to mismatch between PVs. Joules."""
+        return self._mismatch
+
+    def get_mean_power(self):
+        """Get the mean power harvested. Watts."""
+        return self._power.mean
+
+    def get_peak_power(self):
+        """Get the peak power harvested. Watts."""
+        return self._power.max
+
+    def get_window_power(self):
+        """Get the mean power harvested over the last window. Watts."""
+        return self._window.get_mean()
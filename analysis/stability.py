@@ -0,0 +1,91 @@
+"""
+@file       stability.py
+@author     Matthew Yu (matthewjkyu@gmail.com)
+@brief      Streaming analysis of operating point stability.
+@version    0.4.0
+@date       2026-10-19
+"""
+
+import numpy as np
+
+from analysis.accumulator import RunningStats, WindowStats
+
+
+class StabilityAnalysis:
+    """Stability of the operating point under the controller:
+
+    - ripple, the deviation of the source voltage over the last window,
+    - oscillation, the fraction of reference steps that reverse the direction
+      of the step before them, as a perturbing tracker does about its peak,
+    - tracking error, the deviation of the source voltage from its reference.
+
+    Only the last sample of each chunk is carried into the next.
+    """
+
+    def __init__(self, window: int = 1000) -> None:
+        """Create a stability analysis.
+
+        Args:
+            window (int, optional): Number of samples in the windowed ripple.
+        """
+        self._ripple = WindowStats(window)
+        self._error = RunningStats()
+        self.setup()
+
+    def setup(self) -> None:
+        """Forget every sample seen."""
+        self._ripple.setup()
+        self._error.setup()
+        self._last_ref = None
+        self._last_dir = None
+        self._num_steps = 0
+        self._num_reversals = 0
+
+    def update(self, voltage, reference) -> None:
+        """Add a chunk of samples.
+
+        Args:
+            voltage (np.ndarray): Source voltage, along the first axis. Volts.
+            reference (np.ndarray): Voltage reference, along the first axis.
+                Volts.
+        """
+        voltage = np.asarray(voltage, dtype=float)
+        reference = np.asarray(reference, dtype=float)
+        if len(reference) == 0:
+            return
+
+        self._ripple.update(voltage)
+        self._error.update(voltage - reference)
+
+        refs = reference
+        if self._last_ref is not None:
+            refs = np.concatenate([self._last_ref[np.newaxis], reference])
+        dirs = np.sign(np.diff(refs, axis=0))
+        if self._last_dir is not None:
+            dirs = np.concatenate([self._last_dir[np.newaxis], dirs])
+
+        self._num_steps = self._num_steps + np.count_nonzero(dirs[1:], axis=0)
+        self._num_reversals = self._num_reversals + np.count_nonzero(
+            dirs[1:] * dirs[:-1] < 0, axis=0
+        )
+        self._last_ref = reference[-1]
+        if len(dirs):
+            self._last_dir = dirs[-1]
+
+    def get_ripple(self):
+        """Get the standard deviation of the source voltage over the last
+        window. Volts."""
+        return self._ripple.get_std()
+
+    def get_oscillation(self):
+        """Get the fraction of reference steps that reverse direction, or NaN
+        if the reference never stepped."""
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(
+                self._num_steps > 0, self._num_reversals / self._num_steps, np.nan
+            )[()]
+
+    def get_tracking_error(self):
+        """Get the root mean square deviation of the source voltage from its
+        reference. Volts."""
+        return np.sqrt(self._error.get_var() + self._error.mean**2)
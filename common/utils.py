@@ -65,3 +65,43 @@ def normalize(data, num_points=100):
     data = data[data[:, 0].argsort()]
 
     return data
+
+
+def solve_decreasing(func, target, lo=-1.0, hi=1.0, num_iters=64):
+    """Solve func(x) = target element wise by bisection, for a monotonically
+    decreasing func that is vectorized over numpy arrays. The initial bracket
+    [lo, hi] is widened until it contains every root.
+
+    Args:
+        func (func(np.array) -> np.array): Decreasing function to solve.
+        target (np.array): Target outputs of func.
+        lo (float, optional): Initial lower bound of the bracket.
+        hi (float, optional): Initial upper bound of the bracket.
+        num_iters (int, optional): Number of bisection steps. 64 steps
+            converge to double precision for any reasonable bracket.
+
+    Returns:
+        np.array: Inputs x such that func(x) = target.
+    """
+    target = np.asarray(target, dtype=float)
+    lo = np.full(target.shape, lo, dtype=float)
+    hi = np.full(target.shape, hi, dtype=float)
+
+    # Widen the bracket outward until it straddles the target.
+    width = hi - lo
+    for _ in range(num_iters):
+        below = func(lo) < target
+        above = func(hi) > target
+        if not below.any() and not above.any():
+            break
+        lo = np.where(below, lo - width, lo)
+        hi = np.where(above, hi + width, hi)
+        width = width * 2
+
+    for _ in range(num_iters):
+        mid = (lo + hi) / 2
+        is_low = func(mid) > target
+        lo = np.where(is_low, mid, lo)
+        hi = np.where(is_low, hi, mid)
+
+    return (lo + hi) / 2
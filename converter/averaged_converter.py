@@ -0,0 +1,280 @@
+"""
+@file       averaged_converter.py
+@author     Matthew Yu (matthewjkyu@gmail.com)
+@brief      State space averaged model of DC-DC converter hardware.
+@version    0.4.0
+@date       2026-10-19
+"""
+
+import math as m
+
+import numpy as np
+
+from converter.converter import Converter
+from load.load import Load, ResistiveLoad
+
+
+class AveragedConverter(Converter):
+    """State space averaged buck or boost converter between a PV source and a
+    load. The state is the input capacitor voltage (the source voltage) and
+    the inductor current, averaged over a switching period:
+
+        C dV/dt = I_PV(V) - k_in(d) I_L
+        L dI_L/dt = k_in(d) V - k_out(d) V_out - R I_L
+
+    where k_in = d, k_out = 1 for a buck and k_in = 1, k_out = 1 - d for a
+    boost, and V_out is the load voltage at the output current k_out I_L. The
+    duty cycle d is set by a PI loop regulating the source voltage onto its
+    reference, with feedforward of the ideal conversion ratio.
+
+    Each step is integrated by backward Euler, solved by a few Newton
+    iterations on the source current, so that the stiff source and LC
+    dynamics stay stable at a fixed step. The PI loop is sampled once per
+    integration step; steps longer than its sample period, around 100 us for
+    the default gains, should be split into substeps. Any number of
+    converters is stepped at once by passing array references, with the
+    state held in arrays. A single converter, stepped with a float reference
+    on a single curve, is integrated on Python floats instead.
+    """
+
+    TOPOLOGIES = ["buck", "boost"]
+
+    def __init__(
+        self,
+        topology: str = "boost",
+        load: Load = None,
+        inductance: float = 100e-6,
+        capacitance: float = 1e-3,
+        resistance: float = 0.05,
+        kp: float = 0.01,
+        ki: float = 10.0,
+        substeps: int = 1,
+        iterations: int = 2,
+        v_init: float = 0.0,
+    ) -> None:
+        """Create an averaged converter.
+
+        Args:
+            topology (str, optional): Either 'buck' or 'boost'. Defaults to
+                'boost'.
+            load (Load, optional): Load on the output. Defaults to 10 Ohms.
+            inductance (float, optional): Inductance. Henries.
+            capacitance (float, optional): Input capacitance. Farads.
+            resistance (float, optional): Series resistance of the inductor
+                and switches. Ohms.
+            kp (float, optional): Proportional gain of the duty cycle on the
+                source voltage error. 1/Volts.
+            ki (float, optional): Integral gain of the duty cycle on the
+                source voltage error. 1/(Volt seconds).
+            substeps (int, optional): Number of integration steps per step.
+            iterations (int, optional): Number of Newton iterations per
+                integration step.
+            v_init (float, optional): Initial source voltage. Volts.
+        """
+        if topology not in self.TOPOLOGIES:
+            raise Exception("Invalid converter topology.")
+
+        super().__init__(tau=0.0, v_init=v_init)
+        self._topology = topology
+        self._load = load if load is not None else ResistiveLoad()
+        self._inductance = inductance
+        self._capacitance = capacitance
+        self._resistance = resistance
+        self._kp = kp
+        self._ki = ki
+        self._substeps = substeps
+        self._iterations = iterations
+        self._source = None
+        self.setup()
+
+    def setup(self) -> None:
+        self._voltage = np.asarray(self._v_init, dtype=float)
+        self._current = np.zeros(())
+        self._integral = np.zeros(())
+        self._duty = np.zeros(())
+        self._i_in = np.zeros(())
+        self._v_out = np.zeros(())
+        self._i_out = np.zeros(())
+        self._load.setup()
+
+    def set_source(self, curve) -> None:
+        self._source = curve
+
+    def _get_ratios(self, duty: np.ndarray) -> (np.ndarray, np.ndarray):
+        """Get the input and output conversion ratios at a duty cycle."""
+        if self._topology == "buck":
+            return duty, np.ones(duty.shape)
+        return np.ones(duty.shape), 1.0 - duty
+
+    def _get_source_current(self, voltage: np.ndarray) -> np.ndarray:
+        """Get the source current at a voltage."""
+        if self._source is None:
+            return np.zeros(voltage.shape)
+        return self._source.get_currents(voltage)
+
+    def _get_source(self, voltage: np.ndarray) -> (np.ndarray, np.ndarray):
+        """Get the source current and its slope against voltage."""
+        delta = 1e-3
+        curr = self._get_source_current(voltage)
+        slope = (self._get_source_current(voltage + delta) - curr) / delta
+        return curr, np.minimum(slope, 0.0)
+
+    def _get_duty(self, v_ref: np.ndarray, h: float) -> np.ndarray:
+        """Advance the PI loop and get the duty cycle."""
+        # Feedforward the lossless steady state duty cycle that holds the
+        # source at its reference, while drawing the measured input current
+        # into the Thevenin equivalent of the load.
+        v_oc = self._load.get_ocv()
+        r_i = self._load.get_resistance() * self._i_in
+        root = np.sqrt(np.maximum(v_oc**2 + 4.0 * v_ref * r_i, 0.0))
+        if self._topology == "buck":
+            feedforward = (v_oc + root) / np.maximum(2.0 * v_ref, 1e-9)
+        else:
+            feedforward = 1.0 - 2.0 * v_ref / np.maximum(v_oc + root, 1e-9)
+        feedforward = np.clip(feedforward, 0.0, 1.0)
+
+        # A high source voltage is pulled down by a higher duty cycle, in
+        # either topology.
+        error = self._voltage - v_ref
+        duty = feedforward + self._kp * error + self._integral
+        saturated = ((duty >= 1.0) & (error > 0)) | ((duty <= 0.0) & (error < 0))
+        self._integral = self._integral + np.where(saturated, 0.0, self._ki * error * h)
+        return np.clip(duty, 0.0, 1.0)
+
+    def step(self, v_ref, dt: float):
+        if isinstance(v_ref, (int, float)) and hasattr(self._source, "get_current"):
+            return self._step_scalar(float(v_ref), dt)
+
+        v_ref = np.asarray(v_ref, dtype=float)
+        h = dt / self._substeps
+        a = h / self._capacitance
+        b = h / self._inductance
+
+        for _ in range(self._substeps):
+            v = np.broadcast_to(self._voltage, v_ref.shape)
+            i = np.broadcast_to(self._current, v_ref.shape)
+            self._voltage = v
+
+            duty = self._get_duty(v_ref, h)
+            k_in, k_out = self._get_ratios(duty)
+            v_oc = self._load.get_ocv()
+            r_load = self._load.get_resistance()
+            a12 = a * k_in
+            a21 = -b * k_in
+            a22 = 1.0 + b * (self._resistance + k_out**2 * r_load)
+            r2 = i - b * k_out * v_oc
+
+            # Solve the backward Euler step for V and I_L by simplified
+            # Newton iterations, linearizing the source current about the
+            # start of the step and correcting its value at each iterate.
+            i_pv, slope = self._get_source(v)
+            a11 = 1.0 - a * slope
+            det = a11 * a22 - a12 * a21
+            v_next = v
+            for iteration in range(self._iterations):
+                if iteration:
+                    i_pv = self._get_source_current(v_next)
+                r1 = v + a * (i_pv - slope * v_next)
+                v_next = (r1 * a22 - a12 * r2) / det
+                i_next = (a11 * r2 - a21 * r1) / det
+            v, i = v_next, i_next
+
+            # The output diode blocks reverse inductor current.
+            i = np.maximum(i, 0.0)
+            self._voltage, self._current, self._duty = v, i, duty
+            self._i_in = k_in * i
+            self._i_out = k_out * i
+            self._v_out = v_oc + r_load * self._i_out
+            self._load.step(self._i_out, h)
+
+        if np.ndim(self._voltage) == 0:
+            return float(self._voltage)
+        return self._voltage
+
+    def _step_scalar(self, v_ref: float, dt: float) -> float:
+        """Step a single converter on Python floats, which is several times
+        faster than on 0-d arrays. Integrates the same way as step; see step
+        and _get_duty.
+        """
+        h = dt / self._substeps
+        a = h / self._capacitance
+        b = h / self._inductance
+        kp, ki = self._kp, self._ki
+        boost = self._topology == "boost"
+        get_current = self._source.get_current
+        load = self._load
+
+        v = float(self._voltage)
+        i = float(self._current)
+        integral = float(self._integral)
+        i_in = float(self._i_in)
+
+        for _ in range(self._substeps):
+            v_oc = load.get_ocv()
+            r_load = load.get_resistance()
+
+            # Feedforward and PI loop.
+            root = m.sqrt(max(v_oc**2 + 4.0 * v_ref * r_load * i_in, 0.0))
+            if boost:
+                feedforward = 1.0 - 2.0 * v_ref / max(v_oc + root, 1e-9)
+            else:
+                feedforward = (v_oc + root) / max(2.0 * v_ref, 1e-9)
+            feedforward = min(max(feedforward, 0.0), 1.0)
+
+            error = v - v_ref
+            duty = feedforward + kp * error + integral
+            if not ((duty >= 1.0 and error > 0) or (duty <= 0.0 and error < 0)):
+                integral += ki * error * h
+            duty = min(max(duty, 0.0), 1.0)
+            k_in, k_out = (1.0, 1.0 - duty) if boost else (duty, 1.0)
+
+            # Backward Euler step.
+            a12 = a * k_in
+            a21 = -b * k_in
+            a22 = 1.0 + b * (self._resistance + k_out**2 * r_load)
+            r2 = i - b * k_out * v_oc
+
+            i_pv = get_current(v)
+            slope = min((get_current(v + 1e-3) - i_pv) / 1e-3, 0.0)
+            a11 = 1.0 - a * slope
+            det = a11 * a22 - a12 * a21
+            v_next = v
+            for iteration in range(self._iterations):
+                if iteration:
+                    i_pv = get_current(v_next)
+                r1 = v + a * (i_pv - slope * v_next)
+                v_next = (r1 * a22 - a12 * r2) / det
+                i_next = (a11 * r2 - a21 * r1) / det
+            v, i = v_next, max(i_next, 0.0)
+
+            i_in = k_in * i
+            i_out = k_out * i
+            load.step(i_out, h)
+
+        self._voltage, self._current, self._duty = v, i, duty
+        self._integral = integral
+        self._i_in, self._i_out = i_in, i_out
+        self._v_out = v_oc + r_load * i_out
+        return v
+
+    def get_voltage(self):
+        if np.ndim(self._voltage) == 0:
+            return float(self._voltage)
+        return self._voltage
+
+    def get_current(self):
+        """Get the inductor current. Amps."""
+        return self._current
+
+    def get_duty(self):
+        """Get the duty cycle of the last step."""
+        return self._duty
+
+    def get_output(self):
+        """Get the output voltage and current into the load.
+
+        Returns:
+            (float | np.ndarray, float | np.ndarray): Voltage (Volts) and
+                current (Amps).
+        """
+        return self._v_out, self._i_out
@@ -6,7 +6,34 @@
 @date       2023-09-25
 """
 
+from converter.controller.mppt_algorithms.mppt_alg import MPPTAlg
+
 
 class Controller:
-    def __init__(self) -> None:
-        pass
+    """Runs the high level control algorithm on sensor readings to produce the
+    converter setpoint."""
+
+    def __init__(self, mppt: MPPTAlg = None) -> None:
+        """Create a controller.
+
+        Args:
+            mppt (MPPTAlg, optional): MPPT algorithm producing the source
+                voltage reference. Defaults to a constant reference of 0 V.
+        """
+        self._mppt = mppt if mppt is not None else MPPTAlg()
+
+    def setup(self) -> None:
+        """Reset the controller to its initial state."""
+        self._mppt.setup()
+
+    def get_setpoint(self, voltage: float, current: float) -> float:
+        """Get the source voltage reference from the latest source readings.
+
+        Args:
+            voltage (float): Measured source voltage. Volts.
+            current (float): Measured source current. Amps.
+
+        Returns:
+            float: Voltage reference. Volts.
+        """
+        return self._mppt.get_setpoint(voltage, current)
@@ -0,0 +1,99 @@
+"""
+@file       global_scan.py
+@author     Matthew Yu (matthewjkyu@gmail.com)
+@brief      Global scan MPPT algorithm.
+@version    0.4.0
+@date       2026-10-19
+"""
+
+import numpy as np
+
+from converter.controller.mppt_algorithms.perturb_observe import PerturbObserve
+
+
+class GlobalScan(PerturbObserve):
+    """Periodically sweeps the voltage reference across a range and jumps to
+    the voltage of highest power seen, then tracks it with perturb and
+    observe until the next sweep. Escapes the local maxima that partial
+    shading puts on the power curve."""
+
+    def __init__(
+        self,
+        v_range: list[float],
+        stride: float = 0.01,
+        num_scan: int = 50,
+        period: int = 1000,
+    ) -> None:
+        """Create a global scan algorithm.
+
+        Args:
+            v_range (list[float | np.ndarray]): Voltage bounds of the sweep.
+                Volts.
+            stride (float | np.ndarray, optional): Voltage perturbation per
+                step between sweeps. Volts.
+            num_scan (int, optional): Number of steps of a sweep.
+            period (int, optional): Number of steps from the start of one
+                sweep to the next. At least num_scan.
+        """
+        super().__init__(v_range[0], stride)
+        self._v_range = v_range
+        self._num_scan = num_scan
+        self._period = max(period, num_scan + 1)
+
+    def _init_state(self, shape: tuple) -> None:
+        super()._init_state(shape)
+        self._step = 0
+        self._v_best = np.zeros(shape)
+        self._p_best = np.full(shape, -np.inf)
+
+    def _init_scalar(self) -> None:
+        super()._init_scalar()
+        self._step = 0
+        self._v_best = 0.0
+        self._p_best = -np.inf
+
+    def _update(self, voltage: np.ndarray, current: np.ndarray) -> None:
+        phase = self._step % self._period
+        self._step += 1
+
+        if phase == 0:
+            self._p_best[...] = -np.inf
+        if phase <= self._num_scan:
+            # Readings lag the reference by a step; score the measured voltage.
+            power = voltage * current
+            better = power > self._p_best
+            self._v_best = np.where(better, voltage, self._v_best)
+            self._p_best = np.where(better, power, self._p_best)
+
+        if phase < self._num_scan:
+            lo, hi = self._v_range
+            frac = phase / max(self._num_scan - 1, 1)
+            self._v_ref[...] = lo + (hi - lo) * frac
+        elif phase == self._num_scan:
+            self._v_ref[...] = self._v_best
+            self._p_prev = np.zeros(self._v_ref.shape)
+            self._direction = np.ones(self._v_ref.shape)
+        else:
+            super()._update(voltage, current)
+
+    def _update_scalar(self, voltage: float, current: float) -> None:
+        phase = self._step % self._period
+        self._step += 1
+
+        if phase == 0:
+            self._p_best = -np.inf
+        if phase <= self._num_scan:
+            power = voltage * current
+            if power > self._p_best:
+                self._v_best, self._p_best = voltage, power
+
+        if phase < self._num_scan:
+            lo, hi = self._v_range
+            frac = phase / max(self._num_scan - 1, 1)
+            self._v_ref = float(lo + (hi - lo) * frac)
+        elif phase == self._num_scan:
+            self._v_ref = self._v_best
+            self._p_prev = 0.0
+            self._direction = 1.0
+        else:
+            super()._update_scalar(voltage, current)
@@ -0,0 +1,80 @@
+"""
+@file       incremental_conductance.py
+@author     Matthew Yu (matthewjkyu@gmail.com)
+@brief      Incremental conductance MPPT algorithm.
+@version    0.4.0
+@date       2026-10-19
+"""
+
+import numpy as np
+
+from converter.controller.mppt_algorithms.mppt_alg import MPPTAlg
+
+
+class IncrementalConductance(MPPTAlg):
+    """Steps the voltage reference toward the maximum power point using the
+    sign of dP/dV = I + V dI/dV, and holds once |dP/dV| falls within a
+    tolerance. A change in current at constant voltage is read as a change in
+    irradiance."""
+
+    def __init__(
+        self, v_ref: float = 0.0, stride: float = 0.01, tolerance: float = 0.05
+    ) -> None:
+        """Create an incremental conductance algorithm.
+
+        Args:
+            v_ref (float | np.ndarray, optional): Initial voltage reference.
+                Volts.
+            stride (float | np.ndarray, optional): Voltage step. Volts.
+            tolerance (float, optional): Magnitude of dP/dV under which the
+                reference is held. Amps.
+        """
+        super().__init__(v_ref, stride)
+        self._tolerance = tolerance
+
+    def _init_state(self, shape: tuple) -> None:
+        super()._init_state(shape)
+        self._v_prev = np.zeros(shape)
+        self._i_prev = np.zeros(shape)
+
+    def _init_scalar(self) -> None:
+        super()._init_scalar()
+        self._v_prev = 0.0
+        self._i_prev = 0.0
+
+    def _update(self, voltage: np.ndarray, current: np.ndarray) -> None:
+        dv = voltage - self._v_prev
+        di = current - self._i_prev
+
+        # dP/dV, avoiding the division where the voltage did not move.
+        moved = dv != 0
+        dp_dv = current + voltage * np.divide(
+            di, dv, out=np.zeros(dv.shape), where=moved
+        )
+        direction = np.where(
+            moved,
+            np.where(np.abs(dp_dv) > self._tolerance, np.sign(dp_dv), 0.0),
+            np.sign(di),
+        )
+
+        self._v_ref += direction * self._stride
+        self._v_prev = voltage
+        self._i_prev = current
+
+    def _update_scalar(self, voltage: float, current: float) -> None:
+        dv = voltage - self._v_prev
+        di = current - self._i_prev
+
+        if dv != 0:
+            dp_dv = current + voltage * (di / dv)
+            if dp_dv > self._tolerance:
+                self._v_ref += self._stride
+            elif dp_dv < -self._tolerance:
+                self._v_ref -= self._stride
+        elif di > 0:
+            self._v_ref += self._stride
+        elif di < 0:
+            self._v_ref -= self._stride
+
+        self._v_prev = voltage
+        self._i_prev = current
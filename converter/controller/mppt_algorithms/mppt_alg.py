@@ -6,11 +6,94 @@
 @date       2023-09-25
 """
 
+import numpy as np
+
+
 class MPPTAlg:
-    def __init__(self) -> None:
-        pass
+    """Maximum power point tracking algorithm. The base algorithm holds a
+    constant voltage reference.
+
+    Algorithms step any number of independent scenarios at once. Readings are
+    floats for a single scenario, or arrays of shape (N,) for N scenarios, and
+    all state is held in arrays of the same shape. A single scenario is
+    instead stepped on Python floats, which is several times faster than on
+    0-d arrays. State is allocated on the first reading after setup.
+    """
+
+    def __init__(self, v_ref: float = 0.0, stride: float = 0.01) -> None:
+        """Create an MPPT algorithm.
+
+        Args:
+            v_ref (float | np.ndarray, optional): Initial voltage reference.
+                Volts.
+            stride (float | np.ndarray, optional): Voltage perturbation per
+                step. Volts.
+        """
+        self._v_init = v_ref
+        self._stride = stride
+        self._v_ref = None
 
     def setup(self) -> None:
+        """Reset the algorithm to its initial state."""
+        self._v_ref = None
+
+    def _init_state(self, shape: tuple) -> None:
+        """Allocate the state of each scenario.
+
+        Args:
+            shape (tuple): Shape of the readings.
+        """
+        self._v_ref = np.array(np.broadcast_to(self._v_init, shape), dtype=float)
+
+    def _init_scalar(self) -> None:
+        """Allocate the state of a single scenario as Python floats."""
+        self._v_ref = float(self._v_init)
+
+    def _update(self, voltage: np.ndarray, current: np.ndarray) -> None:
+        """Advance the voltage reference of each scenario in place.
+
+        Args:
+            voltage (np.ndarray): Measured source voltages. Volts.
+            current (np.ndarray): Measured source currents. Amps.
+        """
+        pass
+
+    def _update_scalar(self, voltage: float, current: float) -> None:
+        """Advance the voltage reference of a single scenario. Must step
+        exactly as _update does for a batch of one.
+
+        Args:
+            voltage (float): Measured source voltage. Volts.
+            current (float): Measured source current. Amps.
+        """
         pass
 
-    def get_setpoint(self, )
\ No newline at end of file
+    def get_setpoint(self, voltage, current):
+        """Get the next voltage reference from the latest source readings.
+
+        Args:
+            voltage (float | np.ndarray): Measured source voltage. Volts.
+            current (float | np.ndarray): Measured source current. Amps.
+
+        Returns:
+            float | np.ndarray: Voltage reference. Volts.
+        """
+        if isinstance(voltage, (int, float)) and isinstance(current, (int, float)):
+            if not isinstance(self._v_ref, float):
+                self._init_scalar()
+            self._update_scalar(float(voltage), float(current))
+            return self._v_ref
+
+        voltage = np.array(voltage, dtype=float)
+        current = np.array(current, dtype=float)
+        if (
+            not isinstance(self._v_ref, np.ndarray)
+            or self._v_ref.shape != voltage.shape
+        ):
+            self._init_state(voltage.shape)
+
+        self._update(voltage, current)
+        if self._v_ref.ndim == 0:
+            # Python floats keep the rest of a scalar loop out of numpy.
+            return float(self._v_ref)
+        return self._v_ref.copy()
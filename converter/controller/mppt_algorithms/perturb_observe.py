@@ -0,0 +1,40 @@
+"""
+@file       perturb_observe.py
+@author     Matthew Yu (matthewjkyu@gmail.com)
+@brief      Perturb and observe MPPT algorithm.
+@version    0.4.0
+@date       2026-10-19
+"""
+
+import numpy as np
+
+from converter.controller.mppt_algorithms.mppt_alg import MPPTAlg
+
+
+class PerturbObserve(MPPTAlg):
+    """Perturbs the voltage reference by a fixed stride each step, and
+    reverses direction whenever power drops. Settles into an oscillation
+    about the local maximum power point."""
+
+    def _init_state(self, shape: tuple) -> None:
+        super()._init_state(shape)
+        self._p_prev = np.zeros(shape)
+        self._direction = np.ones(shape)
+
+    def _init_scalar(self) -> None:
+        super()._init_scalar()
+        self._p_prev = 0.0
+        self._direction = 1.0
+
+    def _update(self, voltage: np.ndarray, current: np.ndarray) -> None:
+        power = voltage * current
+        self._direction = np.where(power < self._p_prev, -self._direction, self._direction)
+        self._v_ref += self._direction * self._stride
+        self._p_prev = power
+
+    def _update_scalar(self, voltage: float, current: float) -> None:
+        power = voltage * current
+        if power < self._p_prev:
+            self._direction = -self._direction
+        self._v_ref += self._direction * self._stride
+        self._p_prev = power
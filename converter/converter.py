@@ -6,7 +6,57 @@
 @date       2023-09-25
 """
 
+import math as m
+
 
 class Converter:
-    def __init__(self) -> None:
+    """Ideal converter regulating the source voltage. The actuator applies the
+    voltage reference, and the process responds to it as a first order lag."""
+
+    def __init__(self, tau: float = 1e-3, v_init: float = 0.0) -> None:
+        """Create a converter.
+
+        Args:
+            tau (float, optional): Time constant of the process. Seconds.
+            v_init (float, optional): Initial source voltage. Volts.
+        """
+        self._tau = tau
+        self._v_init = v_init
+        self._voltage = v_init
+        self._dt = None
+        self._alpha = 1.0
+
+    def setup(self) -> None:
+        """Reset the converter to its initial state."""
+        self._voltage = self._v_init
+
+    def set_source(self, curve) -> None:
+        """Set the source the converter draws from. The ideal converter
+        regulates the source voltage regardless of the source.
+
+        Args:
+            curve (OperatingCurve | OperatingCurveBatch): Operating curve of
+                the source, or of each scenario.
+        """
         pass
+
+    def step(self, v_ref: float, dt: float) -> float:
+        """Advance the converter by a time step.
+
+        Args:
+            v_ref (float): Source voltage reference. Volts.
+            dt (float): Time step. Seconds.
+
+        Returns:
+            float: Source voltage at the end of the step. Volts.
+        """
+        if dt != self._dt:
+            self._dt = dt
+            self._alpha = 1.0 - m.exp(-dt / self._tau) if self._tau > 0 else 1.0
+        # Rebind rather than update in place; callers may hold the voltage.
+        self._voltage = self._voltage + (v_ref - self._voltage) * self._alpha
+        return self._voltage
+
+    def get_voltage(self) -> float:
+        """Get the source voltage. Volts."""
+        return self._voltage
@@ -6,32 +6,162 @@
 @date       2023-09-25
 """
 
+import numpy as np
+
+from common.rng import BlockRNG
 from pv.pv_system import PVSystem
 
 
-class SourceSensor:
-    def __init__(self, system: PVSystem) -> None:
-        self._system = system
+class SensorChannel:
+    """Measurement chain of a single quantity: gain and offset error, additive
+    Gaussian noise, then an ADC that clips to its span and quantizes.
 
-    def inject_noise(self):
-        pass
+    Values are floats for a single scenario, or arrays for a batch of
+    scenarios; noise for a batch is drawn as a single block.
+    """
 
-    def get_voltage(self):
-        pass
+    def __init__(
+        self,
+        noise: float = 0.0,
+        offset: float = 0.0,
+        gain: float = 1.0,
+        bits: int = None,
+        span: list[float] = [0.0, 1.0],
+        rng: BlockRNG = None,
+    ) -> None:
+        """Create a sensor channel.
 
-    def get_current(self):
-        pass
+        Args:
+            noise (float, optional): Standard deviation of the noise.
+            offset (float, optional): Offset error.
+            gain (float, optional): Gain of the sensor; 1 is ideal.
+            bits (int, optional): ADC bit depth. Defaults to None, an ideal
+                unquantized and unclipped reading.
+            span (list[float], optional): Input span of the ADC.
+            rng (BlockRNG, optional): Noise stream. Defaults to a fresh
+                stream.
+        """
+        self._noise = noise
+        self._offset = offset
+        self._gain = gain
+        self._bits = bits
+        self._lo, self._hi = span
+        self._rng = rng if rng is not None else BlockRNG()
+        self._lsb = (self._hi - self._lo) / 2**bits if bits is not None else None
+        self.is_ideal = noise == 0.0 and offset == 0.0 and gain == 1.0 and bits is None
 
+    def setup(self) -> None:
+        """Restart the noise stream, so that every run draws the same noise."""
+        self._rng.reset()
 
-class LoadSensor:
-    def __init__(self, load) -> None:
-        self._load = load
+    def measure(self, value):
+        """Measure a true value.
+
+        Args:
+            value (float | np.ndarray): True value.
+
+        Returns:
+            float | np.ndarray: Measured value.
+        """
+        if isinstance(value, float):
+            value = value * self._gain + self._offset
+            if self._noise:
+                value += self._noise * self._rng.normal()
+            if self._lsb is not None:
+                value = self._lo + round((value - self._lo) / self._lsb) * self._lsb
+                value = min(max(value, self._lo), self._hi)
+            return value
+
+        value = np.asarray(value, dtype=float) * self._gain + self._offset
+        if self._noise:
+            value = value + self._noise * self._rng.normals(value.size).reshape(
+                value.shape
+            )
+        if self._lsb is not None:
+            value = self._lo + np.round((value - self._lo) / self._lsb) * self._lsb
+            value = np.clip(value, self._lo, self._hi)
+        return value
+
+
+class Sensor:
+    """Samples the voltage and current at a port of the converter. Readings
+    are latched by a sample and hold, converting a new sample through
+    inject_noise on every hold-th call of sample."""
+
+    def __init__(
+        self,
+        voltage: SensorChannel = None,
+        current: SensorChannel = None,
+        hold: int = 1,
+    ) -> None:
+        """Create a sensor.
+
+        Args:
+            voltage (SensorChannel, optional): Voltage measurement chain.
+                Defaults to ideal.
+            current (SensorChannel, optional): Current measurement chain.
+                Defaults to ideal.
+            hold (int, optional): Number of samples each conversion is held
+                for. Defaults to 1, converting every sample.
+        """
+        self._channels = [
+            voltage if voltage is not None else SensorChannel(),
+            current if current is not None else SensorChannel(),
+        ]
+        self._is_ideal = all(channel.is_ideal for channel in self._channels)
+        self._hold = hold
+        self.setup()
+
+    def setup(self) -> None:
+        """Reset the latched readings and the noise of each channel."""
+        self._voltage = 0.0
+        self._current = 0.0
+        self._count = 0
+        for channel in self._channels:
+            channel.setup()
 
-    def inject_noise(self):
-        pass
+    def sample(self, voltage: float, current: float) -> None:
+        """Sample the true voltage and current at the port.
 
-    def get_voltage(self):
-        pass
+        Args:
+            voltage (float | np.ndarray): Voltage at the port. Volts.
+            current (float | np.ndarray): Current through the port. Amps.
+        """
+        if self._count % self._hold == 0:
+            self._voltage, self._current = self.inject_noise(voltage, current)
+        self._count += 1
 
-    def get_current(self):
-        pass
+    def inject_noise(self, voltage: float, current: float) -> (float, float):
+        """Apply measurement error to true values.
+
+        Args:
+            voltage (float | np.ndarray): True voltage. Volts.
+            current (float | np.ndarray): True current. Amps.
+
+        Returns:
+            (float | np.ndarray, float | np.ndarray): Measured voltage and
+                current.
+        """
+        if self._is_ideal:
+            return voltage, current
+        return self._channels[0].measure(voltage), self._channels[1].measure(current)
+
+    def get_voltage(self) -> float:
+        """Get the measured voltage at the port. Volts."""
+        return self._voltage
+
+    def get_current(self) -> float:
+        """Get the measured current through the port. Amps."""
+        return self._current
+
+
+class SourceSensor(Sensor):
+    def __init__(self, system: PVSystem, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self._system = system
+
+
+class LoadSensor(Sensor):
+    def __init__(self, load, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self._load = load
@@ -0,0 +1,313 @@
+"""
+@file       compression.py
+@author     Matthew Yu (matthewjkyu@gmail.com)
+@brief      Run length compression of environment voxels along time.
+@version    0.4.0
+@date       2026-10-19
+"""
+
+import numpy as np
+
+
+class CompressedVoxels:
+    """Voxels run length encoded along the time axis of each (X, Y) position.
+
+    A run holds a constant irradiance and temperature from its start time
+    until the start of the next run of its position. Runs where a position
+    has no voxel hold NaN. Runs are keyed by position code and start time
+    code, so queries bisect the runs directly without decompressing.
+    """
+
+    def __init__(
+        self,
+        times: np.ndarray,
+        positions: np.ndarray,
+        keys: np.ndarray,
+        values: np.ndarray,
+    ) -> None:
+        """Create compressed voxels from already encoded runs. See compress
+        and load.
+
+        Args:
+            times (np.ndarray): Ascending measured times. Seconds.
+            positions (np.ndarray): Lexicographically sorted X, Y positions of
+                shape (P, 2).
+            keys (np.ndarray): Ascending run keys, position code * len(times)
+                + start time code.
+            values (np.ndarray): Irradiance (W/m^2) and temperature (K) of
+                each run, of shape (R, 2).
+        """
+        self.times = times
+        self.positions = positions
+        self.keys = keys
+        self.values = values
+
+        self._axes = [np.unique(positions[:, 0]), np.unique(positions[:, 1])]
+        self._pos_keys = np.searchsorted(self._axes[0], positions[:, 0]) * len(
+            self._axes[1]
+        ) + np.searchsorted(self._axes[1], positions[:, 1])
+
+    @classmethod
+    def compress(cls, voxels: np.ndarray, resolution: list[float] = None):
+        """Run length encode a set of voxels.
+
+        Args:
+            voxels (np.ndarray): Voxels as rows of X, Y, T, IRRAD, TEMP.
+            resolution (list[float], optional): Irradiance (W/m^2) and
+                temperature (K) resolution. Values are rounded to the nearest
+                multiple, so that slow drift collapses into runs. Defaults to
+                None, lossless.
+
+        Returns:
+            CompressedVoxels: Compressed voxels.
+        """
+        voxels = np.asarray(voxels, dtype=float).reshape(-1, 5)
+        times, t_code = np.unique(voxels[:, 2], return_inverse=True)
+        positions, p_code = np.unique(voxels[:, :2], axis=0, return_inverse=True)
+        p_code = p_code.reshape(-1)
+        num_t = len(times)
+
+        values = voxels[:, 3:]
+        if resolution is not None:
+            resolution = np.asarray(resolution, dtype=float)
+            values = np.round(values / resolution) * resolution
+
+        # Order by position, then time.
+        order = np.lexsort((t_code, p_code))
+        p_code, t_code, values = p_code[order], t_code[order], values[order]
+
+        # A run starts at a new position, after a gap in time or on a change
+        # of value.
+        first = np.ones(len(p_code), dtype=bool)
+        first[1:] = p_code[1:] != p_code[:-1]
+        last = np.ones(len(p_code), dtype=bool)
+        last[:-1] = first[1:]
+        start = first.copy()
+        start[1:] |= t_code[1:] != t_code[:-1] + 1
+        start[1:] |= np.any(values[1:] != values[:-1], axis=1)
+
+        # Gaps in time, including before the first and after the last voxel
+        # of a position, are held as NaN runs.
+        gap_after = np.zeros(len(p_code), dtype=bool)
+        gap_after[:-1] = ~last[:-1] & (t_code[1:] > t_code[:-1] + 1)
+        gap_after |= last & (t_code < num_t - 1)
+        gap_before = first & (t_code > 0)
+
+        keys = np.concatenate(
+            [
+                p_code[start] * num_t + t_code[start],
+                p_code[gap_after] * num_t + t_code[gap_after] + 1,
+                p_code[gap_before] * num_t,
+            ]
+        ).astype(np.int64)
+        runs = np.concatenate(
+            [
+                values[start],
+                np.full((np.count_nonzero(gap_after | gap_before), 2), np.nan),
+            ]
+        )
+
+        order = np.argsort(keys, kind="stable")
+        return cls(times, positions, keys[order], runs[order])
+
+    def decompress(self) -> np.ndarray:
+        """Expand the runs back into voxels, in T, X, Y order.
+
+        Returns:
+            np.ndarray: Voxels as rows of X, Y, T, IRRAD, TEMP.
+        """
+        num_t = len(self.times)
+        p_code = self.keys // num_t
+        t_code = self.keys % num_t
+
+        # Each run spans until the next run of its position.
+        ends = np.full(len(self.keys), num_t)
+        same = p_code[1:] == p_code[:-1]
+        ends[:-1][same] = t_code[1:][same]
+        lengths = ends - t_code
+
+        run = np.repeat(np.arange(len(self.keys)), lengths)
+        offset = np.arange(len(run)) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        values = self.values[run]
+        exists = ~np.isnan(values[:, 0])
+
+        pos = self.positions[p_code[run][exists]]
+        voxels = np.column_stack(
+            [pos, self.times[(t_code[run] + offset)[exists]], values[exists]]
+        )
+        return voxels[np.lexsort((voxels[:, 1], voxels[:, 0], voxels[:, 2]))]
+
+    def _get_runs(
+        self, X: np.ndarray, Y: np.ndarray, T: np.ndarray
+    ) -> (np.ndarray, np.ndarray):
+        """Find the run holding each of a batch of voxels.
+
+        Returns:
+            (np.ndarray, np.ndarray): Whether each voxel was found, and its run.
+        """
+        X, Y, T = np.broadcast_arrays(
+            np.asarray(X, dtype=float),
+            np.asarray(Y, dtype=float),
+            np.asarray(T, dtype=float),
+        )
+        found = np.zeros(X.shape, dtype=bool)
+        runs = np.zeros(X.shape, dtype=np.int64)
+        if len(self.keys) == 0:
+            return found, runs
+
+        t_code = np.minimum(np.searchsorted(self.times, T), len(self.times) - 1)
+        found = self.times[t_code] == T
+
+        # Positions are sorted by X, then Y, so their dense axis codes are
+        # ascending keys.
+        codes = []
+        for values, coords in zip(self._axes, [X, Y]):
+            code = np.minimum(np.searchsorted(values, coords), len(values) - 1)
+            found &= values[code] == coords
+            codes.append(code)
+        pos_keys = codes[0] * len(self._axes[1]) + codes[1]
+        p_code = np.minimum(
+            np.searchsorted(self._pos_keys, pos_keys), len(self._pos_keys) - 1
+        )
+        found &= self._pos_keys[p_code] == pos_keys
+
+        keys = p_code * len(self.times) + t_code
+        runs = np.maximum(np.searchsorted(self.keys, keys, side="right") - 1, 0)
+        found &= ~np.isnan(self.values[runs, 0])
+        return found, runs
+
+    def get_voxels_at(
+        self, X: list[int], Y: list[int], T: list[int], missing: str = "raise"
+    ) -> (np.ndarray, np.ndarray):
+        """Get the voxel outputs for a batch of voxel inputs. Inputs are
+        broadcast against each other.
+
+        Args:
+            X (list[int]): X space coordinates.
+            Y (list[int]): Y space coordinates.
+            T (list[int]): T time coordinates.
+            missing (str, optional): Handling of voxels not in the environment.
+                Either 'raise', or 'nan' to fill with NaN. Defaults to 'raise'.
+
+        Returns:
+            (np.ndarray, np.ndarray): Irradiance (W/m^2) and temperature (K)
+                arrays in the shape of the inputs.
+        """
+        if missing not in ["raise", "nan"]:
+            raise Exception("Invalid missing voxel handling.")
+
+        found, runs = self._get_runs(X, Y, T)
+        if not np.all(found) and missing == "raise":
+            raise Exception("Voxel does not exist in environment.")
+
+        values = np.where(found[..., np.newaxis], self.values[runs], np.nan)
+        return values[..., 0], values[..., 1]
+
+    def get_unchanged_since(
+        self, X: list[int], Y: list[int], T: list[int]
+    ) -> np.ndarray:
+        """Get the time since which each of a batch of voxels has held its
+        current output. Work depending only on a voxel's output can be reused
+        from any time at or after it.
+
+        Args:
+            X (list[int]): X space coordinates.
+            Y (list[int]): Y space coordinates.
+            T (list[int]): T time coordinates.
+
+        Returns:
+            np.ndarray: Start time of the run holding each voxel, or NaN if the
+                voxel does not exist. Seconds.
+        """
+        found, runs = self._get_runs(X, Y, T)
+        since = self.times[self.keys[runs] % len(self.times)]
+        return np.where(found, since, np.nan)
+
+    def get_unchanged_times(
+        self, X: list[int], Y: list[int], T: float
+    ) -> np.ndarray:
+        """Get the measured times around a time over which a set of positions
+        all hold the output they have at that time. Work depending only on
+        their outputs at T can be reused at any of these times.
+
+        Args:
+            X (list[int]): X space coordinates.
+            Y (list[int]): Y space coordinates.
+            T (float): T time coordinate.
+
+        Returns:
+            np.ndarray: Ascending measured times, between the last run start of
+                the positions at or before T and the next run start after T.
+                Empty if a voxel does not exist at T. Seconds.
+        """
+        found, runs = self._get_runs(X, Y, T)
+        if not np.all(found):
+            return self.times[:0]
+        runs = np.ravel(runs)
+        num_t = len(self.times)
+        if len(runs) == 0:
+            return self.times
+
+        # Each run spans until the next run of its position.
+        after = np.minimum(runs + 1, len(self.keys) - 1)
+        ends = np.where(
+            (runs + 1 < len(self.keys))
+            & (self.keys[after] // num_t == self.keys[runs] // num_t),
+            self.keys[after] % num_t,
+            num_t,
+        )
+        return self.times[np.max(self.keys[runs] % num_t) : np.min(ends)]
+
+    def get_changed(self, t_start: float, t_end: float) -> np.ndarray:
+        """Get the positions whose output changes in a time window.
+
+        Args:
+            t_start (float): Exclusive start of the window. Seconds.
+            t_end (float): Inclusive end of the window. Seconds.
+
+        Returns:
+            np.ndarray: X, Y positions of shape (N, 2).
+        """
+        num_t = len(self.times)
+        if num_t == 0:
+            return np.empty((0, 2))
+        start = self.times[self.keys % num_t]
+        changed = (start > t_start) & (start <= t_end)
+        return self.positions[np.unique(self.keys[changed] // num_t)]
+
+    def save(self, filepath: str) -> None:
+        """Save the compressed voxels to disk.
+
+        Args:
+            filepath (str): Path of .npz file to save/overwrite.
+        """
+        np.savez_compressed(
+            filepath,
+            times=self.times,
+            positions=self.positions,
+            keys=self.keys,
+            values=self.values,
+        )
+
+    @classmethod
+    def load(cls, filepath: str):
+        """Load compressed voxels from disk.
+
+        Args:
+            filepath (str): Path of .npz file to load.
+
+        Returns:
+            CompressedVoxels: Loaded voxels.
+        """
+        with np.load(filepath) as data:
+            return cls(data["times"], data["positions"], data["keys"], data["values"])
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the encoded runs. Bytes."""
+        return (
+            self.times.nbytes
+            + self.positions.nbytes
+            + self.keys.nbytes
+            + self.values.nbytes
+        )
@@ -5,7 +5,12 @@
 @version    0.4.0
 @date       2023-09-24
 """
+import itertools
+import os
+import struct
 import sys
+import tempfile
+from collections import OrderedDict
 
 import numpy as np
 import pandas as pd
@@ -13,54 +18,211 @@ import pyqtgraph as pg
 from PySide6 import QtWidgets
 
 import common.config as CONFIG
+from environment.compression import CompressedVoxels
+from environment.interpolator import VoxelInterpolator
 
 
 class Environment:
     """Environment class models external conditions experienced by the
     photovoltaic system."""
 
-    def __init__(self, filepath: str = None) -> None:
+    COLUMNS = ["X", "Y", "T", "IRRAD", "TEMP"]
+    SLICE_CACHE_SIZE = 64
+    NPY_HEADER_SIZE = 128
+
+    def __init__(
+        self,
+        filepath: str = None,
+        t_range: list[float] = None,
+        x_range: list[float] = None,
+        y_range: list[float] = None,
+        out_of_core: bool = False,
+    ) -> None:
         """Initialize a new environment instance.
 
         Args:
             filepath (str, optional): Filepath for environment data file.
                 Defaults to None.
+            t_range (list[float], optional): Inclusive time window to load.
+                Defaults to None, all times.
+            x_range (list[float], optional): Inclusive X window to load.
+                Defaults to None, all positions.
+            y_range (list[float], optional): Inclusive Y window to load.
+                Defaults to None, all positions.
+            out_of_core (bool, optional): Leave the voxels of a .npy file on
+                disk, memory mapped, and page time slices in as they are
+                queried. Resident memory is then bounded regardless of the
+                environment length. Adding voxels loads the environment into
+                memory. Defaults to False.
         """
+        self._df = None
+        self._sorted = False
+        self._out_of_core = False
+        self._index = None
+        self._slice_index = OrderedDict()
+        self._interp = None
+        self._interpolator = None
+        self._compressed = None
+
         if filepath != None:
-            self.df = self.load_env(filepath)
+            if out_of_core:
+                if not str(filepath).endswith(".npy") or x_range or y_range:
+                    raise Exception("Out of core requires a .npy time window.")
+                self.np = self._load_voxels(filepath, t_range)
+                self._out_of_core = True
+            else:
+                self.np = self.load_env(filepath, t_range, x_range, y_range).to_numpy(
+                    dtype=float
+                )
         else:
-            self.df = pd.DataFrame(
-                data={
-                    "X": [],
-                    "Y": [],
-                    "T": [],
-                    "IRRAD": [],
-                    "TEMP": [],
-                }
-            )
-        self.np = self.df.to_numpy()
+            self.np = np.empty((0, len(self.COLUMNS)))
 
-    def load_env(self, filepath: str) -> pd.DataFrame:
+    @property
+    def df(self) -> pd.DataFrame:
+        """Pandas mirror of the voxels. Only materialized when requested. See
+        get_voxels."""
+        return self.get_voxels()
+
+    def _canonicalize(self) -> None:
+        """Sort the voxels into canonical T, X, Y order, once per mutation.
+        Voxels out of core are already sorted by time on disk."""
+        if not self._sorted and not self._out_of_core:
+            order = np.lexsort((self.np[:, 1], self.np[:, 0], self.np[:, 2]))
+            self.np = self.np[order]
+        self._sorted = True
+
+    def _load_voxels(self, filepath: str, t_range: list[float] = None) -> np.ndarray:
+        """Memory map the voxels of a .npy file, sliced to a time window.
+
+        Args:
+            filepath (str): Path of .npy file to load.
+            t_range (list[float], optional): Inclusive time window to load.
+
+        Returns:
+            np.ndarray: Memory mapped voxels.
+        """
+        voxels = np.load(filepath, mmap_mode="r")
+        if t_range is not None:
+            # Voxels are saved sorted by time; bisect for the window.
+            lo = np.searchsorted(voxels[:, 2], t_range[0], side="left")
+            hi = np.searchsorted(voxels[:, 2], t_range[1], side="right")
+            voxels = voxels[lo:hi]
+        return voxels
+
+    def load_env(
+        self,
+        filepath: str,
+        t_range: list[float] = None,
+        x_range: list[float] = None,
+        y_range: list[float] = None,
+    ) -> pd.DataFrame:
         """Load from an environmental file that represents a complete or
-        incomplete set of voxels.
+        incomplete set of voxels. The format is chosen by extension:
+
+        - .npy: raw binary voxels in T, X, Y order. Memory mapped; only the
+          requested time window is read from disk.
+        - .rle.npz: voxels run length encoded along time. See
+          compress_voxels.
+        - .npz: compressed binary columns.
+        - .parquet: columnar, windows are pushed down to the reader. Requires
+          a parquet engine such as pyarrow.
+        - otherwise: CSV.
 
         Args:
             filepath (str): Path of file to load.
+            t_range (list[float], optional): Inclusive time window to load.
+            x_range (list[float], optional): Inclusive X window to load.
+            y_range (list[float], optional): Inclusive Y window to load.
 
         Returns:
             pd.DataFrame: Pandas Dataframe of file.
         """
-        return pd.read_csv(filepath)
+        windows = {"T": t_range, "X": x_range, "Y": y_range}
+        filepath = str(filepath)
+
+        if filepath.endswith(".npy"):
+            voxels = self._load_voxels(filepath, t_range)
+            df = pd.DataFrame(np.array(voxels), columns=self.COLUMNS)
+        elif filepath.endswith(".rle.npz"):
+            voxels = CompressedVoxels.load(filepath).decompress()
+            df = pd.DataFrame(voxels, columns=self.COLUMNS)
+        elif filepath.endswith(".npz"):
+            with np.load(filepath) as data:
+                df = pd.DataFrame({col: data[col] for col in self.COLUMNS})
+        elif filepath.endswith(".parquet"):
+            filters = [
+                (col, op, bound)
+                for col, window in windows.items()
+                if window is not None
+                for op, bound in zip([">=", "<="], window)
+            ]
+            df = pd.read_parquet(filepath, filters=filters or None)
+        else:
+            df = pd.read_csv(filepath)
+
+        for col, window in windows.items():
+            if window is not None:
+                df = df[(df[col] >= window[0]) & (df[col] <= window[1])]
+
+        return df.reset_index(drop=True)
 
     def save_env(self, filepath: str) -> None:
         """Save into an environmental file that represents a complete or incomplete
-        set of voxels.
+        set of voxels. The format is chosen by extension; see load_env. Binary
+        formats preserve full precision.
 
         Args:
             filepath (str): Path of file to save/overwrite.
         """
-        self.get_voxels()
-        self.df.to_csv(filepath, index=None, float_format="%.3f")
+        filepath = str(filepath)
+        self._canonicalize()
+        voxels = self.np
+
+        if filepath.endswith(".npy"):
+            np.save(filepath, np.ascontiguousarray(voxels, dtype=float))
+        elif filepath.endswith(".rle.npz"):
+            self.compress_voxels().save(filepath)
+        elif filepath.endswith(".npz"):
+            np.savez_compressed(
+                filepath, **{col: voxels[:, i] for i, col in enumerate(self.COLUMNS)}
+            )
+        elif filepath.endswith(".parquet"):
+            pd.DataFrame(voxels, columns=self.COLUMNS).to_parquet(filepath, index=False)
+        else:
+            self.get_voxels().to_csv(filepath, index=None, float_format="%.3f")
+
+    def compress_voxels(self, resolution: list[float] = None) -> CompressedVoxels:
+        """Run length encode the voxels along time. Most positions hold their
+        irradiance and temperature for long stretches, so the runs are far
+        smaller than the voxels. The result is queryable without
+        decompressing, and reports how long each voxel has been unchanged.
+
+        Args:
+            resolution (list[float], optional): Irradiance (W/m^2) and
+                temperature (K) resolution to round values to before encoding.
+                Defaults to None, lossless.
+
+        Returns:
+            CompressedVoxels: Compressed voxels.
+        """
+        self._canonicalize()
+        return CompressedVoxels.compress(np.asarray(self.np), resolution)
+
+    def get_compressed_voxels(self) -> CompressedVoxels:
+        """Get the lossless run length encoding of the voxels, kept until the
+        voxels change. Its runs bound the spans of time over which positions
+        hold their output. See CompressedVoxels.get_unchanged_times.
+
+        Returns:
+            CompressedVoxels: Compressed voxels, or None if the environment is
+                out of core or interpolated, since its outputs are then not
+                held in runs.
+        """
+        if self._out_of_core or self._interp is not None:
+            return None
+        if self._compressed is None:
+            self._compressed = self.compress_voxels()
+        return self._compressed
 
     def add_voxel(self, X: int, Y: int, T: int, irrad: float, temp: float) -> None:
         """Add a voxel to our current environment.
@@ -73,6 +235,7 @@ class Environment:
             temp (float): Temperature (K) at this place, at this time.
         """
         self.np = np.vstack((self.np, [X, Y, T, irrad, temp]))
+        self._invalidate()
 
     def add_voxels(
         self,
@@ -92,6 +255,7 @@ class Environment:
             temp (list, float): Temperature (K) at this place, at this time.
         """
         self.np = np.vstack((self.np, np.array([X, Y, T, irrad, temp]).transpose()))
+        self._invalidate()
 
     def gen_voxels(self, func) -> None:
         """Generate voxels from a function.
@@ -102,12 +266,253 @@ class Environment:
             Voxels.
         """
         self.np = np.vstack((self.np, func()))
+        self._invalidate()
+
+    def stream_voxels(
+        self, chunks, filepath: str = None, keep: bool = True
+    ) -> None:
+        """Add voxels from a stream of chunks, such as a weather file reader
+        or a procedural generator, committing them incrementally.
+
+        Args:
+            chunks (iterable[[[int, int, int, float, float]]]): Iterator or
+                generator of voxel chunks, each like the return of gen_voxels.
+            filepath (str, optional): .npy file to write the environment
+                through to as chunks arrive. Chunks must then arrive in
+                nondecreasing time order. Defaults to None.
+            keep (bool, optional): Hold the voxels in memory. If False, the
+                environment is left out of core on filepath, so peak memory is
+                a single chunk. Defaults to True.
+
+        The file is written beside filepath and only replaces it once the
+        stream finishes, so filepath may be the file the environment is out of
+        core on, and is left untouched if the stream fails.
+        """
+        if not keep and filepath is None:
+            raise Exception("Streaming without keeping voxels needs a filepath.")
+        if filepath is not None and not str(filepath).endswith(".npy"):
+            raise Exception("Streaming writes through to .npy files only.")
+
+        kept = [np.asarray(self.np, dtype=float)]
+        writer = None
+        if filepath is not None:
+            fd, temp_path = tempfile.mkstemp(
+                suffix=".npy", dir=os.path.dirname(os.path.abspath(filepath))
+            )
+            writer = os.fdopen(fd, "wb")
+            writer.seek(self.NPY_HEADER_SIZE)
+            chunks = itertools.chain([self.np], chunks)
+
+        num_rows = 0
+        last_t = -np.inf
+        try:
+            for idx, chunk in enumerate(chunks):
+                chunk = np.asarray(chunk, dtype=float).reshape(-1, len(self.COLUMNS))
+                if writer is None:
+                    kept.append(chunk)
+                    continue
+
+                chunk = chunk[np.lexsort((chunk[:, 1], chunk[:, 0], chunk[:, 2]))]
+                if len(chunk) and chunk[0, 2] < last_t:
+                    raise Exception("Chunks must arrive in time order.")
+                if len(chunk):
+                    last_t = chunk[-1, 2]
+
+                writer.write(chunk.astype("<f8").tobytes())
+                num_rows += len(chunk)
+                if keep and idx > 0:
+                    kept.append(chunk)
+        except BaseException:
+            if writer is not None:
+                writer.close()
+                os.remove(temp_path)
+            raise
+
+        if writer is not None:
+            writer.seek(0)
+            self._write_npy_header(writer, num_rows)
+            writer.close()
+            os.replace(temp_path, filepath)
+
+        if keep:
+            self.np = np.concatenate(kept)
+            self._invalidate()
+        else:
+            self.np = self._load_voxels(filepath)
+            self._invalidate()
+            self._out_of_core = True
+
+    def _write_npy_header(self, f, num_rows: int) -> None:
+        """Write a fixed size .npy header for a voxel array, so that the header
+        can be written after streaming an unknown number of rows."""
+        header = {
+            "descr": "<f8",
+            "fortran_order": False,
+            "shape": (num_rows, len(self.COLUMNS)),
+        }
+        header = repr(header).encode("latin1")
+        magic = np.lib.format.magic(1, 0)
+        pad = self.NPY_HEADER_SIZE - len(magic) - 2 - len(header) - 1
+        f.write(magic)
+        f.write(struct.pack("<H", self.NPY_HEADER_SIZE - len(magic) - 2))
+        f.write(header + b" " * pad + b"\n")
+
+    def resample_voxels(
+        self, step: float, t_range: list[float] = None
+    ) -> "Environment":
+        """Resample the time axis onto an even grid. Each new time stands for
+        the window until the next one. Windows holding measured voxels average
+        them, so downsampling keeps the mean irradiance and temperature.
+        Windows between measured times, when upsampling, interpolate linearly
+        from the neighboring measured times.
+
+        Args:
+            step (float): Time step of the new grid. Seconds.
+            t_range (list[float], optional): Inclusive bounds of the new grid.
+                Defaults to the measured times.
+
+        Returns:
+            Environment: New environment on the resampled time axis.
+        """
+        if step <= 0:
+            raise Exception("Time step must be positive.")
+
+        env = Environment()
+        self._canonicalize()
+        voxels = np.asarray(self.np)
+        if len(voxels) == 0:
+            return env
+
+        times, t_code = np.unique(voxels[:, 2], return_inverse=True)
+        positions, p_code = np.unique(voxels[:, :2], axis=0, return_inverse=True)
+        p_code = p_code.reshape(-1)
+        if t_range is None:
+            t_range = [times[0], times[-1]]
+        num_times = int(np.floor((t_range[1] - t_range[0]) / step + 1e-9)) + 1
+        new_times = t_range[0] + step * np.arange(num_times)
+
+        # Dense (T, P, 2) grid of measured outputs, NaN where unmeasured.
+        grid = np.full((len(times), len(positions), 2), np.nan)
+        grid[t_code, p_code] = voxels[:, 3:]
+
+        # Average measured times falling in each window.
+        bins = np.floor((times - new_times[0]) / step).astype(int)
+        inside = (bins >= 0) & (bins < len(new_times))
+        measured = ~np.isnan(grid[inside])
+        sums = np.zeros((len(new_times), len(positions), 2))
+        counts = np.zeros(sums.shape)
+        np.add.at(sums, bins[inside], np.where(measured, grid[inside], 0.0))
+        np.add.at(counts, bins[inside], measured)
+        mean = np.divide(sums, counts, out=np.full(sums.shape, np.nan), where=counts > 0)
+
+        # Interpolate windows without a measurement, between the nearest
+        # measured times of each position.
+        steps = np.arange(len(times))[:, np.newaxis]
+        measured = ~np.isnan(grid[..., 0])
+        prev = np.maximum.accumulate(np.where(measured, steps, -1), axis=0)
+        succ = np.minimum.accumulate(
+            np.where(measured, steps, len(times))[::-1], axis=0
+        )[::-1]
+
+        t = np.clip(new_times, times[0], times[-1])
+        lo = prev[np.searchsorted(times, t, side="right") - 1]
+        hi = succ[np.searchsorted(times, t, side="left")]
+        known = (lo >= 0) | (hi < len(times))
+        lo, hi = np.where(lo >= 0, lo, hi), np.where(hi < len(times), hi, lo)
+        lo, hi = np.where(known, lo, 0), np.where(known, hi, 0)
+
+        P = np.arange(len(positions))
+        span = times[hi] - times[lo]
+        weight = np.divide(
+            t[:, np.newaxis] - times[lo], span, out=np.zeros(span.shape), where=span > 0
+        )[..., np.newaxis]
+        interp = grid[lo, P] * (1 - weight) + grid[hi, P] * weight
+        interp[~known] = np.nan
+        values = np.where(counts > 0, mean, interp)
+
+        T, P = np.meshgrid(new_times, np.arange(len(positions)), indexing="ij")
+        exists = ~np.isnan(values[..., 0])
+        env.gen_voxels(
+            lambda: np.column_stack(
+                [positions[P[exists]], T[exists], values[exists]]
+            )
+        )
+        return env
+
+    def coarsen_voxels(self, factor: list[int]) -> "Environment":
+        """Spatially coarsen the voxels by averaging blocks of cells.
 
-    def interp_voxels(self) -> None:
-        """TODO: Interpolate voxels not explicitly specified in the environment based on
-        existing voxels.
+        Args:
+            factor (list[int]): Number of X and Y cells per block. The block
+                holding X, Y is at X // factor[0], Y // factor[1].
+
+        Returns:
+            Environment: New environment on the coarsened canvas.
+        """
+        if factor[0] < 1 or factor[1] < 1:
+            raise Exception("Coarsening factor must be at least 1.")
+
+        env = Environment()
+        self._canonicalize()
+        voxels = np.asarray(self.np)
+        if len(voxels) == 0:
+            return env
+
+        blocks = np.column_stack(
+            [
+                voxels[:, 2],
+                np.floor(voxels[:, 0] / factor[0]),
+                np.floor(voxels[:, 1] / factor[1]),
+            ]
+        )
+        blocks, code = np.unique(blocks, axis=0, return_inverse=True)
+        code = code.reshape(-1)
+        counts = np.bincount(code, minlength=len(blocks))
+        irrad = np.bincount(code, weights=voxels[:, 3], minlength=len(blocks))
+        temp = np.bincount(code, weights=voxels[:, 4], minlength=len(blocks))
+
+        env.gen_voxels(
+            lambda: np.column_stack(
+                [blocks[:, 1], blocks[:, 2], blocks[:, 0], irrad / counts, temp / counts]
+            )
+        )
+        return env
+
+    def _invalidate(self) -> None:
+        """Drop everything derived from the voxels after they change. Changed
+        voxels are held in memory."""
+        self._df = None
+        self._sorted = False
+        self._out_of_core = False
+        self._index = None
+        self._slice_index.clear()
+        self._interpolator = None
+        self._compressed = None
+
+    def interp_voxels(self, method: str = "linear", cache_size: int = 32) -> None:
+        """Interpolate voxels not explicitly specified in the environment based on
+        existing voxels. Voxels are not materialized; missing positions and
+        fractional times are evaluated on demand by get_voxel(s_at).
+
+        Args:
+            method (str, optional): Either 'nearest', or 'linear' for linear in
+                time and bilinear in space. Defaults to 'linear'.
+            cache_size (int, optional): Number of interpolated time slices to
+                hold. Defaults to 32.
         """
-        return
+        if method not in VoxelInterpolator.METHODS:
+            raise Exception("Invalid interpolation method.")
+
+        self._interp = {"method": method, "cache_size": cache_size}
+        self._interpolator = None
+
+    def _get_interpolator(self) -> VoxelInterpolator:
+        # Interpolating on request does not turn on interpolation for later
+        # queries; only interp_voxels does.
+        if self._interpolator is None:
+            interp = self._interp or {"method": "linear", "cache_size": 32}
+            self._interpolator = VoxelInterpolator(self.np, **interp)
+        return self._interpolator
 
     def vis_voxels(self) -> None:
         """Visualize voxels in the current environment using PySide6, PyQtGraph.
@@ -123,8 +528,12 @@ class Environment:
         win.setWindowTitle("Environment")
         view = pg.GraphicsLayoutWidget()
 
-        # Get first timeslice.
-        df = self.get_voxels()
+        # Frames are binned into pre-shaped grids on first display, so that
+        # each later frame is a swap of arrays.
+        self._canonicalize()
+        times = np.unique(self.np[:, 2])
+        shape = self._get_grid_shape()
+        frames = {}
 
         # Plot first mesh on irradiance plot.
         plot_irrad = view.addPlot()
@@ -138,28 +547,20 @@ class Environment:
 
         # Cycle through time and update the meshes.
         def update():
-            def _get_slice(df: pd.DataFrame, idx: int):
-                df = df[df["T"] == idx]
-                if df["X"].empty:
-                    return df["IRRAD"], df["TEMP"], None, None
-                else:
-                    return (
-                        df["IRRAD"],
-                        df["TEMP"],
-                        int(df["X"].max()) + 1,
-                        int(df["Y"].max()) + 1,
-                    )
-
-            update.time_idx += 1
-
-            irrad, temp, max_x, max_y = _get_slice(df, update.time_idx)
-            if max_x == None:
-                update.time_idx = 0
-            else:
-                mesh_irrad.setData(irrad.to_numpy().reshape(max_x, max_y))
-                mesh_temp.setData(temp.to_numpy().reshape(max_x, max_y))
+            if len(times) == 0:
+                return
+
+            update.time_idx = (update.time_idx + 1) % len(times)
+            if update.time_idx not in frames:
+                frames[update.time_idx] = self.get_voxels_grid(
+                    times[update.time_idx], shape
+                )
+
+            irrad, temp = frames[update.time_idx]
+            mesh_irrad.setData(irrad)
+            mesh_temp.setData(temp)
 
-        update.time_idx = 0
+        update.time_idx = -1
 
         timer = pg.QtCore.QTimer()
         timer.timeout.connect(update)
@@ -171,23 +572,68 @@ class Environment:
         app.exec()
 
     def get_voxels(self) -> pd.DataFrame:
-        """Get all voxels, sorted by X, Y, T axes.
+        """Get all voxels, sorted by T, X, Y axes. The DataFrame is cached
+        and only rebuilt after the voxels change; do not modify it.
 
         Returns:
             pd.DataFrame: Pandas Dataframe of all voxels.
         """
-        self.df = pd.DataFrame(
-            self.np,
-            columns=[
-                f"X",
-                f"Y",
-                f"T",
-                "IRRAD",
-                "TEMP",
-            ],
-        )
-        self.df = self.df.sort_values(by=["T", "X", "Y"])
-        return self.df
+        if self._df is None:
+            self._canonicalize()
+            self._df = pd.DataFrame(np.asarray(self.np), columns=self.COLUMNS)
+            if self._out_of_core:
+                self._df = self._df.sort_values(
+                    by=["T", "X", "Y"], kind="stable", ignore_index=True
+                )
+        return self._df
+
+    def _get_grid_shape(self) -> (int, int):
+        """Get the X, Y shape of the canvas spanning all voxels from the
+        origin."""
+        if len(self.np) == 0:
+            return 0, 0
+        return int(np.max(self.np[:, 0])) + 1, int(np.max(self.np[:, 1])) + 1
+
+    def get_voxels_grid(
+        self, T: float, shape: (int, int) = None
+    ) -> (np.ndarray, np.ndarray):
+        """Get a time slice binned into irradiance and temperature grids.
+
+        Args:
+            T (float): T time coordinate.
+            shape ((int, int), optional): X, Y shape of the grids. Defaults
+                to the canvas spanning all voxels from the origin.
+
+        Returns:
+            (np.ndarray, np.ndarray): Irradiance (W/m^2) and temperature (K)
+                grids indexed by X, Y. Positions without a voxel are NaN.
+        """
+        if shape is None:
+            shape = self._get_grid_shape()
+
+        # The slice is a contiguous run of the time sorted voxels.
+        lo, hi = self._get_time_rows(T)
+        voxels = np.asarray(self.np[lo:hi])
+        x = voxels[:, 0].astype(int)
+        y = voxels[:, 1].astype(int)
+        inside = (x >= 0) & (x < shape[0]) & (y >= 0) & (y < shape[1])
+
+        grids = np.full((2, *shape), np.nan)
+        grids[:, x[inside], y[inside]] = voxels[inside, 3:].T
+        return grids[0], grids[1]
+
+    def get_times(self) -> np.ndarray:
+        """Get the measured times of the environment.
+
+        Returns:
+            np.ndarray: Ascending unique times. Seconds.
+        """
+        self._canonicalize()
+        times = np.asarray(self.np[:, 2])
+        if len(times) == 0:
+            return times
+        # Times are sorted, so uniques are at the steps.
+        return times[np.concatenate([[True], times[1:] != times[:-1]])]
 
     def get_voxel(self, X: int, Y: int, T: int) -> (float, float):
         """Get the voxel outputs associated with a set of voxel inputs.
@@ -200,25 +646,151 @@ class Environment:
         Returns:
             (float, float): Tuple of irradiance (W/m^2) and temperature (K).
         """
-        self.df = pd.DataFrame(
-            self.np,
-            columns=[
-                f"X",
-                f"Y",
-                f"T",
-                "IRRAD",
-                "TEMP",
-            ],
+        irrad, temp = self.get_voxels_at([X], [Y], [T])
+        return [float(irrad[0]), float(temp[0])]
+
+    @staticmethod
+    def _build_index(voxels: np.ndarray) -> dict:
+        """Build a lookup index over a set of voxels. Each axis is mapped to
+        dense integer codes, and voxels are keyed by their codes in T, X, Y
+        order.
+
+        Returns:
+            dict: Unique axis values, sorted voxel keys and the voxel row of
+                each key.
+        """
+        axes = []
+        codes = []
+        for col in [2, 0, 1]:
+            values, code = np.unique(voxels[:, col], return_inverse=True)
+            axes.append(values)
+            codes.append(code.astype(np.int64))
+
+        keys = Environment._get_keys(axes, codes)
+        order = np.argsort(keys, kind="stable")
+        return {"axes": axes, "keys": keys[order], "rows": order}
+
+    @staticmethod
+    def _get_keys(axes: list[np.ndarray], codes: list[np.ndarray]) -> np.ndarray:
+        t, x, y = codes
+        return (t * len(axes[1]) + x) * len(axes[2]) + y
+
+    @staticmethod
+    def _lookup(
+        index: dict, X: np.ndarray, Y: np.ndarray, T: np.ndarray
+    ) -> (np.ndarray, np.ndarray):
+        """Find the rows of a batch of voxels in an index.
+
+        Returns:
+            (np.ndarray, np.ndarray): Whether each voxel was found, and its row.
+        """
+        # Map each coordinate onto its axis code; a coordinate not on the axis
+        # means the voxel does not exist.
+        found = np.ones(X.shape, dtype=bool)
+        codes = []
+        for values, coords in zip(index["axes"], [T, X, Y]):
+            code = np.minimum(np.searchsorted(values, coords), len(values) - 1)
+            found &= values[code] == coords
+            codes.append(code.astype(np.int64))
+
+        keys = Environment._get_keys(index["axes"], codes)
+        pos = np.searchsorted(index["keys"], keys)
+        pos = np.minimum(pos, len(index["keys"]) - 1)
+        found &= index["keys"][pos] == keys
+        return found, index["rows"][pos]
+
+    def _get_index(self) -> dict:
+        """Get the lookup index of all voxels, built on first use after the
+        voxels change."""
+        if self._index is None:
+            self._canonicalize()
+            self._index = self._build_index(self.np)
+        return self._index
+
+    def _get_time_rows(self, T: float) -> (int, int):
+        """Get the row span of a time slice."""
+        self._canonicalize()
+        lo = np.searchsorted(self.np[:, 2], T, side="left")
+        hi = np.searchsorted(self.np[:, 2], T, side="right")
+        return lo, hi
+
+    def _get_slice_index(self, T: float) -> (dict, int):
+        """Get the lookup index of a single time slice, paging the slice in
+        from disk. A bounded number of slice indices are held.
+
+        Returns:
+            (dict, int): Index of the slice and row offset of the slice.
+        """
+        if T in self._slice_index:
+            self._slice_index.move_to_end(T)
+        else:
+            lo, hi = self._get_time_rows(T)
+            self._slice_index[T] = (self._build_index(np.asarray(self.np[lo:hi])), lo)
+            while len(self._slice_index) > self.SLICE_CACHE_SIZE:
+                self._slice_index.popitem(last=False)
+        return self._slice_index[T]
+
+    def get_voxels_at(
+        self, X: list[int], Y: list[int], T: list[int], missing: str = None
+    ) -> (np.ndarray, np.ndarray):
+        """Get the voxel outputs for a batch of voxel inputs in one vectorized
+        gather. Inputs are broadcast against each other.
+
+        Args:
+            X (list[int]): X space coordinates.
+            Y (list[int]): Y space coordinates.
+            T (list[int]): T time coordinates.
+            missing (str, optional): Handling of voxels not in the environment.
+                Either 'raise', 'nan' to fill with NaN, or 'interp' to
+                interpolate them. Defaults to 'interp' once interp_voxels is
+                called, otherwise 'raise'.
+
+        Returns:
+            (np.ndarray, np.ndarray): Irradiance (W/m^2) and temperature (K)
+                arrays in the shape of the inputs.
+        """
+        if missing is None:
+            missing = "raise" if self._interp is None else "interp"
+        if missing not in ["raise", "nan", "interp"]:
+            raise Exception("Invalid missing voxel handling.")
+
+        X, Y, T = np.broadcast_arrays(
+            np.asarray(X, dtype=float),
+            np.asarray(Y, dtype=float),
+            np.asarray(T, dtype=float),
         )
+        found = np.zeros(X.shape, dtype=bool)
+        rows = np.zeros(X.shape, dtype=np.int64)
+
+        if self._out_of_core:
+            for t in np.unique(T):
+                index, offset = self._get_slice_index(t)
+                sel = T == t
+                if len(index["keys"]):
+                    found[sel], rows[sel] = self._lookup(index, X[sel], Y[sel], T[sel])
+                    rows[sel] += offset
+        elif len(self.np):
+            found, rows = self._lookup(self._get_index(), X, Y, T)
+
+        if not np.all(found) and missing == "raise":
+            raise Exception("Voxel does not exist in environment.")
+
+        irrad = np.full(X.shape, np.nan)
+        temp = np.full(X.shape, np.nan)
+        irrad[found] = self.np[rows[found], 3]
+        temp[found] = self.np[rows[found], 4]
+
+        if missing == "interp" and not np.all(found):
+            lost = ~found
+            irrad[lost], temp[lost] = self._get_interpolator().get_voxels_at(
+                X[lost], Y[lost], T[lost]
+            )
 
-        voxel = self.df.loc[
-            (self.df["X"] == X) & (self.df["Y"] == Y) & (self.df["T"] == T)
-        ]
-        return voxel.values.tolist()[0][3:]
+        return irrad, temp
 
     def get_voxels_slice(self, idx: int, axis: str = "T") -> pd.DataFrame:
-        """Get a slice of voxels in some independent axis, sorted by X, Y, T
-        axes.
+        """Get a slice of voxels in some independent axis, sorted by T, X, Y
+        axes. Slices are views of the cached voxels; do not modify them.
 
         Args:
             idx (int): Idx of slice.
@@ -230,7 +802,13 @@ class Environment:
         if axis not in ["X", "Y", "T"]:
             return None
 
-        self.get_voxels()
-        df = self.df[self.df[axis] == idx]
-        df = df.sort_values(by=["T", "X", "Y"])
-        return df
+        if axis == "T":
+            # Voxels are sorted by time, so the slice is a contiguous view.
+            lo, hi = self._get_time_rows(idx)
+            if self._out_of_core and self._df is None:
+                # Page in only the requested slice.
+                return pd.DataFrame(np.array(self.np[lo:hi]), columns=self.COLUMNS)
+            return self.get_voxels().iloc[lo:hi]
+
+        df = self.get_voxels()
+        return df[df[axis] == idx]
@@ -0,0 +1,163 @@
+"""
+@file       generators.py
+@author     Matthew Yu (matthewjkyu@gmail.com)
+@brief      Vectorized procedural generators of environment fields.
+@version    0.4.0
+@date       2026-10-19
+
+Fields are numpy arrays of shape (T, X, Y). Irradiance fields are built from a
+clear sky field multiplied by any number of shading fields, and the
+temperature field is then derived from irradiance. to_voxels flattens fields
+into voxels for Environment.gen_voxels:
+
+    times = np.arange(3600)
+    irrad = clear_sky(times, (10, 10), sunrise=0, sunset=3600)
+    irrad *= cloud_shadow(times, (10, 10), [-5, 5], 3, [0.01, 0])
+    temp = cell_temperature(irrad)
+    env.gen_voxels(lambda: to_voxels(times, irrad, temp))
+"""
+
+import numpy as np
+
+
+def _get_grid(shape: tuple[int, int]) -> (np.ndarray, np.ndarray):
+    """Get X and Y coordinates of each cell, of shape (1, X, Y)."""
+    x, y = np.meshgrid(np.arange(shape[0]), np.arange(shape[1]), indexing="ij")
+    return x[np.newaxis], y[np.newaxis]
+
+
+def clear_sky(
+    times: np.ndarray,
+    shape: tuple[int, int],
+    peak: float = 1000.0,
+    sunrise: float = 0.0,
+    sunset: float = 86400.0,
+) -> np.ndarray:
+    """Clear sky irradiance over a day. Irradiance follows a half sine from
+    sunrise to sunset and is uniform in space.
+
+    Args:
+        times (np.ndarray): Times to generate. Seconds.
+        shape (tuple[int, int]): Number of X and Y cells.
+        peak (float, optional): Irradiance at solar noon. W/m^2.
+        sunrise (float, optional): Time of sunrise. Seconds.
+        sunset (float, optional): Time of sunset. Seconds.
+
+    Returns:
+        np.ndarray: Irradiance field of shape (T, X, Y). W/m^2.
+    """
+    times = np.asarray(times, dtype=float)
+    phase = np.clip((times - sunrise) / (sunset - sunrise), 0.0, 1.0)
+    irrad = peak * np.sin(np.pi * phase)
+    return np.broadcast_to(irrad[:, np.newaxis, np.newaxis], (len(times), *shape)).copy()
+
+
+def cloud_shadow(
+    times: np.ndarray,
+    shape: tuple[int, int],
+    center: list[float],
+    radius: float,
+    velocity: list[float],
+    opacity: float = 0.8,
+    softness: float = 1.0,
+) -> np.ndarray:
+    """Shading of a round cloud translating across the canvas.
+
+    Args:
+        times (np.ndarray): Times to generate. Seconds.
+        shape (tuple[int, int]): Number of X and Y cells.
+        center (list[float]): X, Y position of the cloud at time 0. Cells.
+        radius (float): Radius of the cloud. Cells.
+        velocity (list[float]): X, Y velocity of the cloud. Cells/second.
+        opacity (float, optional): Fraction of irradiance blocked by the
+            cloud core.
+        softness (float, optional): Width of the cloud edge. Cells.
+
+    Returns:
+        np.ndarray: Fraction of irradiance transmitted, of shape (T, X, Y).
+    """
+    times = np.asarray(times, dtype=float)[:, np.newaxis, np.newaxis]
+    x, y = _get_grid(shape)
+    dist = np.hypot(
+        x - (center[0] + velocity[0] * times), y - (center[1] + velocity[1] * times)
+    )
+    mask = np.clip((radius - dist) / max(softness, 1e-9) + 0.5, 0.0, 1.0)
+    return 1.0 - opacity * mask
+
+
+def obstacle_shade(
+    times: np.ndarray,
+    shape: tuple[int, int],
+    cells: list[list[int]],
+    opacity: float = 1.0,
+) -> np.ndarray:
+    """Shading of a fixed obstacle, such as a mast or a bird dropping, over a
+    set of cells.
+
+    Args:
+        times (np.ndarray): Times to generate. Seconds.
+        shape (tuple[int, int]): Number of X and Y cells.
+        cells (list[list[int]]): X, Y positions of shaded cells.
+        opacity (float, optional): Fraction of irradiance blocked.
+
+    Returns:
+        np.ndarray: Fraction of irradiance transmitted, of shape (T, X, Y).
+    """
+    mask = np.ones(shape)
+    cells = np.asarray(cells, dtype=int).reshape(-1, 2)
+    mask[cells[:, 0], cells[:, 1]] = 1.0 - opacity
+    return np.broadcast_to(mask, (len(times), *shape)).copy()
+
+
+def cell_temperature(
+    irrad: np.ndarray, ambient: float = 298.15, noct: float = 318.15
+) -> np.ndarray:
+    """Cell temperature driven by irradiance, using the nominal operating cell
+    temperature (NOCT) model: cells heat linearly with irradiance, reaching
+    NOCT at 800 W/m^2 and 20 C ambient.
+
+    Args:
+        irrad (np.ndarray): Irradiance field. W/m^2.
+        ambient (float | np.ndarray, optional): Ambient temperature, broadcast
+            against irrad. Kelvin.
+        noct (float, optional): Nominal operating cell temperature. Kelvin.
+
+    Returns:
+        np.ndarray: Temperature field in the shape of irrad. Kelvin.
+    """
+    return ambient + (noct - 293.15) / 800.0 * np.asarray(irrad)
+
+
+def to_voxels(
+    times: np.ndarray,
+    irrad: np.ndarray,
+    temp: np.ndarray,
+    origin: list[int] = [0, 0],
+) -> np.ndarray:
+    """Flatten irradiance and temperature fields into voxels, in T, X, Y order.
+
+    Args:
+        times (np.ndarray): Times of the fields. Seconds.
+        irrad (np.ndarray): Irradiance field of shape (T, X, Y). W/m^2.
+        temp (np.ndarray): Temperature field of shape (T, X, Y). Kelvin.
+        origin (list[int], optional): Canvas position of cell (0, 0).
+
+    Returns:
+        np.ndarray: Voxels as rows of X, Y, T, IRRAD, TEMP.
+    """
+    irrad = np.asarray(irrad, dtype=float)
+    t, x, y = np.meshgrid(
+        np.asarray(times, dtype=float),
+        np.arange(irrad.shape[1]) + origin[0],
+        np.arange(irrad.shape[2]) + origin[1],
+        indexing="ij",
+    )
+    return np.column_stack(
+        [
+            x.ravel(),
+            y.ravel(),
+            t.ravel(),
+            irrad.ravel(),
+            np.broadcast_to(temp, irrad.shape).ravel(),
+        ]
+    )
@@ -0,0 +1,232 @@
+"""
+@file       interpolator.py
+@author     Matthew Yu (matthewjkyu@gmail.com)
+@brief      On demand interpolation of sparse environment voxels.
+@version    0.4.0
+@date       2026-10-19
+"""
+
+from collections import OrderedDict
+
+import numpy as np
+from scipy.interpolate import griddata
+
+
+class VoxelInterpolator:
+    """Interpolates voxels not explicitly specified in an environment. Only the
+    measured voxels are kept; positions and times are evaluated on demand.
+
+    Each measured time is expanded into a full (X, Y) slice the first time it
+    is needed, filling unmeasured positions from the measured ones: bilinearly
+    from the lattice of measured rows and columns, or from the nearest
+    measured position where a lattice point is not measured. A bounded
+    number of recent slices is cached. Queries between measured times blend
+    the two neighboring slices.
+    """
+
+    METHODS = ["nearest", "linear"]
+
+    def __init__(
+        self, voxels: np.ndarray, method: str = "linear", cache_size: int = 32
+    ) -> None:
+        """Create an interpolator over a set of measured voxels.
+
+        Args:
+            voxels (np.ndarray): Voxels as rows of X, Y, T, IRRAD, TEMP. May
+                be memory mapped.
+            method (str, optional): Either 'nearest', or 'linear' for linear
+                in time and bilinear in space. Defaults to 'linear'.
+            cache_size (int, optional): Maximum number of slices held.
+                Defaults to 32.
+        """
+        if method not in self.METHODS:
+            raise Exception("Invalid interpolation method.")
+        if len(voxels) == 0:
+            raise Exception("No voxels to interpolate from.")
+
+        self._method = method
+        self._cache_size = cache_size
+        self._cache = OrderedDict()
+
+        # Group measured voxels by time. Voxels already sorted by time, such
+        # as those of an environment out of core, are used in place, and each
+        # time is only read when its slice is first needed.
+        times = voxels[:, 2]
+        if np.any(times[1:] < times[:-1]):
+            voxels = voxels[np.argsort(times, kind="stable")]
+            times = voxels[:, 2]
+        self._voxels = voxels
+        self._starts = np.flatnonzero(np.concatenate([[True], times[1:] != times[:-1]]))
+        self._times = np.asarray(times[self._starts])
+        self._ends = np.append(self._starts[1:], len(self._voxels))
+
+        # Slices span the bounding box of all measured positions.
+        self._x = np.arange(np.min(voxels[:, 0]), np.max(voxels[:, 0]) + 1)
+        self._y = np.arange(np.min(voxels[:, 1]), np.max(voxels[:, 1]) + 1)
+
+    def _get_slice(self, idx: int) -> np.ndarray:
+        """Get the full slice of a measured time.
+
+        Args:
+            idx (int): Index of the measured time.
+
+        Returns:
+            np.ndarray: Irradiance and temperature grids of shape (2, X, Y).
+        """
+        if idx in self._cache:
+            self._cache.move_to_end(idx)
+            return self._cache[idx]
+
+        voxels = np.asarray(self._voxels[self._starts[idx] : self._ends[idx]])
+        points = voxels[:, :2]
+        values = voxels[:, 3:]
+        grid = np.full((2, len(self._x), len(self._y)), np.nan)
+
+        xi = (points[:, 0] - self._x[0]).astype(int)
+        yi = (points[:, 1] - self._y[0]).astype(int)
+        grid[:, xi, yi] = values.T
+
+        missing = np.isnan(grid[0])
+        if np.any(missing):
+            gx, gy = np.meshgrid(self._x, self._y, indexing="ij")
+            targets = (gx[missing], gy[missing])
+
+            fill = griddata(points, values, targets, method="nearest").T
+            if self._method == "linear":
+                lerp, valid = self._fill_bilinear(points, values, *targets)
+                fill = np.where(valid, lerp, fill)
+
+            grid[:, missing] = fill
+
+        self._cache[idx] = grid
+        if len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+
+        return grid
+
+    def _fill_bilinear(
+        self, points: np.ndarray, values: np.ndarray, X: np.ndarray, Y: np.ndarray
+    ) -> (np.ndarray, np.ndarray):
+        """Bilinearly interpolate positions from the lattice spanned by the
+        measured X and Y coordinates. Positions past the edge of the lattice
+        are clamped to it along that axis, so collinear measurements
+        interpolate along their line.
+
+        Args:
+            points (np.ndarray): Measured X and Y positions, of shape (N, 2).
+            values (np.ndarray): Measured irradiance and temperature, of shape
+                (N, 2).
+            X (np.ndarray): X positions to interpolate.
+            Y (np.ndarray): Y positions to interpolate.
+
+        Returns:
+            (np.ndarray, np.ndarray): Irradiance and temperature of shape
+                (2, M), and whether every lattice point weighed into each
+                position was measured.
+        """
+        xs = np.unique(points[:, 0])
+        ys = np.unique(points[:, 1])
+        xi = np.searchsorted(xs, points[:, 0])
+        yi = np.searchsorted(ys, points[:, 1])
+        lattice = np.full((2, len(xs), len(ys)), np.nan)
+        lattice[:, xi, yi] = values.T
+
+        def locate(axis, coords):
+            if len(axis) == 1:
+                idx = np.zeros(coords.shape, dtype=int)
+                return idx, idx, np.zeros(coords.shape)
+            idx = np.searchsorted(axis, coords, side="right") - 1
+            idx = np.clip(idx, 0, len(axis) - 2)
+            frac = (coords - axis[idx]) / (axis[idx + 1] - axis[idx])
+            return idx, idx + 1, np.clip(frac, 0.0, 1.0)
+
+        x0, x1, dx = locate(xs, X)
+        y0, y1, dy = locate(ys, Y)
+
+        fill = np.zeros((2, len(X)))
+        valid = np.ones(len(X), dtype=bool)
+        for xi, yi, weight in [
+            (x0, y0, (1 - dx) * (1 - dy)),
+            (x1, y0, dx * (1 - dy)),
+            (x0, y1, (1 - dx) * dy),
+            (x1, y1, dx * dy),
+        ]:
+            corner = lattice[:, xi, yi]
+            used = weight > 0
+            valid &= ~(used & np.isnan(corner[0]))
+            fill += np.where(used, corner, 0.0) * weight
+
+        return fill, valid
+
+    def _sample(self, grid: np.ndarray, X: np.ndarray, Y: np.ndarray) -> np.ndarray:
+        """Sample a slice at (possibly fractional) positions. Positions outside
+        the slice are clamped to its edge.
+
+        Returns:
+            np.ndarray: Irradiance and temperature of shape (2, N).
+        """
+        x = np.clip(X - self._x[0], 0, len(self._x) - 1)
+        y = np.clip(Y - self._y[0], 0, len(self._y) - 1)
+
+        if self._method == "nearest":
+            return grid[:, np.rint(x).astype(int), np.rint(y).astype(int)]
+
+        x0 = np.minimum(x.astype(int), max(len(self._x) - 2, 0))
+        y0 = np.minimum(y.astype(int), max(len(self._y) - 2, 0))
+        x1 = np.minimum(x0 + 1, len(self._x) - 1)
+        y1 = np.minimum(y0 + 1, len(self._y) - 1)
+        dx = x - x0
+        dy = y - y0
+
+        return (
+            grid[:, x0, y0] * (1 - dx) * (1 - dy)
+            + grid[:, x1, y0] * dx * (1 - dy)
+            + grid[:, x0, y1] * (1 - dx) * dy
+            + grid[:, x1, y1] * dx * dy
+        )
+
+    def get_voxels_at(
+        self, X: np.ndarray, Y: np.ndarray, T: np.ndarray
+    ) -> (np.ndarray, np.ndarray):
+        """Interpolate voxel outputs for a batch of voxel inputs. Times outside
+        of the measured range are clamped to the first or last measured time.
+
+        Args:
+            X (np.ndarray): X space coordinates.
+            Y (np.ndarray): Y space coordinates.
+            T (np.ndarray): T time coordinates.
+
+        Returns:
+            (np.ndarray, np.ndarray): Irradiance (W/m^2) and temperature (K)
+                arrays in the shape of the inputs.
+        """
+        X, Y, T = np.broadcast_arrays(
+            np.asarray(X, dtype=float),
+            np.asarray(Y, dtype=float),
+            np.asarray(T, dtype=float),
+        )
+        shape = X.shape
+        X, Y, T = X.ravel(), Y.ravel(), T.ravel()
+
+        # Bracket each time between two measured times and weight them.
+        t = np.clip(T, self._times[0], self._times[-1])
+        hi = np.minimum(np.searchsorted(self._times, t), len(self._times) - 1)
+        lo = np.maximum(hi - 1, 0)
+        lo = np.where(self._times[hi] == t, hi, lo)
+        span = self._times[hi] - self._times[lo]
+        weight = np.divide(
+            t - self._times[lo], span, out=np.zeros_like(t), where=span > 0
+        )
+        if self._method == "nearest":
+            lo = np.where(weight > 0.5, hi, lo)
+            weight = np.zeros_like(weight)
+
+        out = np.zeros((2, len(X)))
+        for idx in np.unique(np.concatenate([lo, hi[weight > 0]])):
+            grid = self._get_slice(idx)
+            for sel, factor in [(lo == idx, 1 - weight), (hi == idx, weight)]:
+                sel = sel & (factor > 0)
+                if np.any(sel):
+                    out[:, sel] += self._sample(grid, X[sel], Y[sel]) * factor[sel]
+
+        return out[0].reshape(shape), out[1].reshape(shape)
@@ -0,0 +1,204 @@
+"""
+@file       battery.py
+@author     Matthew Yu (matthewjkyu@gmail.com)
+@brief      Model interface for a battery pack load.
+@version    0.4.0
+@date       2026-10-19
+"""
+
+import numpy as np
+
+from load.load import Load
+
+
+class Battery(Load):
+    """Pack of cells in series, each cell being a group of identical cells in
+    parallel. Each series cell has its own state of charge, capacity and
+    internal resistance, held as arrays so that the whole pack steps in a
+    single vectorized update. Its open circuit voltage is a curve over the
+    state of charge set by the chemistry.
+
+    Current into the pack charges it. Stepping the pack with an array of
+    currents, one per scenario of a batch, holds a state of charge per
+    scenario and per cell, of shape (N, num_series).
+
+    Subclasses set the chemistry through the class constants below, given
+    per cell.
+    """
+
+    # State of charge and open circuit voltage sample points. Volts.
+    OCV_SOC = np.linspace(0.0, 1.0, 11)
+    OCV_VOLTS = np.zeros(11)
+    # Capacity. Amp hours.
+    CAPACITY = 1.0
+    # Internal resistance. Ohms.
+    RESISTANCE = 0.0
+    # Fraction of the charge into the cell that is stored while charging.
+    # Discharging draws the full charge out of the cell.
+    EFFICIENCY = 1.0
+
+    COLUMNS = [
+        "Time (s)",
+        "Voltage (V)",
+        "Current (A)",
+        "SOC",
+        "Min SOC",
+        "Max SOC",
+        "Energy (J)",
+    ]
+
+    def __init__(
+        self,
+        num_series: int = 1,
+        num_parallel: int = 1,
+        soc=0.5,
+        capacity=None,
+        resistance=None,
+        stride: int = None,
+        sink=None,
+        chunk_size: int = 4096,
+    ) -> None:
+        """Create a battery pack.
+
+        Args:
+            num_series (int, optional): Number of cells in series.
+            num_parallel (int, optional): Number of cells in parallel in each
+                series cell.
+            soc (float | np.ndarray, optional): Initial state of charge, for
+                the pack or for each series cell.
+            capacity (float | np.ndarray, optional): Capacity of a single
+                cell, or of each series cell. Amp hours. Defaults to the
+                chemistry's.
+            resistance (float | np.ndarray, optional): Internal resistance of
+                a single cell, or of each series cell. Ohms. Defaults to the
+                chemistry's.
+            stride (int, optional): Record the pack every stride-th step.
+                Defaults to None, not recording.
+            sink (func(dict[str, np.ndarray]), optional): Called with each
+                chunk of chunk_size records, keyed as get_trace. Defaults to
+                None, holding only the most recent records.
+            chunk_size (int, optional): Number of records per chunk. Bounds
+                the records held by the pack.
+        """
+        capacity = self.CAPACITY if capacity is None else capacity
+        resistance = self.RESISTANCE if resistance is None else resistance
+        shape = (num_series,)
+
+        self._soc_init = np.broadcast_to(np.asarray(soc, dtype=float), shape).copy()
+        # State of charge per amp hour through the pack, for each series cell.
+        self._charge_rate = 1.0 / (
+            3600.0 * num_parallel * np.broadcast_to(capacity, shape).astype(float)
+        )
+        self._resistance = float(np.sum(np.broadcast_to(resistance, shape))) / (
+            num_parallel
+        )
+        self._stride = stride
+        self._sink = sink
+        self._chunk_size = chunk_size
+        self.setup()
+
+    def setup(self) -> None:
+        self._soc = self._soc_init.copy()
+        self._ocv = self._get_ocv()
+        self._time = 0.0
+        self._energy = 0.0
+        self._current = 0.0
+        self._count = 0
+        self._trace = [[] for _ in self.COLUMNS]
+
+    def _get_ocv(self):
+        """Get the open circuit voltage of the pack from the cell states."""
+        ocv = np.interp(self._soc, self.OCV_SOC, self.OCV_VOLTS).sum(axis=-1)
+        return float(ocv) if np.ndim(ocv) == 0 else ocv
+
+    def get_ocv(self):
+        return self._ocv
+
+    def get_resistance(self):
+        return self._resistance
+
+    def get_soc(self):
+        """Get the state of charge of the pack, as the mean over its series
+        cells.
+
+        Returns:
+            float | np.ndarray: State of charge, or that of each scenario.
+        """
+        soc = self._soc.mean(axis=-1)
+        return float(soc) if np.ndim(soc) == 0 else soc
+
+    def get_cell_soc(self) -> np.ndarray:
+        """Get the state of charge of each series cell.
+
+        Returns:
+            np.ndarray: State of charge of shape (num_series,), or
+                (N, num_series) for a batch.
+        """
+        return self._soc
+
+    def get_energy(self):
+        """Get the energy into the pack at its terminals since setup.
+
+        Returns:
+            float | np.ndarray: Energy, or that of each scenario. Joules.
+        """
+        return self._energy
+
+    def step(self, current, dt: float) -> None:
+        voltage = self.get_voltage(current)
+        self._energy = self._energy + voltage * current * dt
+        self._current = current
+        self._time += dt
+
+        # Each series cell carries the pack current, and loses part of the
+        # charge only while charging.
+        charge = np.asarray(current, dtype=float)[..., np.newaxis] * dt
+        charge = np.where(charge > 0.0, charge * self.EFFICIENCY, charge)
+        self._soc = np.clip(self._soc + charge * self._charge_rate, 0.0, 1.0)
+        self._ocv = self._get_ocv()
+
+        if self._stride is not None:
+            if self._count % self._stride == 0:
+                self._record(voltage)
+            self._count += 1
+
+    def _record(self, voltage) -> None:
+        values = [
+            self._time,
+            voltage,
+            self._current,
+            self.get_soc(),
+            self._soc.min(axis=-1),
+            self._soc.max(axis=-1),
+            self._energy,
+        ]
+        for col, value in zip(self._trace, values):
+            col.append(np.copy(value))
+
+        # Records are passed on to the sink a chunk at a time. Without one,
+        # the oldest chunk is dropped, keeping at least the last chunk_size.
+        if len(self._trace[0]) >= self._chunk_size:
+            if self._sink is not None:
+                self.flush()
+            elif len(self._trace[0]) >= 2 * self._chunk_size:
+                for col in self._trace:
+                    del col[: self._chunk_size]
+
+    def flush(self) -> None:
+        """Pass the records held by the pack to the sink, such as at the end
+        of a run."""
+        if self._sink is not None and self._trace[0]:
+            chunk = self.get_trace()
+            self._trace = [[] for _ in self.COLUMNS]
+            self._sink(chunk)
+
+    def get_trace(self) -> dict:
+        """Get the recorded pack state held by the pack: the records not yet
+        passed to the sink, or without a sink, the most recent records.
+
+        Returns:
+            dict[str, np.ndarray]: Trace keyed by COLUMNS, after each recorded
+                step. Time is of shape (S,), and the rest of shape (S,), or
+                (S, N) for a batch.
+        """
+        return {col: np.array(values) for col, values in zip(self.COLUMNS, self._trace)}
@@ -0,0 +1,24 @@
+"""
+@file       lead_acid.py
+@author     Matthew Yu (matthewjkyu@gmail.com)
+@brief      Model for a lead acid battery pack.
+@version    0.4.0
+@date       2026-10-19
+"""
+
+import numpy as np
+
+from load.battery.battery import Battery
+
+
+class LeadAcid(Battery):
+    """Flooded lead acid pack, made of 2 V cells. The open circuit voltage is
+    close to linear in the state of charge."""
+
+    OCV_SOC = np.linspace(0.0, 1.0, 11)
+    OCV_VOLTS = np.array(
+        [1.90, 1.95, 1.98, 2.00, 2.02, 2.04, 2.06, 2.08, 2.10, 2.12, 2.14]
+    )
+    CAPACITY = 100.0
+    RESISTANCE = 0.002
+    EFFICIENCY = 0.85
@@ -0,0 +1,24 @@
+"""
+@file       li_ion.py
+@author     Matthew Yu (matthewjkyu@gmail.com)
+@brief      Model for a lithium ion battery pack.
+@version    0.4.0
+@date       2026-10-19
+"""
+
+import numpy as np
+
+from load.battery.battery import Battery
+
+
+class LiIon(Battery):
+    """Lithium cobalt oxide pack, made of cells with a 3.7 V nominal voltage
+    and a steep knee below 10% state of charge."""
+
+    OCV_SOC = np.linspace(0.0, 1.0, 11)
+    OCV_VOLTS = np.array(
+        [3.00, 3.55, 3.65, 3.70, 3.74, 3.78, 3.84, 3.90, 3.98, 4.06, 4.20]
+    )
+    CAPACITY = 2.6
+    RESISTANCE = 0.05
+    EFFICIENCY = 0.99
@@ -0,0 +1,24 @@
+"""
+@file       li_ni_mn_co.py
+@author     Matthew Yu (matthewjkyu@gmail.com)
+@brief      Model for a lithium nickel manganese cobalt oxide battery pack.
+@version    0.4.0
+@date       2026-10-19
+"""
+
+import numpy as np
+
+from load.battery.battery import Battery
+
+
+class LiNiMnCo(Battery):
+    """Lithium nickel manganese cobalt oxide (NMC) pack, made of 18650 cells
+    with a 3.6 V nominal voltage."""
+
+    OCV_SOC = np.linspace(0.0, 1.0, 11)
+    OCV_VOLTS = np.array(
+        [3.00, 3.45, 3.55, 3.62, 3.68, 3.74, 3.82, 3.90, 3.98, 4.07, 4.18]
+    )
+    CAPACITY = 3.0
+    RESISTANCE = 0.03
+    EFFICIENCY = 0.99
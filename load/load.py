@@ -0,0 +1,77 @@
+"""
+@file       load.py
+@author     Matthew Yu (matthewjkyu@gmail.com)
+@brief      Interface for any load on the converter output.
+@version    0.4.0
+@date       2026-10-19
+"""
+
+
+class Load:
+    """Load on the output of a converter, seen by the converter as a Thevenin
+    equivalent: an open circuit voltage behind a series resistance, so that
+    the output voltage is
+
+        V = V_OC + R * I
+
+    for a current I flowing into the load. Values are floats for a single
+    scenario, or arrays for a batch of scenarios.
+    """
+
+    def setup(self) -> None:
+        """Reset the load to its initial state."""
+        pass
+
+    def get_ocv(self):
+        """Get the open circuit voltage of the load.
+
+        Returns:
+            float | np.ndarray: Open circuit voltage. Volts.
+        """
+        raise NotImplementedError
+
+    def get_resistance(self):
+        """Get the series resistance of the load.
+
+        Returns:
+            float | np.ndarray: Series resistance. Ohms.
+        """
+        raise NotImplementedError
+
+    def get_voltage(self, current):
+        """Get the voltage across the load for a current into it.
+
+        Args:
+            current (float | np.ndarray): Current into the load. Amps.
+
+        Returns:
+            float | np.ndarray: Voltage across the load. Volts.
+        """
+        return self.get_ocv() + self.get_resistance() * current
+
+    def step(self, current, dt: float) -> None:
+        """Advance the internal state of the load by a time step.
+
+        Args:
+            current (float | np.ndarray): Current into the load. Amps.
+            dt (float): Time step. Seconds.
+        """
+        pass
+
+
+class ResistiveLoad(Load):
+    """Purely resistive load."""
+
+    def __init__(self, resistance: float = 10.0) -> None:
+        """Create a resistive load.
+
+        Args:
+            resistance (float | np.ndarray, optional): Resistance. Ohms.
+        """
+        self._resistance = resistance
+
+    def get_ocv(self):
+        return 0.0
+
+    def get_resistance(self):
+        return self._resistance
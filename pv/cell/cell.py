@@ -5,12 +5,14 @@
 @version    0.4.0
 @date       2023-09-24
 """
+from pv.cell.cell_type import REGISTRY
 from pv.pv import PV
 
 
 class Cell(PV):
     def __init__(self, params: dict, data_fp=None) -> None:
-        super().__init__(params, data_fp)
+        # Cells with identical parameters share one immutable parameter set.
+        super().__init__(REGISTRY.get(params), data_fp)
 
     def get_pos(self) -> list[list[int, int]]:
         return [[0, 0]]
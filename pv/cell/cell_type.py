@@ -0,0 +1,146 @@
+"""
+@file       cell_type.py
+@author     Matthew Yu (matthewjkyu@gmail.com)
+@brief      Registry of shared, immutable cell parameter sets.
+@version    0.4.0
+@date       2026-10-19
+"""
+
+import collections.abc
+import weakref
+
+
+class CellParams(collections.abc.Mapping):
+    """Immutable set of cell reference and fitting parameters. Cells with
+    identical parameters share a single instance, along with any constants or
+    curves cached against it."""
+
+    CACHE_SIZE = 128
+
+    def __init__(self, params: dict) -> None:
+        """Create a parameter set. Use CellRegistry.get rather than calling
+        this directly so that instances are shared.
+
+        Args:
+            params (dict): Internal PV characteristics.
+        """
+        self._params = dict(params)
+        self.key = CellRegistry.get_key(params)
+        self.cache = {}
+
+    def __getitem__(self, key):
+        return self._params[key]
+
+    def __iter__(self):
+        return iter(self._params)
+
+    def __len__(self) -> int:
+        return len(self._params)
+
+    def __hash__(self) -> int:
+        return hash(self.key)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, CellParams):
+            return self.key == other.key
+        return super().__eq__(other)
+
+    def __repr__(self) -> str:
+        return f"CellParams({self._params})"
+
+    def replace(self, **params):
+        """Get the shared parameter set with some parameters substituted.
+
+        Returns:
+            CellParams: Shared parameter set.
+        """
+        return REGISTRY.get({**self._params, **params})
+
+    def get_cached(self, key, func):
+        """Get a value cached against this parameter set, computing it with
+        func on a miss. The cache is bounded; it is dropped when full.
+
+        Args:
+            key (hashable): Key of the cached value.
+            func (func(void)): Function computing the value.
+
+        Returns:
+            any: Cached value.
+        """
+        if key not in self.cache:
+            if len(self.cache) >= self.CACHE_SIZE:
+                self.cache.clear()
+            self.cache[key] = func()
+        return self.cache[key]
+
+
+class CellRegistry:
+    """Interns cell parameter sets. Parameter sets are held weakly, so a set is
+    released once no cell references it."""
+
+    def __init__(self) -> None:
+        self._types = weakref.WeakValueDictionary()
+
+    @staticmethod
+    def get_key(params: dict) -> tuple:
+        """Get a hashable key identifying a parameter set.
+
+        Args:
+            params (dict): Internal PV characteristics.
+
+        Returns:
+            tuple: Sorted (name, value) pairs.
+        """
+        return tuple(sorted(params.items()))
+
+    def get(self, params: dict) -> CellParams:
+        """Get the shared parameter set matching params.
+
+        Args:
+            params (dict): Internal PV characteristics.
+
+        Returns:
+            CellParams: Shared parameter set.
+        """
+        if isinstance(params, CellParams):
+            return params
+
+        key = self.get_key(params)
+        cell_params = self._types.get(key)
+        if cell_params is None:
+            cell_params = CellParams(params)
+            self._types[key] = cell_params
+        return cell_params
+
+    def group(self, cells: list) -> dict:
+        """Group cells by shared parameter set.
+
+        Args:
+            cells (list[Cell]): Cells to group.
+
+        Returns:
+            dict[CellParams, list[int]]: Indices of the cells using each
+                parameter set, in order.
+        """
+        groups = {}
+        for idx, cell in enumerate(cells):
+            groups.setdefault(cell.get_params(), []).append(idx)
+        return groups
+
+    def is_homogeneous(self, cells: list) -> bool:
+        """Check whether all cells share the same parameter set, in which case
+        they can be evaluated together by vectorized or compiled paths.
+
+        Args:
+            cells (list[Cell]): Cells to check.
+
+        Returns:
+            bool: True if all cells share a parameter set.
+        """
+        return len(self.group(cells)) <= 1
+
+    def __len__(self) -> int:
+        return len(self._types)
+
+
+REGISTRY = CellRegistry()
@@ -0,0 +1,240 @@
+"""
+@file       surrogate.py
+@author     Matthew Yu (matthewjkyu@gmail.com)
+@brief      Lookup table surrogate for PV cell models.
+@version    0.4.0
+@date       2026-10-19
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+
+def get_params_key(params: dict) -> tuple:
+    """Get a hashable key that uniquely identifies a set of cell reference and
+    fitting parameters.
+
+    Args:
+        params (dict): Internal PV characteristics.
+
+    Returns:
+        tuple: Sorted (name, value) pairs of reference and fitting parameters.
+    """
+    return tuple(
+        sorted(
+            (key, float(value))
+            for key, value in params.items()
+            if key.startswith("ref_") or key.startswith("fit_")
+        )
+    )
+
+
+def _build_row(cell_type, params, irrad, temps, volts) -> np.ndarray:
+    """Evaluate a cell across a row of the table at a fixed irradiance. Lives
+    at module level so that it can be dispatched to worker processes."""
+    cell = cell_type(params=dict(params))
+    return np.array(
+        [[cell.get_current(volt, [irrad], [temp]) for volt in volts] for temp in temps]
+    )
+
+
+class CellSurrogate:
+    """Precomputed table of I-V curves over a grid of irradiance and
+    temperature for a single cell parameter set. Queries are interpolated
+    bilinearly across irradiance and temperature and linearly across voltage.
+    """
+
+    def __init__(
+        self,
+        key: tuple,
+        irrads: np.ndarray,
+        temps: np.ndarray,
+        volts: np.ndarray,
+        table: np.ndarray,
+        error: float,
+    ) -> None:
+        """Create a surrogate from an already generated table. See build and
+        load.
+
+        Args:
+            key (tuple): Parameter key of the cell the table was built from.
+            irrads (np.ndarray): Ascending irradiance grid. W/m^2.
+            temps (np.ndarray): Ascending temperature grid. Kelvin.
+            volts (np.ndarray): Evenly spaced voltage grid. Volts.
+            table (np.ndarray): Currents of shape (irrads, temps, volts). Amps.
+            error (float): Maximum absolute interpolation error measured at
+                the midpoints of the grid along every axis. An estimate of the
+                error anywhere in the table rather than a strict bound, since
+                the error is sampled. Amps.
+        """
+        self.key = key
+        self.irrads = irrads
+        self.temps = temps
+        self.volts = volts
+        self.table = table
+        self.error = error
+
+    @classmethod
+    def build(
+        cls,
+        cell,
+        irrad_range: list[float] = [100.0, 1000.0],
+        temp_range: list[float] = [273.15, 398.15],
+        volt_range: list[float] = [-0.5, 0.8],
+        num_irrad: int = 19,
+        num_temp: int = 26,
+        num_volt: int = 250,
+        workers: int = None,
+    ):
+        """Generate a surrogate table for a cell. Rows of the table are
+        evaluated in parallel across worker processes.
+
+        Args:
+            cell (Cell): Cell to tabulate.
+            irrad_range (list[float]): Irradiance bounds of the table. W/m^2.
+            temp_range (list[float]): Temperature bounds of the table. Kelvin.
+            volt_range (list[float]): Voltage bounds of the table. Volts.
+            num_irrad (int): Number of irradiance grid points.
+            num_temp (int): Number of temperature grid points.
+            num_volt (int): Number of voltage grid points.
+            workers (int, optional): Number of worker processes. 1 evaluates
+                in process. Defaults to the number of CPUs.
+
+        Returns:
+            CellSurrogate: Generated surrogate.
+        """
+        cell_type = type(cell)
+        params = dict(cell.get_params())
+        irrads = np.linspace(*irrad_range, num_irrad)
+        temps = np.linspace(*temp_range, num_temp)
+        volts = np.linspace(*volt_range, num_volt)
+
+        # Evaluate the grid as well as the midpoints between grid points along
+        # every axis; the midpoints are where interpolation error peaks. The
+        # midpoints are evaluated at both the voltage grid points and the
+        # midpoints between them.
+        mid_irrads = (irrads[:-1] + irrads[1:]) / 2
+        mid_temps = (temps[:-1] + temps[1:]) / 2
+        mid_volts = np.linspace(*volt_range, 2 * num_volt - 1)
+        jobs = [(cell_type, params, irrad, temps, volts) for irrad in irrads]
+        jobs += [
+            (cell_type, params, irrad, mid_temps, mid_volts) for irrad in mid_irrads
+        ]
+
+        if workers == 1:
+            rows = list(map(_build_row, *zip(*jobs)))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                rows = list(executor.map(_build_row, *zip(*jobs)))
+
+        table = np.array(rows[:num_irrad])
+        surrogate = cls(get_params_key(params), irrads, temps, volts, table, 0.0)
+
+        exact = np.array(rows[num_irrad:])
+        g, t = np.meshgrid(mid_irrads, mid_temps, indexing="ij")
+        approx = surrogate.get_currents(
+            np.broadcast_to(mid_volts, exact.shape),
+            g[..., np.newaxis],
+            t[..., np.newaxis],
+        )
+        surrogate.error = float(np.max(np.abs(approx - exact)))
+
+        return surrogate
+
+    def save(self, filepath: str) -> None:
+        """Save the surrogate table to disk.
+
+        Args:
+            filepath (str): Path of .npz file to save/overwrite.
+        """
+        np.savez(
+            filepath,
+            key_names=np.array([name for name, _ in self.key]),
+            key_values=np.array([value for _, value in self.key]),
+            irrads=self.irrads,
+            temps=self.temps,
+            volts=self.volts,
+            table=self.table,
+            error=self.error,
+        )
+
+    @classmethod
+    def load(cls, filepath: str):
+        """Load a surrogate table from disk.
+
+        Args:
+            filepath (str): Path of .npz file to load.
+
+        Returns:
+            CellSurrogate: Loaded surrogate.
+        """
+        with np.load(filepath) as data:
+            key = tuple(
+                (str(name), float(value))
+                for name, value in zip(data["key_names"], data["key_values"])
+            )
+            return cls(
+                key,
+                data["irrads"],
+                data["temps"],
+                data["volts"],
+                data["table"],
+                float(data["error"]),
+            )
+
+    def get_currents(self, voltages, irrads, temps) -> np.ndarray:
+        """Interpolate the current through the cell for a batch of operating
+        points. Arguments are broadcast against each other. Operating points
+        outside the table, in any of voltage, irradiance or temperature, raise
+        rather than being clamped to its edge.
+
+        Args:
+            voltages (np.ndarray): Voltages across cell. Volts.
+            irrads (np.ndarray): Irradiance incident on cell. W/m^2.
+            temps (np.ndarray): Surface temperature of cell. Kelvin.
+
+        Returns:
+            np.ndarray: Currents through cell. Amps.
+        """
+        voltages, irrads, temps = np.broadcast_arrays(
+            np.asarray(voltages, dtype=float),
+            np.asarray(irrads, dtype=float),
+            np.asarray(temps, dtype=float),
+        )
+        if (
+            np.any(irrads < self.irrads[0])
+            or np.any(irrads > self.irrads[-1])
+            or np.any(temps < self.temps[0])
+            or np.any(temps > self.temps[-1])
+            or np.any(voltages < self.volts[0])
+            or np.any(voltages > self.volts[-1])
+        ):
+            raise Exception("Operating condition outside of surrogate table.")
+
+        def locate(grid, values):
+            idx = np.searchsorted(grid, values, side="right") - 1
+            idx = np.clip(idx, 0, len(grid) - 2)
+            frac = (values - grid[idx]) / (grid[idx + 1] - grid[idx])
+            return idx, frac
+
+        i, di = locate(self.irrads, irrads)
+        j, dj = locate(self.temps, temps)
+
+        # Voltage grid is even, so its index is computed directly.
+        step = self.volts[1] - self.volts[0]
+        pos = np.clip((voltages - self.volts[0]) / step, 0, len(self.volts) - 1)
+        k = np.minimum(pos.astype(int), len(self.volts) - 2)
+        dk = pos - k
+
+        def corner(a, b):
+            lo = self.table[a, b, k]
+            hi = self.table[a, b, k + 1]
+            return lo + (hi - lo) * dk
+
+        return (
+            corner(i, j) * (1 - di) * (1 - dj)
+            + corner(i + 1, j) * di * (1 - dj)
+            + corner(i, j + 1) * (1 - di) * dj
+            + corner(i + 1, j + 1) * di * dj
+        )
@@ -11,112 +11,211 @@ import numpy as np
 from scipy import constants
 
 from pv.cell.cell import Cell
+from pv.cell.surrogate import CellSurrogate, get_params_key
 from common.utils import normalize
 
 
 class ThreeParamCell(Cell):
     def __init__(self, params: dict, data_fp=None) -> None:
         super().__init__(params=params, data_fp=data_fp)
+        self._surrogate = None
+        self._state = (None, None, None, None)
 
-    def get_voltage(
-        self, current: float, irrad: list[float], temp: list[float]
-    ) -> float:
-        irrad = irrad[0]
-        temp = temp[0]
+    def set_surrogate(self, surrogate: CellSurrogate = None) -> None:
+        """Evaluate the cell current from a precomputed lookup table instead
+        of the model. Pass None to return to the model.
 
-        if irrad == 0.0:
-            raise Exception("Incident irradiance is too low!")
-        if temp == 0.0:
-            raise Exception("Cell temperature is too low!")
+        Args:
+            surrogate (CellSurrogate, optional): Table built for this cell's
+                parameters. Defaults to None.
+        """
+        if surrogate is not None and surrogate.key != get_params_key(self._params):
+            raise Exception("Surrogate does not match cell parameters.")
+        self._surrogate = surrogate
 
-        # Reference parameters
-        ref_g = self._params["ref_irrad"]
-        ref_v_oc = self._params["ref_voc"]
-        ref_i_sc = self._params["ref_isc"]
+    def _get_constants(self) -> dict:
+        """Get the constants derived from the cell parameters alone. These are
+        shared by all cells with the same parameters.
 
-        # Curve Fitting parameters
-        fit_n1 = self._params["fit_fwd_ideality_factor"]
-        fit_n2 = self._params["fit_rev_ideality_factor"]
-        fit_i_d = self._params["fit_rev_sat_curr"]
+        Returns:
+            dict: Reference and fitting parameters.
+        """
 
-        if fit_n1 == 0.0 or fit_n2 == 0.0:
-            raise Exception("Cell ideality factor is too low!")
+        def build():
+            # Curve Fitting parameters
+            fit_n1 = self._params["fit_fwd_ideality_factor"]
+            fit_n2 = self._params["fit_rev_ideality_factor"]
+
+            if fit_n1 == 0.0 or fit_n2 == 0.0:
+                raise Exception("Cell ideality factor is too low!")
+
+            return {
+                # Reference parameters
+                "ref_g": self._params["ref_irrad"],
+                "ref_v_oc": self._params["ref_voc"],
+                "ref_i_sc": self._params["ref_isc"],
+                "fit_n1": fit_n1,
+                "fit_n2": fit_n2,
+                "fit_i_d": self._params["fit_rev_sat_curr"],
+            }
+
+        return self._params.get_cached("constants", build)
+
+    def _get_state(self, irrad: float, temp: float) -> dict:
+        """Get the operating state of the cell: the constants derived from the
+        cell parameters and the external conditions. The last state is held
+        by the cell, and states are cached against the cell parameters, so
+        repeated evaluations at the same condition skip all setup. Changing
+        the parameters (as fitting does) rebinds them and drops the state.
+
+        Args:
+            irrad (float): Irradiance incident on cell. W/m^2.
+            temp (float): Surface temperature of cell. Kelvin.
+
+        Returns:
+            dict: Operating state.
+        """
+        state = self._state
+        if state[0] is self._params and state[1] == irrad and state[2] == temp:
+            return state[3]
+
+        def build():
+            if irrad == 0.0:
+                raise Exception("Incident irradiance is too low!")
+            if temp == 0.0:
+                raise Exception("Cell temperature is too low!")
+
+            c = self._get_constants()
+            g = irrad
+            t_c = temp
+
+            k_b = constants.k
+            q = constants.e
+
+            v_t = k_b * t_c / q
+            i_sc = c["ref_i_sc"] * g / c["ref_g"]
+            n1_v_t = c["fit_n1"] * v_t
+
+            # Add 0.00001 for satisfying the domain condition when g/ref_g = 0.
+            log_g = m.log((g / c["ref_g"]) + 0.00001)
+
+            # TODO: get_voltage and get_current disagree on whether the ideality
+            # factor scales the open circuit voltage; both are kept as is.
+            v_oc_fwd = c["ref_v_oc"] + n1_v_t * log_g
+            v_oc_rev = c["ref_v_oc"] + v_t * log_g
+
+            return {
+                "v_t": v_t,
+                "i_sc": i_sc,
+                "n1_v_t": n1_v_t,
+                "n2_v_t": c["fit_n2"] * v_t,
+                "fit_i_d": c["fit_i_d"],
+                "exp_v_oc_fwd": m.exp(v_oc_fwd / n1_v_t) - 1,
+                "exp_v_oc_rev": m.exp(v_oc_rev / n1_v_t) - 1,
+            }
+
+        state = self._params.get_cached(("state", irrad, temp), build)
+        self._state = (self._params, irrad, temp, state)
+        return state
 
+    def get_voltage(
+        self, current: float, irrad: list[float], temp: list[float]
+    ) -> float:
+        s = self._get_state(irrad[0], temp[0])
         i_l = current
-        g = irrad
-        t_c = temp
-
-        k_b = constants.k
-        q = constants.e
-
-        v_t = k_b * t_c / q
-        i_sc = ref_i_sc * g / ref_g
-
-        # Add 0.00001 for satisfying the domain condition when g/ref_g = 0.
-        v_oc = ref_v_oc + fit_n1 * v_t * m.log((g / ref_g) + 0.00001)
+        i_sc = s["i_sc"]
 
         if i_l <= i_sc - 1 * 10**-10:
-            v_l = (fit_n1 * v_t) * m.log(
-                (1 - i_l / i_sc) * (m.exp(v_oc / (fit_n1 * v_t)) - 1)
-            )
+            v_l = s["n1_v_t"] * m.log((1 - i_l / i_sc) * s["exp_v_oc_fwd"])
         else:
-            v_l = -m.log((i_l - i_sc) / fit_i_d + 1) * fit_n2 * v_t
+            v_l = -m.log((i_l - i_sc) / s["fit_i_d"] + 1) * s["n2_v_t"]
 
         return v_l
 
     def get_current(
         self, voltage: float, irrad: list[float], temp: list[float]
     ) -> float:
-        irrad = irrad[0]
-        temp = temp[0]
-
-        if irrad == 0.0:
-            raise Exception("Incident irradiance is too low!")
-        if temp == 0.0:
-            raise Exception("Cell temperature is too low!")
-
-        # Reference parameters
-        ref_g = self._params["ref_irrad"]
-        ref_v_oc = self._params["ref_voc"]
-        ref_i_sc = self._params["ref_isc"]
-
-        # Curve Fitting parameters
-        fit_n1 = self._params["fit_fwd_ideality_factor"]
-        fit_n2 = self._params["fit_rev_ideality_factor"]
-        fit_i_d = self._params["fit_rev_sat_curr"]
-
-        if fit_n1 == 0.0 or fit_n2 == 0.0:
-            raise Exception("Cell ideality factor is too low!")
+        if self._surrogate is not None:
+            return float(self._surrogate.get_currents(voltage, irrad[0], temp[0]))
 
+        s = self._get_state(irrad[0], temp[0])
         v_l = voltage
-        g = irrad
-        t_c = temp
-
-        k_b = constants.k
-        q = constants.e
-
-        v_t = k_b * t_c / q
-        i_sc = ref_i_sc * g / ref_g
-
-        # Add 0.00001 for satisfying the domain condition when g/ref_g = 0.
-        v_oc = ref_v_oc + v_t * m.log((g / ref_g) + 0.00001)
 
         if v_l > 0.0:
-            if v_l / v_t > 100:
+            if v_l / s["v_t"] > 100:
                 # Domain assumption that our load voltage cannot be well past open
                 # circuit voltage: the ratio of load voltage versus thermal voltage
                 # can overfill the exponential term.
                 return 0.0
 
-            i_l = i_sc * (
-                1
-                - (m.exp(v_l / (fit_n1 * v_t)) - 1) / (m.exp(v_oc / (fit_n1 * v_t)) - 1)
+            i_l = s["i_sc"] * (
+                1 - (m.exp(v_l / s["n1_v_t"]) - 1) / s["exp_v_oc_rev"]
             )
         else:
-            i_l = fit_i_d * (m.exp(-v_l / (fit_n2 * v_t)) - 1) + i_sc
+            i_l = s["fit_i_d"] * (m.exp(-v_l / s["n2_v_t"]) - 1) + s["i_sc"]
 
         return i_l
 
+    def get_voltages(
+        self, currents: np.ndarray, irrad: list[float], temp: list[float]
+    ) -> np.ndarray:
+        s = self._get_state(irrad[0], temp[0])
+        i_l = np.asarray(currents, dtype=float)
+        i_sc = s["i_sc"]
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            v_fwd = s["n1_v_t"] * np.log((1 - i_l / i_sc) * s["exp_v_oc_fwd"])
+            v_rev = -np.log((i_l - i_sc) / s["fit_i_d"] + 1) * s["n2_v_t"]
+
+        return np.where(i_l <= i_sc - 1 * 10**-10, v_fwd, v_rev)
+
+    def get_currents(
+        self, voltages: np.ndarray, irrad: list[float], temp: list[float]
+    ) -> np.ndarray:
+        if self._surrogate is not None:
+            return self._surrogate.get_currents(voltages, irrad[0], temp[0])
+
+        s = self._get_state(irrad[0], temp[0])
+        v_l = np.asarray(voltages, dtype=float)
+
+        with np.errstate(over="ignore", invalid="ignore"):
+            i_fwd = s["i_sc"] * (
+                1 - (np.exp(v_l / s["n1_v_t"]) - 1) / s["exp_v_oc_rev"]
+            )
+            i_rev = s["fit_i_d"] * (np.exp(-v_l / s["n2_v_t"]) - 1) + s["i_sc"]
+
+        # See get_current for the domain assumption past open circuit voltage.
+        i_fwd = np.where(v_l / s["v_t"] > 100, 0.0, i_fwd)
+        return np.where(v_l > 0.0, i_fwd, i_rev)
+
+    def _invert_voltages(
+        self, voltages: np.ndarray, irrad: list[float], temp: list[float]
+    ) -> np.ndarray:
+        """Exact inverse of get_voltages. Both branches of get_voltage are
+        logarithmic in current, so each inverts in closed form. Note that this
+        differs from get_currents, which uses a different open circuit voltage.
+
+        Args:
+            voltages (np.ndarray): Voltages across cell. Volts.
+            irrad (list[float]): Irradiance incident on cell. W/m^2.
+            temp (list[float]): Surface temperature of cell. Kelvin.
+
+        Returns:
+            np.ndarray: Currents through cell. Amps.
+        """
+        s = self._get_state(irrad[0], temp[0])
+        v_l = np.asarray(voltages, dtype=float)
+        i_sc = s["i_sc"]
+
+        # Voltage where get_voltage switches from the forward to reverse branch.
+        v_b = s["n1_v_t"] * m.log(10**-10 / i_sc * s["exp_v_oc_fwd"])
+
+        with np.errstate(over="ignore"):
+            i_fwd = i_sc * (1 - np.exp(v_l / s["n1_v_t"]) / s["exp_v_oc_fwd"])
+            i_rev = i_sc + s["fit_i_d"] * (np.exp(-v_l / s["n2_v_t"]) - 1)
+
+        return np.where(v_l >= v_b, i_fwd, i_rev)
+
     def get_iv(
         self,
         irrad: list[float],
@@ -128,11 +227,19 @@ class ThreeParamCell(Cell):
             curr = self.get_current(volt, irrad, temp)
             return volt, curr, volt * curr
 
-        iv = [calc(volt) for volt in np.linspace(*volt_range, self.IV_POINTS)]
+        def build():
+            iv = [calc(volt) for volt in np.linspace(*volt_range, self.IV_POINTS)]
+
+            # Normalize data.
+            return normalize(np.array(iv), self.IV_NORM_POINTS)
 
-        # Normalize data.
-        iv = normalize(np.array(iv), self.IV_NORM_POINTS)
-        return iv
+        if self._surrogate is not None:
+            return build()
+
+        # Curves are shared between all cells with the same parameters.
+        return self._params.get_cached(
+            ("iv", irrad[0], temp[0], tuple(volt_range)), build
+        )
 
     def fit_params(self, irradiance: float = None, temperature: float = None) -> dict:
         """
@@ -178,6 +285,9 @@ class ThreeParamCell(Cell):
             },
         }
 
+        # Fitting changes the parameters the table was built from.
+        self._surrogate = None
+
         if "fit_fwd_ideality_factor" in self._params:
             fitting_parameters["fit_fwd_ideality_factor"]["given"] = True
             fitting_parameters["fit_fwd_ideality_factor"]["val"] = self._params[
@@ -197,9 +307,13 @@ class ThreeParamCell(Cell):
         data = normalize(np.array(self._data), self.IV_POINTS)
         params = self._fit_params(data, fitting_parameters, self.residual)
 
-        for key in fitting_parameters.keys():
-            if "fit" in key:
-                self._params[key] = fitting_parameters[key]["val"]
+        self._params = self._params.replace(
+            **{
+                key: value["val"]
+                for key, value in fitting_parameters.items()
+                if "fit" in key
+            }
+        )
 
         return params
 
@@ -207,14 +321,12 @@ class ThreeParamCell(Cell):
         values = params.valuesdict()
         irrad = values["irradiance"] * self.FIT_RESOLUTION
         temp = values["temperature"] * self.FIT_RESOLUTION
-        self._params["fit_fwd_ideality_factor"] = (
-            values["fit_fwd_ideality_factor"] * self.FIT_RESOLUTION
-        )
-        self._params["fit_rev_ideality_factor"] = (
-            values["fit_rev_ideality_factor"] * self.FIT_RESOLUTION
-        )
-        self._params["fit_rev_sat_curr"] = (
-            values["fit_rev_sat_curr"] * self.FIT_RESOLUTION
+        self._params = self._params.replace(
+            fit_fwd_ideality_factor=values["fit_fwd_ideality_factor"]
+            * self.FIT_RESOLUTION,
+            fit_rev_ideality_factor=values["fit_rev_ideality_factor"]
+            * self.FIT_RESOLUTION,
+            fit_rev_sat_curr=values["fit_rev_sat_curr"] * self.FIT_RESOLUTION,
         )
 
         error = [i - self.get_current(v, [irrad], [temp]) for v, i, _ in points]
@@ -74,6 +74,34 @@ class BypassDiode(PV):
 
         return i_d
 
+    def _get_v_t(self, temp: list[float]) -> float:
+        if temp[0] == 0.0:
+            raise Exception("Cell temperature is too low!")
+
+        return self._params["fit_ideality_factor"] * constants.k * temp[0] / constants.e
+
+    def get_voltages(
+        self, currents: np.ndarray, irrad: list[float], temp: list[float]
+    ) -> np.ndarray:
+        n_v_t = self._get_v_t(temp)
+        i_d = np.asarray(currents, dtype=float)
+
+        with np.errstate(invalid="ignore"):
+            v_d = np.log(i_d / self._params["fit_rev_sat_curr"] + 1) * n_v_t
+
+        return np.where(i_d >= 0, v_d, 0.0)
+
+    def get_currents(
+        self, voltages: np.ndarray, irrad: list[float], temp: list[float]
+    ) -> np.ndarray:
+        n_v_t = self._get_v_t(temp)
+        v_d = np.asarray(voltages, dtype=float)
+
+        with np.errstate(over="ignore"):
+            i_d = self._params["fit_rev_sat_curr"] * (np.exp(v_d / n_v_t) - 1)
+
+        return np.where(v_d >= 0, i_d, 0.0)
+
     def get_iv(
         self,
         irrad: list[float],
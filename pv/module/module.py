@@ -6,11 +6,9 @@
 @date       2023-09-28
 """
 
-import math as m
-
 import numpy as np
 
-from common.utils import normalize
+from common.utils import normalize, solve_decreasing
 from pv.pv import PV
 
 
@@ -20,18 +18,49 @@ class Module(PV):
         self._cell_cache_iv = [None, [], [], []]
         self._diode_cache_iv = [None, [], [], []]
 
+    def _get_cell_groups(self, irrad: list[float], temp: list[float]) -> list:
+        """Group cells that share parameters and conditions. Cells in a group
+        have identical curves, so each group is evaluated once.
+
+        Returns:
+            list[[Cell, [float], [float], int]]: Cell, irradiance, temperature
+                and number of cells of each group.
+        """
+        groups = {}
+        for cell, _irrad, _temp in zip(self._params["cells"].values(), irrad, temp):
+            instance = cell["instance"]
+            key = (type(instance), instance.get_params(), _irrad, _temp)
+            groups.setdefault(key, [instance, [_irrad], [_temp], 0])[3] += 1
+
+        return list(groups.values())
+
     def _get_cell_voltage(
-        self, current: float, irrad: list[float], temp: list[float]
-    ) -> float:
+        self, current: np.ndarray, irrad: list[float], temp: list[float]
+    ) -> np.ndarray:
         """It is O(n), n being the number of solar cells in the module, to
         derive the total module (cells in series) voltage with the current
-        through each cell."""
+        through each cell. Vectorized over currents."""
         voltage = 0
-        for cell, _irrad, _temp in zip(self._params["cells"].values(), irrad, temp):
-            voltage += cell["instance"].get_voltage(current, [_irrad], [_temp])
+        for cell, _irrad, _temp, num in self._get_cell_groups(irrad, temp):
+            voltage = voltage + num * cell.get_voltages(current, _irrad, _temp)
 
         return voltage
 
+    def _get_cell_current(
+        self, voltage: np.ndarray, irrad: list[float], temp: list[float]
+    ) -> np.ndarray:
+        """Invert _get_cell_voltage. If every cell sees the same conditions
+        the cells split the voltage evenly and the cell model inverts in
+        closed form; otherwise the string voltage is solved for exactly."""
+        groups = self._get_cell_groups(irrad, temp)
+        if len(groups) == 1 and hasattr(groups[0][0], "_invert_voltages"):
+            cell, _irrad, _temp, num = groups[0]
+            return cell._invert_voltages(np.asarray(voltage) / num, _irrad, _temp)
+
+        return solve_decreasing(
+            lambda curr: self._get_cell_voltage(curr, irrad, temp), voltage
+        )
+
     def _get_cell_iv(
         self,
         irrad: list[float],
@@ -39,12 +68,8 @@ class Module(PV):
         curr_range: list[float] = [-10.0, 10.0],
         volt_range: list[float] = [-10.0, 10.0],
     ) -> list[list[float, float, float]]:
-        def calc(curr):
-            volt = self._get_cell_voltage(curr, irrad, temp)
-            return volt, curr, volt * curr
-
-        iv = [calc(curr) for curr in np.linspace(*curr_range, self.IV_POINTS)]
-
+        # Reuse the cell curve if the module sees the same conditions as the
+        # last query; only modules whose inputs changed are re-evaluated.
         if (
             self._cell_cache_iv[1] == irrad
             and self._cell_cache_iv[2] == temp
@@ -52,61 +77,68 @@ class Module(PV):
         ):
             return self._cell_cache_iv[0]
 
+        curr = np.linspace(*curr_range, self.IV_POINTS)
+        volt = self._get_cell_voltage(curr, irrad, temp)
+        iv = np.transpose([volt, curr, volt * curr])
+
         # Normalize data.
-        iv = normalize(np.array(iv), self.IV_NORM_POINTS)
+        iv = normalize(iv, self.IV_NORM_POINTS)
 
         self._cell_cache_iv = [iv, irrad, temp, curr_range]
 
         return iv
 
+    def get_voltages(
+        self, currents: np.ndarray, irrad: list[float], temp: list[float]
+    ) -> np.ndarray:
+        currents = np.asarray(currents, dtype=float)
+        diode = self._params["diode"]["instance"]
+        d_irrad, d_temp = [np.average(irrad)], [np.average(temp)]
+
+        # With the cells forward biased the bypass diode is off and the cells
+        # carry the entire current.
+        volts = self._get_cell_voltage(currents, irrad, temp)
+
+        # Otherwise the current is shared between the cells and diode such
+        # that both see the same voltage. The shared current is monotonic in
+        # the cell current, so it is solved exactly instead of stepped toward.
+        rev = volts < 0.0
+        if np.any(rev):
+            c_curr = solve_decreasing(
+                lambda curr: -(
+                    curr
+                    + diode.get_currents(
+                        -self._get_cell_voltage(curr, irrad, temp), d_irrad, d_temp
+                    )
+                ),
+                -currents[rev],
+                lo=0.0,
+                hi=np.max(currents[rev]),
+            )
+            volts[rev] = self._get_cell_voltage(c_curr, irrad, temp)
+
+        return volts
+
+    def get_currents(
+        self, voltages: np.ndarray, irrad: list[float], temp: list[float]
+    ) -> np.ndarray:
+        voltages = np.asarray(voltages, dtype=float)
+        diode = self._params["diode"]["instance"]
+
+        # Cell contribution plus diode contribution.
+        return self._get_cell_current(voltages, irrad, temp) + diode.get_currents(
+            -voltages, [np.average(irrad)], [np.average(temp)]
+        )
+
     def get_voltage(self, current: float, irrad: list[float], temp: list[float]):
-        # Cheat and grab from IV curve. Current from voltage can be derived in
-        # O(N), while voltage directly is O(N^N).
-        c_iv = self._get_cell_iv(irrad, temp)
-        c_volt, c_curr, c_pow = np.transpose(c_iv)
-        c_vi = np.transpose([c_curr, c_volt, c_pow])
-        c_vi = normalize(c_vi, 500)
-        c_curr_t, c_volt_t, c_pow_t = np.transpose(c_vi)
-
-        # Derive initial estimate assuming no contribution from diode.
-        m_volt_est = np.interp(current, c_curr_t, c_volt_t)
-
-        is_fwd = False
-        while True:
-            # Given module voltage estimate, derive current components.
-            m_curr_est = np.interp(m_volt_est, c_volt, c_curr) + self._params["diode"][
-                "instance"
-            ].get_current(-m_volt_est, [np.average(irrad)], [np.average(temp)])
-            if m.isclose(m_curr_est, current, abs_tol=0.001):
-                break
-            if m_curr_est > current:
-                is_fwd = True
-
-                # Current too high; increase module voltage.
-                m_volt_est += 0.001
-            else:
-                if is_fwd:
-                    # Toggled, exit early.
-                    break
-                # Current too low; decrease module voltage.
-                m_volt_est -= 0.001
-
-        return m_volt_est
+        # Solved exactly without building a curve first.
+        return float(self.get_voltages(np.array([current]), irrad, temp)[0])
 
     def get_current(
         self, voltage: float, irrad: list[float], temp: list[float]
     ) -> float:
-        # Cheat and grab from IV curve. Current from voltage can be derived in
-        # O(N), while voltage directly is O(N^N).
-        c_iv = self._get_cell_iv(irrad, temp)
-        c_volt, c_curr, _ = np.transpose(c_iv)
-
-        # Diode contribution.
-        m_curr = np.interp(voltage, c_volt, c_curr) + self._params["diode"][
-            "instance"
-        ].get_current(-voltage, [np.average(irrad)], [np.average(temp)])
-
-        return m_curr
+        # Solved exactly without building a curve first.
+        return float(self.get_currents(np.array([voltage]), irrad, temp)[0])
 
     def get_iv(
         self,
@@ -116,24 +148,23 @@ class Module(PV):
         volt_range: list[float] = [-10.0, 10.0],
     ) -> list[list[float, float, float]]:
         # For module level, it's easier to sweep voltage than current.
-        iv = []
-        c_iv = self._get_cell_iv(irrad, temp, curr_range, volt_range)
-
-        for c_volt, c_curr, _ in c_iv:
-            d_curr = self._params["diode"]["instance"].get_current(
-                -c_volt, [np.average(irrad)], [np.average(temp)]
-            )
-            m_curr = c_curr + d_curr
-            m_pow = c_volt * m_curr
-            if (
-                curr_range[0] <= m_curr
-                and m_curr <= curr_range[1]
-                and volt_range[0] <= c_volt
-                and c_volt <= volt_range[1]
-            ):
-                iv.append([c_volt, m_curr, m_pow])
-
-        return iv
+        c_volt, c_curr, _ = np.transpose(
+            self._get_cell_iv(irrad, temp, curr_range, volt_range)
+        )
+        d_curr = self._params["diode"]["instance"].get_currents(
+            -c_volt, [np.average(irrad)], [np.average(temp)]
+        )
+        m_curr = c_curr + d_curr
+        m_pow = c_volt * m_curr
+
+        mask = (
+            (curr_range[0] <= m_curr)
+            & (m_curr <= curr_range[1])
+            & (volt_range[0] <= c_volt)
+            & (c_volt <= volt_range[1])
+        )
+
+        return np.transpose([c_volt, m_curr, m_pow])[mask].tolist()
 
     def get_pos(self) -> list([int, int]):
         pos = []
@@ -0,0 +1,252 @@
+"""
+@file       operating_curve.py
+@author     Matthew Yu (matthewjkyu@gmail.com)
+@brief      Precomputed operating curve of a PV source for fast point queries.
+@version    0.4.0
+@date       2026-10-19
+"""
+
+import bisect
+
+import numpy as np
+
+from common.utils import solve_decreasing
+
+
+class OperatingCurve:
+    """I-V curve of a PV source in fixed conditions, sampled once on an even
+    voltage grid between short circuit and open circuit. Point queries then
+    index into the grid directly and interpolate linearly, in constant time,
+    without rebuilding the curve.
+
+    Voltages outside [0, V_OC] are clamped to the edges of the curve.
+    """
+
+    def __init__(self, volts: np.ndarray, currs: np.ndarray) -> None:
+        """Create a curve from samples. See build.
+
+        Args:
+            volts (np.ndarray): Evenly spaced, ascending voltages. Volts.
+            currs (np.ndarray): Current at each voltage. Amps.
+        """
+        self.volts = np.asarray(volts, dtype=float)
+        self.currs = np.asarray(currs, dtype=float)
+        self.pows = self.volts * self.currs
+
+        # Scalar queries run in the inner loop of a simulation, where python
+        # floats and lists are far cheaper than numpy scalars.
+        self._v_0 = float(self.volts[0])
+        self._inv_step = (
+            (len(self.volts) - 1) / float(self.volts[-1] - self.volts[0])
+            if len(self.volts) > 1 and self.volts[-1] > self.volts[0]
+            else 0.0
+        )
+        self._last = len(self.volts) - 1
+        self._currs = self.currs.tolist()
+        self._neg_currs = (-self.currs).tolist()
+
+        mpp = int(np.argmax(self.pows))
+        self.v_oc = float(self.volts[-1])
+        self.i_sc = float(self.currs[0])
+        self.v_mpp = float(self.volts[mpp])
+        self.i_mpp = float(self.currs[mpp])
+        self.p_mpp = float(self.pows[mpp])
+
+    @classmethod
+    def build(cls, get_voltages, num_points: int = 256):
+        """Sample the curve of a source.
+
+        Args:
+            get_voltages (func(np.ndarray) -> np.ndarray): Vectorized voltage
+                of the source as a function of the current through it. Must be
+                decreasing.
+            num_points (int, optional): Number of voltage grid points.
+
+        Returns:
+            OperatingCurve: Sampled curve.
+        """
+        v_oc = float(get_voltages(np.zeros(1))[0])
+        if not v_oc > 0.0:
+            return cls(np.zeros(1), np.zeros(1))
+
+        i_sc = solve_decreasing(get_voltages, np.zeros(1), lo=0.0, hi=1.0)[0]
+        volts = np.linspace(0.0, v_oc, num_points)
+        currs = solve_decreasing(get_voltages, volts, lo=0.0, hi=i_sc)
+        currs[0], currs[-1] = i_sc, 0.0
+        return cls(volts, currs)
+
+    def get_current(self, voltage: float) -> float:
+        """Get the current through the source at a voltage.
+
+        Args:
+            voltage (float): Voltage across source. Volts.
+
+        Returns:
+            float: Current through source. Amps.
+        """
+        x = (voltage - self._v_0) * self._inv_step
+        if x <= 0.0:
+            return self._currs[0]
+        if x >= self._last:
+            return self._currs[self._last]
+        k = int(x)
+        lo = self._currs[k]
+        return lo + (self._currs[k + 1] - lo) * (x - k)
+
+    def get_currents(self, voltages: np.ndarray) -> np.ndarray:
+        """Vectorized get_current.
+
+        Args:
+            voltages (np.ndarray): Voltages across source. Volts.
+
+        Returns:
+            np.ndarray: Currents through source. Amps.
+        """
+        return np.interp(voltages, self.volts, self.currs)
+
+    def get_voltage(self, current: float) -> float:
+        """Get the voltage across the source at a current.
+
+        Args:
+            current (float): Current through source. Amps.
+
+        Returns:
+            float: Voltage across source. Volts.
+        """
+        # Currents descend along the grid; bisect on their negation.
+        k = bisect.bisect_left(self._neg_currs, -current)
+        if k <= 0:
+            return self._v_0
+        if k > self._last:
+            return float(self.volts[self._last])
+        lo, hi = self._currs[k - 1], self._currs[k]
+        frac = (lo - current) / (lo - hi) if lo > hi else 0.0
+        return float(self.volts[k - 1] + (self.volts[k] - self.volts[k - 1]) * frac)
+
+    def get_voltages(self, currents: np.ndarray) -> np.ndarray:
+        """Vectorized get_voltage.
+
+        Args:
+            currents (np.ndarray): Currents through source. Amps.
+
+        Returns:
+            np.ndarray: Voltages across source. Volts.
+        """
+        return np.interp(-np.asarray(currents, dtype=float), -self.currs, self.volts)
+
+    def get_iv(self) -> np.ndarray:
+        """Get the sampled curve.
+
+        Returns:
+            np.ndarray: Rows of voltage, current, power. Volts, Amps, Watts.
+        """
+        return np.column_stack([self.volts, self.currs, self.pows])
+
+
+class OperatingCurveBatch:
+    """Operating curves of N independent scenarios, stacked so that a point
+    query on every scenario is a single vectorized gather."""
+
+    def __init__(self, volts: np.ndarray, currs: np.ndarray) -> None:
+        """Create a batch from stacked samples. See from_curves.
+
+        Args:
+            volts (np.ndarray): Evenly spaced, ascending voltages of each
+                scenario, of shape (N, P). Volts.
+            currs (np.ndarray): Current at each voltage, of shape (N, P). Amps.
+        """
+        self.volts = np.asarray(volts, dtype=float)
+        self.currs = np.asarray(currs, dtype=float)
+        pows = self.volts * self.currs
+
+        self._rows = np.arange(len(self.volts))
+        self._last = self.volts.shape[1] - 1
+        span = self.volts[:, -1] - self.volts[:, 0]
+        self._inv_step = np.divide(
+            self._last, span, out=np.zeros(span.shape), where=span > 0
+        )
+
+        mpp = np.argmax(pows, axis=1)
+        self.v_oc = self.volts[:, -1]
+        self.i_sc = self.currs[:, 0]
+        self.v_mpp = self.volts[self._rows, mpp]
+        self.i_mpp = self.currs[self._rows, mpp]
+        self.p_mpp = pows[self._rows, mpp]
+
+    @classmethod
+    def build(cls, get_voltages, num_curves: int, num_points: int = 256):
+        """Sample the curves of a batch of sources together, solving every
+        curve in one vectorized bisection. See OperatingCurve.build. Dark
+        curves are zero, as in from_curves.
+
+        Args:
+            get_voltages (func(np.ndarray) -> np.ndarray): Vectorized voltage
+                of each source as a function of the current through it, for
+                currents of shape (N, Q). Must be decreasing along each row.
+            num_curves (int): Number of sources N.
+            num_points (int, optional): Number of voltage grid points.
+
+        Returns:
+            OperatingCurveBatch: Sampled curves.
+        """
+        v_oc = get_voltages(np.zeros((num_curves, 1)))[:, 0]
+        lit = v_oc > 0.0
+
+        # Dark sources are solved at their own open circuit voltage, which
+        # keeps them inside the initial bracket at zero current.
+        i_sc = solve_decreasing(
+            lambda currents: get_voltages(currents[:, np.newaxis])[:, 0],
+            np.where(lit, 0.0, v_oc),
+            lo=0.0,
+            hi=1.0,
+        )
+        volts = np.linspace(0.0, np.maximum(v_oc, 0.0), num_points, axis=1)
+        currs = solve_decreasing(
+            get_voltages,
+            np.where(lit[:, np.newaxis], volts, v_oc[:, np.newaxis]),
+            lo=0.0,
+            hi=i_sc[:, np.newaxis],
+        )
+        currs[:, 0], currs[:, -1] = i_sc, 0.0
+        currs[~lit] = 0.0
+        return cls(volts, currs)
+
+    @classmethod
+    def from_curves(cls, curves: list[OperatingCurve]):
+        """Stack operating curves sampled on the same number of points. Dark
+        curves, with a single point, are padded.
+
+        Args:
+            curves (list[OperatingCurve]): Curve of each scenario.
+
+        Returns:
+            OperatingCurveBatch: Stacked curves.
+        """
+        num_points = max(len(curve.volts) for curve in curves)
+        volts = np.zeros((len(curves), num_points))
+        currs = np.zeros((len(curves), num_points))
+        for idx, curve in enumerate(curves):
+            if len(curve.volts) == num_points:
+                volts[idx], currs[idx] = curve.volts, curve.currs
+            elif len(curve.volts) != 1:
+                raise Exception("Curves must have the same number of points.")
+        return cls(volts, currs)
+
+    def __len__(self) -> int:
+        return len(self.volts)
+
+    def get_currents(self, voltages: np.ndarray) -> np.ndarray:
+        """Get the current of each scenario at a voltage.
+
+        Args:
+            voltages (np.ndarray): Voltage across each scenario, of shape
+                (N,). Volts.
+
+        Returns:
+            np.ndarray: Current through each scenario. Amps.
+        """
+        x = np.clip((voltages - self.volts[:, 0]) * self._inv_step, 0, self._last)
+        k = np.minimum(x.astype(int), max(self._last - 1, 0))
+        lo = self.currs[self._rows, k]
+        hi = self.currs[self._rows, np.minimum(k + 1, self._last)]
+        return lo + (hi - lo) * (x - k)
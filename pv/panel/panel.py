@@ -9,7 +9,7 @@
 import numpy as np
 
 from pv.pv import PV
-from common.utils import normalize
+from common.utils import normalize, solve_decreasing
 
 
 class Panel(PV):
@@ -33,17 +33,44 @@ class Panel(PV):
 
         return v
 
+    def get_voltages(
+        self, currents: np.ndarray, irrad: list[float], temp: list[float]
+    ) -> np.ndarray:
+        currents = np.asarray(currents, dtype=float)
+        v = np.zeros(currents.shape)
+        for module in self._params["modules"].values():
+            num_cells = len(module["instance"].get_pos())
+            v += module["instance"].get_voltages(
+                currents, irrad[:num_cells], temp[:num_cells]
+            )
+            irrad = irrad[num_cells:]
+            temp = temp[num_cells:]
+
+        # lead contribution
+        v -= currents * self._params["fit_lead_resistance"]
+
+        return v
+
+    def get_currents(
+        self, voltages: np.ndarray, irrad: list[float], temp: list[float]
+    ) -> np.ndarray:
+        # Modules are in series, so the panel voltage is solved for the shared
+        # current. Lead contribution is included by get_voltages. Like its
+        # cells, the panel is assumed not to be driven past open circuit, and
+        # sources no current there.
+        voltages = np.asarray(voltages, dtype=float)
+        v_oc = self.get_voltages(np.zeros(1), irrad, temp)[0]
+        currents = solve_decreasing(
+            lambda curr: self.get_voltages(curr, irrad, temp),
+            np.minimum(voltages, v_oc),
+            lo=0.0,
+        )
+        return np.where(voltages < v_oc, currents, 0.0)
+
     def get_current(
         self, voltage: float, irrad: list[float], temp: list[float]
     ) -> float:
-        # Cheat and grab from IV curve. Current from voltage can be derived in
-        # O(N), while voltage directly is O(N^N).
-        iv = self.get_iv(irrad, temp)
-        volt, curr, _ = np.transpose(iv)
-        curr = np.interp(voltage, volt, curr)
-
-        # Lead contribution derived from get_voltage downstream call.
-        return curr
+        return float(self.get_currents(np.array([voltage]), irrad, temp)[0])
 
     def get_iv(
         self,
@@ -52,14 +79,12 @@ class Panel(PV):
         curr_range: list[float] = [-10.0, 10.0],
         volt_range: list[float] = [-10.0, 10.0],
     ) -> list[list[float, float, float]]:
-        def calc(curr):
-            volt = self.get_voltage(curr, irrad, temp)
-            return volt, curr, volt * curr
-
-        iv = [calc(curr) for curr in np.linspace(*curr_range, self.IV_POINTS)]
+        curr = np.linspace(*curr_range, self.IV_POINTS)
+        volt = self.get_voltages(curr, irrad, temp)
+        iv = np.transpose([volt, curr, volt * curr])
 
         # Normalize data.
-        iv = normalize(np.array(iv), self.IV_NORM_POINTS)
+        iv = normalize(iv, self.IV_NORM_POINTS)
         return iv
 
     def get_pos(self) -> list([int, int]):
@@ -91,6 +91,42 @@ class PV:
         """
         raise NotImplementedError
 
+    def get_voltages(
+        self, currents: np.ndarray, irrad: list[float], temp: list[float]
+    ) -> np.ndarray:
+        """Vectorized get_voltage over a batch of operating points. Subclasses
+        override this with a closed form where one exists.
+
+        Args:
+            currents (np.ndarray): Currents through PV. Amps.
+            irrad (list[float]): Irradiance incident on PV. W/m^2.
+            temp (list[float]): Surface temperature of PV. Kelvin.
+
+        Returns:
+            np.ndarray: Voltages across PV. Volts.
+        """
+        currents = np.asarray(currents, dtype=float)
+        volts = [self.get_voltage(curr, irrad, temp) for curr in currents.flat]
+        return np.array(volts, dtype=float).reshape(currents.shape)
+
+    def get_currents(
+        self, voltages: np.ndarray, irrad: list[float], temp: list[float]
+    ) -> np.ndarray:
+        """Vectorized get_current over a batch of operating points. Subclasses
+        override this with a closed form where one exists.
+
+        Args:
+            voltages (np.ndarray): Voltages across PV. Volts.
+            irrad (list[float]): Irradiance incident on PV. W/m^2.
+            temp (list[float]): Surface temperature of PV. Kelvin.
+
+        Returns:
+            np.ndarray: Currents through PV. Amps.
+        """
+        voltages = np.asarray(voltages, dtype=float)
+        currs = [self.get_current(volt, irrad, temp) for volt in voltages.flat]
+        return np.array(currs, dtype=float).reshape(voltages.shape)
+
     def get_iv(
         self,
         irrad: list[float],
@@ -14,8 +14,9 @@ import pandas as pd
 from PySide6 import QtWidgets
 
 from common.graph import Graph
-from common.utils import normalize
+from common.utils import normalize, solve_decreasing
 from environment.environment import Environment
+from pv.operating_curve import OperatingCurve, OperatingCurveBatch
 from pv.pv import PV
 
 
@@ -23,6 +24,17 @@ class PVSystem:
     """Models the entire system in the solar deployment. Can be moved around in
     the environment."""
 
+    # Number of voltage grid points each item is sampled at, both forward and
+    # reverse biased, to compose the curve of the system.
+    ITEM_POINTS = 1024
+
+    # Current up to which each item is sampled reverse biased. Amps.
+    MAX_CURRENT = 100.0
+
+    # Number of item table points stacked at once to build a batch of system
+    # curves, bounding the memory of trajectories with many conditions.
+    BATCH_POINTS = 1 << 22
+
     def __init__(self, env: Environment, filepath: str = None) -> None:
         """Initialize a new PVSystem instance.
 
@@ -39,6 +51,21 @@ class PVSystem:
         self._env = env
         self._pos = [0, 0]
 
+        # Dirty tracking. Each entry remembers the environment gathered for an
+        # item (or the entire system) on the last query, along with the curves
+        # derived from it. Curves are only rebuilt when the inputs change, and
+        # system curves are composed from the curves of their items.
+        self._cache = {}
+        self._sys_cache = {}
+
+    def get_env(self) -> Environment:
+        """Get the environment providing irradiance and temp data.
+
+        Returns:
+            Environment: Environment of the system.
+        """
+        return self._env
+
     def load_pv(self, filepath: str) -> dict:
         """TODO: Load from a photovoltaic file that represents the PVSystem.
 
@@ -80,6 +107,7 @@ class PVSystem:
                 raise Exception("Overlap with another PV.")
 
         self._items[id] = {"instance": item, "pos": (X, Y)}
+        self._sys_cache = {}
 
     def rem_pv(self, id: int) -> PV:
         """Remove a pv instance from the model.
@@ -93,8 +121,53 @@ class PVSystem:
         if id not in self._items:
             return Exception("ID does not exist in system.")
 
+        self._cache.pop(id, None)
+        self._sys_cache = {}
         return self._items.pop(id)
 
+    def clear_cache(self) -> None:
+        """Drop all cached curves. Must be called if the parameters of a PV
+        instance are modified after it has been queried, since dirty tracking
+        only observes the environment.
+        """
+        self._cache = {}
+        self._sys_cache = {}
+
+    def _get_cache(
+        self, cache: dict, irrad: list[float], temp: list[float]
+    ) -> dict:
+        """Compare the environment gathered for this step against the one seen
+        on the previous step. If any cell changed, the cached curves are
+        dropped.
+
+        Args:
+            cache (dict): Cache entry to check and update.
+            irrad (list[float]): Irradiance gathered for this step. W/m^2.
+            temp (list[float]): Temperature gathered for this step. Kelvin.
+
+        Returns:
+            dict: Cache entry, emptied of curves if stale.
+        """
+        if cache.get("irrad") != irrad or cache.get("temp") != temp:
+            cache.clear()
+            cache["irrad"] = irrad
+            cache["temp"] = temp
+
+        return cache
+
+    def _get_pv_cache(self, id: int, time: int) -> dict:
+        """Get the cache entry of a particular PV item for a time idx.
+
+        Args:
+            id (int): PV Item ID.
+            time (int): Time idx of environment to query.
+
+        Returns:
+            dict: Cache entry of the item.
+        """
+        cache = self._cache.setdefault(id, {})
+        return self._get_cache(cache, *self._get_pv_env(id, time))
+
     def _get_pv_env(self, id: int, time: int) -> (list[float], list[float]):
         """Get the irrad and temp for a particular PV item.
 
@@ -105,19 +178,11 @@ class PVSystem:
             (list[float], list[float]): Tuple of irradiance and temperature
                 points.
         """
-        pos = [
-            [self._items[id]["pos"][0] + x, self._items[id]["pos"][1] + y]
-            for x, y in self._items[id]["instance"].get_pos()
-        ]
-
-        irrad = []
-        temp = []
-        for p in pos:
-            g, t = self._env.get_voxel(*p, time)
-            irrad.append(g)
-            temp.append(t)
+        pos = np.array(self._items[id]["instance"].get_pos()).reshape(-1, 2)
+        pos = pos + self._items[id]["pos"]
 
-        return irrad, temp
+        irrad, temp = self._env.get_voxels_at(pos[:, 0], pos[:, 1], time)
+        return irrad.tolist(), temp.tolist()
 
     def get_pv_voltage(self, id: int, current: float, time: int) -> float:
         """Get the voltage generated by the PV as a function of the current
@@ -155,13 +220,10 @@ class PVSystem:
         if id not in self._items:
             return Exception("ID does not exist in system.")
 
-        # Cheat and grab from IV curve. Current from voltage can be derived in
-        # O(N), while voltage directly is O(N^N).
-        iv = self.get_pv_iv(id, time)
-        volt, curr, _ = np.transpose(iv)
-        curr = np.interp(voltage, volt, curr)
-
-        return curr
+        cache = self._get_pv_cache(id, time)
+        return self._items[id]["instance"].get_current(
+            voltage, cache["irrad"], cache["temp"]
+        )
 
     def get_pv_iv(self, id: int, time: int) -> [(float, float)]:
         """Get the output I-V curve of a specific item in the model.
@@ -177,7 +239,13 @@ class PVSystem:
         if id not in self._items:
             return Exception("ID does not exist in system.")
 
-        return self._items[id]["instance"].get_iv(*self._get_pv_env(id, time))
+        cache = self._get_pv_cache(id, time)
+        if "iv" not in cache:
+            cache["iv"] = self._items[id]["instance"].get_iv(
+                cache["irrad"], cache["temp"]
+            )
+
+        return cache["iv"]
 
     def get_pv_edge(
         self, id: int, time: int
@@ -198,7 +266,49 @@ class PVSystem:
         if id not in self._items:
             return Exception("ID does not exist in system.")
 
-        return self._items[id]["instance"].get_edge(*self._get_pv_env(id, time))
+        cache = self._get_pv_cache(id, time)
+        if "edge" not in cache:
+            cache["edge"] = self._items[id]["instance"].get_edge(
+                cache["irrad"], cache["temp"]
+            )
+
+        return cache["edge"]
+
+    def get_pv_ids(self) -> list[int]:
+        """Get the IDs of the PVs in the system.
+
+        Returns:
+            list[int]: PV IDs, in the order they were added.
+        """
+        return list(self._items)
+
+    def get_pv_curve(
+        self, id: int, time: int, num_points: int = 256
+    ) -> OperatingCurve:
+        """Get the operating curve of a PV on its own, cached until the
+        environment seen by the PV changes.
+
+        Args:
+            id (int): ID of PV to query.
+            time (int): Time idx of environment to query.
+            num_points (int, optional): Number of voltage grid points.
+
+        Returns:
+            OperatingCurve: Operating curve of the PV.
+        """
+        if id not in self._items:
+            raise Exception("ID does not exist in system.")
+
+        cache = self._get_pv_cache(id, time)
+        if cache.get("curve") is None or len(cache["curve"].volts) != num_points:
+            irrad, temp = cache["irrad"], cache["temp"]
+            instance = self._items[id]["instance"]
+            cache["curve"] = OperatingCurve.build(
+                lambda currents: instance.get_voltages(currents, irrad, temp),
+                num_points,
+            )
+
+        return cache["curve"]
 
     def vis_pv(self, id: int, time: int) -> None:
         """Visualize a PV instance at a point in time.
@@ -221,6 +331,79 @@ class PVSystem:
             Y (int): New origin Y position.
         """
         self._pos = [X, Y]
+        self._sys_cache = {}
+
+    def _get_sys_env(self, time: int) -> (list[float], list[float]):
+        """Get the irrad and temp for every cell in the system, ordered by item.
+
+        Args:
+            time (int): Time idx of environment to query.
+
+        Returns:
+            (list[float], list[float]): Tuple of irradiance and temperature
+                points.
+        """
+        pos = self._get_cell_pos() + self._pos
+        irrad, temp = self._env.get_voxels_at(pos[:, 0], pos[:, 1], time)
+        return irrad.tolist(), temp.tolist()
+
+    def _get_sys_cache(self, time: int) -> dict:
+        """Get the system cache entry for a time idx. The run boundaries of the
+        environment give the span of times over which no cell of the system
+        changes, and within it the environment is not gathered again.
+
+        Args:
+            time (int): Time idx of environment to query.
+
+        Returns:
+            dict: Cache entry of the system, holding the gathered irradiance
+                and temperature.
+        """
+        runs = self._env.get_compressed_voxels()
+        cache = self._sys_cache
+        times = cache.get("times")
+        if runs is not None and cache.get("runs") is runs and len(times) > 0:
+            idx = np.searchsorted(times, time)
+            if idx < len(times) and times[idx] == time:
+                return cache
+
+        cache = self._get_cache(cache, *self._get_sys_env(time))
+        if runs is not None:
+            pos = self._get_cell_pos() + self._pos
+            cache["runs"] = runs
+            cache["times"] = runs.get_unchanged_times(pos[:, 0], pos[:, 1], time)
+        return cache
+
+    def _get_cell_pos(self) -> np.ndarray:
+        """Get the position of every cell in the system relative to the system
+        origin, ordered by item.
+
+        Returns:
+            np.ndarray: X and Y positions, of shape (C, 2).
+        """
+        pos = [
+            [item["pos"][0] + x, item["pos"][1] + y]
+            for item in self._items.values()
+            for x, y in item["instance"].get_pos()
+        ]
+        return np.array(pos).reshape(-1, 2)
+
+    def _get_sys_voltage(
+        self, current: float, irrad: list[float], temp: list[float]
+    ) -> float:
+        """Get the voltage across the system for an already gathered
+        environment. See get_sys_voltage.
+        """
+        v = 0.0
+        for item in self._items.values():
+            num_cells = len(item["instance"].get_pos())
+            v += item["instance"].get_voltage(
+                current, irrad[:num_cells], temp[:num_cells]
+            )
+            irrad = irrad[num_cells:]
+            temp = temp[num_cells:]
+
+        return v
 
     def get_sys_voltage(self, current: float, time: int) -> float:
         """Get the voltage generated by the entire system as a function of the
@@ -234,32 +417,373 @@ class PVSystem:
         Returns:
             float: Voltage across system. Volts.
         """
-        pos = []
+        return self._get_sys_voltage(current, *self._get_sys_env(time))
+
+    def _get_sys_voltages(
+        self, currents: np.ndarray, irrad: list[float], temp: list[float]
+    ) -> np.ndarray:
+        """Vectorized _get_sys_voltage."""
+        currents = np.asarray(currents, dtype=float)
+        v = np.zeros(currents.shape)
         for item in self._items.values():
-            item_pos = [
-                [self._pos[0] + item["pos"][0] + x, self._pos[1] + item["pos"][1] + y]
-                for x, y in item["instance"].get_pos()
-            ]
-            pos.extend(item_pos)
+            num_cells = len(item["instance"].get_pos())
+            v += item["instance"].get_voltages(
+                currents, irrad[:num_cells], temp[:num_cells]
+            )
+            irrad = irrad[num_cells:]
+            temp = temp[num_cells:]
 
-        irrad = []
-        temp = []
-        for p in pos:
-            g, t = self._env.get_voxel(*p, time)
-            irrad.append(g)
-            temp.append(t)
+        return v
 
-        v = 0.0
-        for item in self._items.values():
+    def get_sys_voltages(self, currents: np.ndarray, time: int) -> np.ndarray:
+        """Vectorized get_sys_voltage over a batch of currents.
+
+        Args:
+            currents (np.ndarray): Currents through the PV. Amps.
+            time (int): Time idx of environment to query.
+
+        Returns:
+            np.ndarray: Voltages across system. Volts.
+        """
+        return self._get_sys_voltages(currents, *self._get_sys_env(time))
+
+    def get_sys_curve(self, time: int, num_points: int = 256) -> OperatingCurve:
+        """Get the operating curve of the system, for constant time point
+        queries of the current at a voltage. The curve is cached until the
+        environment seen by the system changes.
+
+        Args:
+            time (int): Time idx of environment to query.
+            num_points (int, optional): Number of voltage grid points.
+
+        Returns:
+            OperatingCurve: Operating curve of the system.
+        """
+        cache = self._get_sys_cache(time)
+        if cache.get("curve") is None or len(cache["curve"].volts) != num_points:
+            cache["curve"] = self._build_sys_curve(
+                cache["irrad"], cache["temp"], num_points
+            )
+
+        return cache["curve"]
+
+    def _build_sys_curve(
+        self, irrad: list[float], temp: list[float], num_points: int
+    ) -> OperatingCurve:
+        """Build the operating curve of the system for an already gathered
+        environment. Items in series share the current, so the system voltage
+        is the sum of the sampled item voltages; only items whose own
+        environment changed since they were last sampled are sampled again.
+        See get_sys_curve.
+        """
+        tables = [
+            self._get_item_table(item, entry)
+            for item, entry in self._get_item_caches(irrad, temp)
+        ]
+
+        def get_voltages(currents):
+            v = np.zeros(np.shape(currents))
+            for currs, volts in tables:
+                v += np.interp(currents, currs, volts)
+            return v
+
+        return OperatingCurve.build(get_voltages, num_points)
+
+    def _build_sys_curves(
+        self, irrad: np.ndarray, temp: np.ndarray, num_points: int
+    ) -> OperatingCurveBatch:
+        """Build the operating curves of the system for a batch of already
+        gathered environments, solving them together. See _build_sys_curve.
+
+        Args:
+            irrad (np.ndarray): Irradiance of every cell in the system in each
+                environment, of shape (N, cells). W/m^2.
+            temp (np.ndarray): Temperature of every cell, of shape (N, cells).
+                Kelvin.
+            num_points (int): Number of voltage grid points.
+
+        Returns:
+            OperatingCurveBatch: Operating curve in each environment.
+        """
+        # Environments often share the conditions of most items, so each item
+        # is sampled once per distinct set of its own conditions. The tables
+        # of an item are stacked, padded with their last point, and each is
+        # shifted to a current range of its own, so that the item is
+        # interpolated in every environment by a single np.interp.
+        num_curves = len(irrad)
+        stacks = []
+        start = 0
+        for id, item in self._items.items():
+            end = start + len(item["instance"].get_pos())
+            rows, inverse = np.unique(
+                np.hstack([irrad[:, start:end], temp[:, start:end]]),
+                axis=0,
+                return_inverse=True,
+            )
+            num_cells = end - start
+            start = end
+
+            # The live cache entry of the item is reused where it matches.
+            cache = self._cache.get(id, {})
+            tables = []
+            for row in rows:
+                item_irrad = row[:num_cells].tolist()
+                item_temp = row[num_cells:].tolist()
+                if cache.get("irrad") == item_irrad and cache.get("temp") == item_temp:
+                    entry = cache
+                else:
+                    entry = {"irrad": item_irrad, "temp": item_temp}
+                tables.append(self._get_item_table(item, entry))
+
+            length = max(len(currs) for currs, _ in tables)
+            currs = np.empty((len(tables), length))
+            volts = np.empty((len(tables), length))
+            for idx, (item_currs, item_volts) in enumerate(tables):
+                currs[idx, : len(item_currs)] = item_currs
+                currs[idx, len(item_currs) :] = item_currs[-1]
+                volts[idx, : len(item_volts)] = item_volts
+                volts[idx, len(item_volts) :] = item_volts[-1]
+
+            lo, hi = currs[:, :1], currs[:, -1:]
+            span = hi - lo + 1.0
+            offset = np.cumsum(span)[:, np.newaxis] - span - lo
+            inverse = inverse.reshape(-1)
+            stacks.append(
+                (
+                    lo[inverse],
+                    hi[inverse],
+                    offset[inverse],
+                    (currs + offset).reshape(-1),
+                    volts.reshape(-1),
+                )
+            )
+
+        def get_voltages(currents):
+            v = np.zeros(np.shape(currents))
+            for lo, hi, offset, shifted, volts in stacks:
+                v += np.interp(np.clip(currents, lo, hi) + offset, shifted, volts)
+            return v
+
+        return OperatingCurveBatch.build(get_voltages, num_curves, num_points)
+
+    def _get_item_caches(
+        self, irrad: list[float], temp: list[float]
+    ) -> list[(dict, dict)]:
+        """Split the environment gathered for the system by item, and get the
+        cache entry of each item. Entries are keyed on the environment of
+        their own item, so a change elsewhere in the system keeps them.
+
+        Args:
+            irrad (list[float]): Irradiance of every cell in the system. W/m^2.
+            temp (list[float]): Temperature of every cell in the system. Kelvin.
+
+        Returns:
+            list[(dict, dict)]: Item and its cache entry, ordered by item.
+        """
+        entries = []
+        for id, item in self._items.items():
             num_cells = len(item["instance"].get_pos())
-            v += item["instance"].get_voltage(
-                current, irrad[:num_cells], temp[:num_cells]
+            cache = self._cache.setdefault(id, {})
+            entries.append(
+                (item, self._get_cache(cache, irrad[:num_cells], temp[:num_cells]))
             )
             irrad = irrad[num_cells:]
             temp = temp[num_cells:]
 
+        return entries
+
+    def _get_item_table(self, item: dict, cache: dict) -> (np.ndarray, np.ndarray):
+        """Sample the voltage of an item against the current through it, both
+        forward biased and reverse biased up to MAX_CURRENT. Samples are evenly
+        spaced in voltage, so the steep knee of the curve is resolved as finely
+        as its flat regions. Cached in the entry of the item.
+
+        Args:
+            item (dict): Item of the system.
+            cache (dict): Cache entry of the item.
+
+        Returns:
+            (np.ndarray, np.ndarray): Ascending currents (Amps) and the
+                voltages across the item at them (Volts).
+        """
+        if "table" in cache:
+            return cache["table"]
+
+        irrad, temp = cache["irrad"], cache["temp"]
+        instance = item["instance"]
+
+        def get_voltages(currents):
+            return instance.get_voltages(currents, irrad, temp)
+
+        # Descending voltages from open circuit through short circuit, then
+        # reverse biased.
+        v_oc = float(get_voltages(np.zeros(1))[0])
+        v_rev = float(get_voltages(np.full(1, self.MAX_CURRENT))[0])
+        fwd_volts = np.linspace(v_oc, 0.0, self.ITEM_POINTS)[:-1] if v_oc > 0.0 else []
+        rev_volts = np.linspace(min(v_oc, 0.0), v_rev, self.ITEM_POINTS)
+        volts = np.concatenate([fwd_volts, rev_volts])
+
+        # Cells invert in closed form; anything else is solved for.
+        if hasattr(instance, "_invert_voltages"):
+            currs = instance._invert_voltages(volts, irrad, temp)
+        else:
+            currs = solve_decreasing(get_voltages, volts, lo=0.0, hi=self.MAX_CURRENT)
+
+        cache["table"] = (np.maximum.accumulate(currs), volts)
+        return cache["table"]
+
+    def _get_items_voltage(self, entries: list[(dict, dict)], current: float) -> float:
+        """Get the voltage across the system from the cache entries of its
+        items. The voltage of each item is remembered against the current, so
+        only items whose own environment changed are evaluated again.
+
+        Args:
+            entries (list[(dict, dict)]): Items and their cache entries.
+            current (float): Current through the system. Amps.
+
+        Returns:
+            float: Voltage across system. Volts.
+        """
+        v = 0.0
+        for item, cache in entries:
+            volts = cache.setdefault("volts", {})
+            if current not in volts:
+                volts[current] = item["instance"].get_voltage(
+                    current, cache["irrad"], cache["temp"]
+                )
+            v += volts[current]
+
         return v
 
+    def get_sys_trajectory_curves(
+        self,
+        times: np.ndarray,
+        X: np.ndarray,
+        Y: np.ndarray,
+        num_points: int = 256,
+        resolution: list[float] = None,
+    ) -> (OperatingCurveBatch, np.ndarray):
+        """Get the operating curves of the system moving along a path, such as
+        a vehicle route. The voxels of every cell at every pose are gathered
+        in one vectorized lookup, and a curve is built once per distinct set
+        of conditions seen by the system rather than once per pose. The
+        curves of every set of conditions are solved together.
+
+        The environment is held from the last measured time at or before each
+        pose; poses before the first measured time raise. The system position
+        set by set_sys_pos is not used or changed.
+
+        Args:
+            times (np.ndarray): Environment time of each pose. Seconds.
+            X (np.ndarray): X position of the system origin at each pose.
+            Y (np.ndarray): Y position of the system origin at each pose.
+            num_points (int, optional): Number of voltage grid points.
+            resolution (list[float], optional): Irradiance (W/m^2) and
+                temperature (K) the conditions are rounded to before being
+                compared, trading accuracy for fewer curves. Defaults to None,
+                comparing exactly.
+
+        Returns:
+            (OperatingCurveBatch, np.ndarray): Distinct curves, and the index
+                of the curve of each pose.
+        """
+        times, X, Y = np.broadcast_arrays(
+            np.asarray(times, dtype=float),
+            np.asarray(X, dtype=float),
+            np.asarray(Y, dtype=float),
+        )
+        env_times = self._env.get_times()
+        if len(env_times) == 0:
+            raise Exception("Environment has no voxels.")
+
+        if np.any(times < env_times[0]):
+            raise Exception("Pose before the first time of the environment.")
+
+        idx = np.searchsorted(env_times, times, side="right") - 1
+        pos = self._get_cell_pos()
+        irrad, temp = self._env.get_voxels_at(
+            X[:, np.newaxis] + pos[:, 0],
+            Y[:, np.newaxis] + pos[:, 1],
+            env_times[idx][:, np.newaxis],
+        )
+        if resolution is not None:
+            irrad = np.round(irrad / resolution[0]) * resolution[0]
+            temp = np.round(temp / resolution[1]) * resolution[1]
+
+        conditions, inverse = np.unique(
+            np.hstack([irrad, temp]), axis=0, return_inverse=True
+        )
+        num_cells = len(pos)
+        num_items = max(len(self._items), 1)
+        chunk = max(self.BATCH_POINTS // (2 * self.ITEM_POINTS * num_items), 1)
+        batches = [
+            self._build_sys_curves(
+                rows[:, :num_cells], rows[:, num_cells:], num_points
+            )
+            for rows in np.split(conditions, range(chunk, len(conditions), chunk))
+        ]
+        curves = OperatingCurveBatch(
+            np.concatenate([batch.volts for batch in batches]),
+            np.concatenate([batch.currs for batch in batches]),
+        )
+
+        return curves, inverse.reshape(-1)
+
+    def get_sys_trajectory(
+        self,
+        times: np.ndarray,
+        X: np.ndarray,
+        Y: np.ndarray,
+        num_points: int = 256,
+        resolution: list[float] = None,
+    ) -> pd.DataFrame:
+        """Get the maximum power point of the system moving along a path. See
+        get_sys_trajectory_curves.
+
+        Args:
+            times (np.ndarray): Environment time of each pose, ascending.
+                Seconds.
+            X (np.ndarray): X position of the system origin at each pose.
+            Y (np.ndarray): Y position of the system origin at each pose.
+            num_points (int, optional): Number of voltage grid points.
+            resolution (list[float], optional): Rounding of the conditions.
+
+        Returns:
+            pd.DataFrame: Time, position, open circuit voltage, short circuit
+                current, maximum power point and the energy available at the
+                maximum power point since the first pose, holding each pose
+                until the next.
+        """
+        curves, inverse = self.get_sys_trajectory_curves(
+            times, X, Y, num_points, resolution
+        )
+        times, X, Y = np.broadcast_arrays(
+            np.asarray(times, dtype=float),
+            np.asarray(X, dtype=float),
+            np.asarray(Y, dtype=float),
+        )
+        edges = np.column_stack(
+            [curves.v_oc, curves.i_sc, curves.v_mpp, curves.i_mpp, curves.p_mpp]
+        )[inverse]
+        energy = np.concatenate(
+            [[0.0], np.cumsum(edges[:-1, 4] * np.diff(times))]
+        )
+
+        return pd.DataFrame(
+            np.column_stack([times, X, Y, edges, energy]),
+            columns=[
+                "Time (s)",
+                "X",
+                "Y",
+                "Voc (V)",
+                "Isc (A)",
+                "Vmpp (V)",
+                "Impp (A)",
+                "Pmpp (W)",
+                "Energy (J)",
+            ],
+        )
+
     def get_sys_iv(self, time: int) -> [(float, float)]:
         """Get the output I-V curve of the system.
 
@@ -270,6 +794,12 @@ class PVSystem:
             [(float, float, float)]: List of voltage-current-power pairs.
             Ordered.
         """
+        cache = self._get_sys_cache(time)
+        if "iv" in cache:
+            return cache["iv"]
+
+        entries = self._get_item_caches(cache["irrad"], cache["temp"])
+
         iv = []
 
         curr = 0.0
@@ -279,7 +809,7 @@ class PVSystem:
         while loop < num_loops:
             # Increment resolution decreases by (0.05)^n
             curr += res
-            volt = self.get_sys_voltage(curr, time)
+            volt = self._get_items_voltage(entries, curr)
             iv.append([volt, curr, volt * curr])
             if volt == 0.0:
                 # https://www.desmos.com/calculator/mffm3b9ucm
@@ -296,6 +826,7 @@ class PVSystem:
 
         # Normalize data.
         iv = normalize(np.array(iv))
+        cache["iv"] = iv
 
         return iv
 
@@ -313,6 +844,9 @@ class PVSystem:
                 Maximum power point current (Amps)
         """
         iv = self.get_sys_iv(time)
+        if "edge" in self._sys_cache:
+            return self._sys_cache["edge"]
+
         df = pd.DataFrame(iv, columns=["Voltage (V)", "Current (A)", "Power (W)"])
 
         v_oc = df.nlargest(1, "Voltage (V)").iloc[0]["Voltage (V)"]
@@ -322,7 +856,8 @@ class PVSystem:
         v_mpp = mpp.iloc[0]["Voltage (V)"]
         i_mpp = mpp.iloc[0]["Current (A)"]
 
-        return (v_oc, i_sc), (v_mpp, i_mpp)
+        self._sys_cache["edge"] = (v_oc, i_sc), (v_mpp, i_mpp)
+        return self._sys_cache["edge"]
 
     def vis_pv(self, time: int) -> None:
         """Visualize the system at a point in time.
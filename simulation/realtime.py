@@ -0,0 +1,237 @@
+"""
+@file       realtime.py
+@author     Matthew Yu (matthewjkyu@gmail.com)
+@brief      Real time serving of a PV system for hardware in the loop.
+@version    0.4.0
+@date       2026-10-19
+"""
+
+import multiprocessing as mp
+import threading
+import time as clock
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from pv.operating_curve import OperatingCurve
+from pv.pv_system import PVSystem
+
+
+def _serve(system: PVSystem, num_points: int, conn, name: str) -> None:
+    """Build operating curves in a worker process. Each environment time
+    received is built into the other of two slots of a shared memory buffer,
+    and answered with the slot and its number of points, until None is
+    received.
+    """
+    shm = shared_memory.SharedMemory(name=name)
+    slots = np.ndarray((2, 2, num_points), dtype=float, buffer=shm.buf)
+    slot = 0
+    try:
+        while (time := conn.recv()) is not None:
+            curve = system.get_sys_curve(time, num_points)
+            num = len(curve.volts)
+            slots[slot, 0, :num] = curve.volts
+            slots[slot, 1, :num] = curve.currs
+            conn.send((slot, num))
+            slot ^= 1
+    finally:
+        del slots
+        shm.close()
+
+
+class RealTimeSource:
+    """Serves the current of a PV system at a voltage, at the present moment
+    of an environment clock running against wall time, such as to drive a
+    programmable supply emulating the array.
+
+    A background thread follows the clock and has the operating curve of the
+    next measured time of the environment built ahead of it. Builds run in a
+    worker process on a copy of the system, and are passed back through a
+    double buffer in shared memory, so that they never hold the interpreter
+    lock of the querying process. Curves are published as a pair of (current,
+    next) buffers swapped by a single reference assignment, so that queries
+    never take a lock or wait on a build; a query is a clock read and a
+    constant time curve lookup. If the clock outruns the builder, queries keep
+    being served from the last curve built and are counted as late.
+
+    Changes to the system after start are not seen by the worker. Query
+    latencies are kept in a histogram of power of two bins; queries are
+    expected to come from a single thread.
+    """
+
+    NUM_BINS = 64
+
+    def __init__(
+        self,
+        system: PVSystem,
+        num_points: int = 256,
+        speed: float = 1.0,
+        poll: float = 1e-3,
+        timer=clock.perf_counter,
+    ) -> None:
+        """Create a real time source.
+
+        Args:
+            system (PVSystem): System to serve.
+            num_points (int, optional): Number of voltage grid points of the
+                operating curves.
+            speed (float, optional): Environment seconds per wall second.
+            poll (float, optional): Period the builder checks the clock at.
+                Seconds.
+            timer (func(void) -> float, optional): Wall clock. Seconds.
+        """
+        self._system = system
+        self._num_points = num_points
+        self._speed = speed
+        self._poll = poll
+        self._timer = timer
+        self._times = system.get_env().get_times()
+        if len(self._times) == 0:
+            raise Exception("Environment has no voxels.")
+
+        self._thread = None
+        self._worker = None
+        self._stop = threading.Event()
+        self._buffers = None
+        self.reset_latency()
+
+    def _build(self, idx: int) -> tuple:
+        """Build the buffer of a measured time of the environment in the
+        worker, waiting on it without holding the interpreter lock.
+
+        Returns:
+            (int, float, float, func(float) -> float): Index, start and end
+                (exclusive) environment time, and the current lookup.
+        """
+        t_lo = float(self._times[idx]) if idx > 0 else -np.inf
+        t_hi = float(self._times[idx + 1]) if idx + 1 < len(self._times) else np.inf
+        self._conn.send(self._times[idx])
+        slot, num = self._conn.recv()
+        volts, currs = np.array(self._slots[slot, :, :num])
+        curve = OperatingCurve(volts, currs)
+        return idx, t_lo, t_hi, curve.get_current
+
+    def _get_idx(self, time: float) -> int:
+        return max(int(np.searchsorted(self._times, time, side="right")) - 1, 0)
+
+    def get_time(self) -> float:
+        """Get the present environment time. Seconds."""
+        return self._t_start + (self._timer() - self._origin) * self._speed
+
+    def start(self, t_start: float = 0.0) -> None:
+        """Start the environment clock and the curve builder. The curves at
+        the start time are built before returning.
+
+        Args:
+            t_start (float, optional): Environment time now. Seconds.
+        """
+        self.stop()
+        self._shm = shared_memory.SharedMemory(
+            create=True, size=2 * 2 * self._num_points * 8
+        )
+        self._slots = np.ndarray(
+            (2, 2, self._num_points), dtype=float, buffer=self._shm.buf
+        )
+        self._conn, conn = mp.Pipe()
+        self._worker = mp.Process(
+            target=_serve,
+            args=(self._system, self._num_points, conn, self._shm.name),
+            daemon=True,
+        )
+        self._worker.start()
+        conn.close()
+
+        idx = self._get_idx(t_start)
+        front = self._build(idx)
+        back = self._build(idx + 1) if idx + 1 < len(self._times) else None
+        self._buffers = (front, back)
+
+        self._t_start = t_start
+        self._origin = self._timer()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the curve builder. Queries keep being served from the last
+        curves built."""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+        if self._worker is not None:
+            self._conn.send(None)
+            self._worker.join()
+            self._worker = None
+            self._conn.close()
+            del self._slots
+            self._shm.close()
+            self._shm.unlink()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            front, back = self._buffers
+            if back is not None and self.get_time() >= back[1]:
+                # Promote the next curve first, then build the one after it.
+                # If the clock skipped past it, jump straight to the present.
+                idx = self._get_idx(self.get_time())
+                if idx != back[0]:
+                    back = self._build(idx)
+                self._buffers = (back, None)
+                if idx + 1 < len(self._times):
+                    self._buffers = (back, self._build(idx + 1))
+                continue
+            self._stop.wait(self._poll)
+
+    def get_current(self, voltage: float) -> float:
+        """Get the current of the system at a voltage, now.
+
+        Args:
+            voltage (float): Voltage across the system. Volts.
+
+        Returns:
+            float: Current through the system. Amps.
+        """
+        start = clock.perf_counter_ns()
+        now = self.get_time()
+        front, back = self._buffers
+        if back is not None and now >= back[1]:
+            front = back
+        if now >= front[2]:
+            self._num_late += 1
+        current = front[3](voltage)
+
+        self._hist[(clock.perf_counter_ns() - start).bit_length()] += 1
+        return current
+
+    def reset_latency(self) -> None:
+        """Clear the latency histogram."""
+        self._hist = [0] * self.NUM_BINS
+        self._num_late = 0
+
+    def get_latency(self) -> dict:
+        """Get the latency statistics of the queries served.
+
+        Returns:
+            dict: Number of queries, number of late queries, upper bounds of
+                the 50th and 99th percentile and maximum latency in seconds,
+                and the histogram as upper bin edges in seconds and counts.
+        """
+        counts = np.array(self._hist)
+        edges = 2.0 ** np.arange(self.NUM_BINS) * 1e-9
+        total = int(counts.sum())
+        cumulative = np.cumsum(counts)
+
+        def get_percentile(fraction):
+            if total == 0:
+                return np.nan
+            return float(edges[np.searchsorted(cumulative, fraction * total)])
+
+        return {
+            "count": total,
+            "late": self._num_late,
+            "p50": get_percentile(0.5),
+            "p99": get_percentile(0.99),
+            "max": float(edges[np.flatnonzero(counts)[-1]]) if total else np.nan,
+            "histogram": (edges, counts),
+        }
@@ -0,0 +1,119 @@
+"""
+@file       scheduler.py
+@author     Matthew Yu (matthewjkyu@gmail.com)
+@brief      Multi-rate scheduler of simulation components.
+@version    0.4.0
+@date       2026-10-19
+"""
+
+import heapq
+
+import numpy as np
+
+
+class Scheduler:
+    """Runs tasks over simulated time, each at its own rate. Tasks are either
+    periodic, such as a controller running at kHz, or driven by events at
+    arbitrary times, such as environment updates. Tasks due at the same time
+    run in ascending priority.
+
+    Time is kept as an integer number of ticks, so that periods do not drift
+    against each other over long runs.
+    """
+
+    def __init__(self, resolution: float = 1e-9) -> None:
+        """Create a scheduler.
+
+        Args:
+            resolution (float, optional): Duration of a tick. Seconds.
+        """
+        self._resolution = resolution
+        self._tasks = []
+
+    def _to_ticks(self, time: float) -> int:
+        return int(round(time / self._resolution))
+
+    def add_periodic(
+        self, func, period: float, offset: float = 0.0, priority: int = 0
+    ) -> None:
+        """Add a task that runs periodically.
+
+        Args:
+            func (func(float)): Task, called with the current time in seconds.
+            period (float): Period of the task. Seconds.
+            offset (float, optional): Time of the first run, relative to the
+                start of the run. Seconds.
+            priority (int, optional): Order among tasks due at the same time.
+        """
+        period = self._to_ticks(period)
+        if period <= 0:
+            raise Exception("Task period must be at least one tick.")
+        self._tasks.append(
+            {
+                "func": func,
+                "period": period,
+                "offset": self._to_ticks(offset),
+                "priority": priority,
+            }
+        )
+
+    def add_events(self, func, times: list[float], priority: int = 0) -> None:
+        """Add a task that runs at a set of times.
+
+        Args:
+            func (func(float)): Task, called with the current time in seconds.
+            times (list[float]): Absolute times to run the task at. Seconds.
+            priority (int, optional): Order among tasks due at the same time.
+        """
+        ticks = np.unique(np.round(np.asarray(times, dtype=float) / self._resolution))
+        self._tasks.append(
+            {
+                "func": func,
+                "ticks": ticks.astype(np.int64).tolist(),
+                "priority": priority,
+            }
+        )
+
+    def run(self, t_start: float, t_end: float) -> int:
+        """Run all tasks over a span of time.
+
+        Args:
+            t_start (float): Start of the run. Seconds.
+            t_end (float): End of the run, exclusive. Seconds.
+
+        Returns:
+            int: Number of task runs.
+        """
+        start = self._to_ticks(t_start)
+        end = self._to_ticks(t_end)
+        resolution = self._resolution
+
+        # Heap entries are (tick, priority, task index, event index).
+        heap = []
+        for idx, task in enumerate(self._tasks):
+            if "period" in task:
+                heap.append((start + task["offset"], task["priority"], idx, 0))
+            else:
+                ticks = task["ticks"]
+                pos = int(np.searchsorted(ticks, start))
+                if pos < len(ticks):
+                    heap.append((ticks[pos], task["priority"], idx, pos))
+        heapq.heapify(heap)
+
+        num_runs = 0
+        while heap and heap[0][0] < end:
+            tick, priority, idx, pos = heap[0]
+            task = self._tasks[idx]
+            task["func"](tick * resolution)
+            num_runs += 1
+
+            if "period" in task:
+                heapq.heapreplace(heap, (tick + task["period"], priority, idx, 0))
+            elif pos + 1 < len(task["ticks"]):
+                heapq.heapreplace(
+                    heap, (task["ticks"][pos + 1], priority, idx, pos + 1)
+                )
+            else:
+                heapq.heappop(heap)
+
+        return num_runs
@@ -0,0 +1,322 @@
+"""
+@file       server.py
+@author     Matthew Yu (matthewjkyu@gmail.com)
+@brief      Local socket co-simulation server for external controllers.
+@version    0.4.0
+@date       2026-10-19
+"""
+
+import asyncio
+import collections
+import struct
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from pv.operating_curve import OperatingCurve
+from pv.pv_system import PVSystem
+
+# Frames are little endian. A request is a header followed by N voltage
+# setpoints as float64:
+#   uint8 op | uint32 request ID | uint32 N | float64 time (s)
+# and a response is a header followed by N (voltage, current, power) triples
+# as float64, or by N bytes of UTF-8 error message if op is OP_ERROR:
+#   uint8 op | uint32 request ID | uint32 N
+REQUEST = struct.Struct("<BIId")
+RESPONSE = struct.Struct("<BII")
+OP_QUERY = 1
+OP_ERROR = 255
+MAX_POINTS = 1 << 20
+
+
+def pack_request(req_id: int, time: float, voltages) -> bytes:
+    """Encode a query.
+
+    Args:
+        req_id (int): Request ID, echoed in the response.
+        time (float): Environment time. Seconds.
+        voltages (np.ndarray): Voltage setpoints. Volts.
+
+    Returns:
+        bytes: Request frame.
+    """
+    voltages = np.ascontiguousarray(voltages, dtype="<f8").ravel()
+    return REQUEST.pack(OP_QUERY, req_id, len(voltages), time) + voltages.tobytes()
+
+
+async def read_response(reader: asyncio.StreamReader) -> (int, np.ndarray):
+    """Read and decode a response.
+
+    Args:
+        reader (asyncio.StreamReader): Stream to read from.
+
+    Returns:
+        (int, np.ndarray): Request ID, and voltage, current and power of shape
+            (N, 3).
+    """
+    op, req_id, num = RESPONSE.unpack(await reader.readexactly(RESPONSE.size))
+    if op == OP_ERROR:
+        message = await reader.readexactly(num)
+        raise Exception(message.decode())
+    payload = await reader.readexactly(24 * num)
+    return req_id, np.frombuffer(payload, dtype="<f8").reshape(num, 3)
+
+
+class CoSimServer:
+    """Serves operating points of a PV system to controllers running in other
+    processes, such as firmware under test, over a local socket.
+
+    Each request carries an environment time and a batch of voltage
+    setpoints, and is answered with the voltage, current and power at each.
+    Clients may pipeline any number of requests without waiting on
+    responses; responses come back in request order on each connection. Any
+    number of clients may be connected at once.
+
+    Operating curves are kept for the most recently queried environment
+    times, so that clients at different times do not rebuild each other's
+    curves. While serving, curves are built one at a time on a worker thread,
+    so that a build does not stall the clients of cached curves.
+    """
+
+    def __init__(
+        self, system: PVSystem, num_points: int = 256, cache_size: int = 64
+    ) -> None:
+        """Create a server.
+
+        Args:
+            system (PVSystem): System to serve.
+            num_points (int, optional): Number of voltage grid points of the
+                operating curves.
+            cache_size (int, optional): Number of curves kept. At least 1.
+        """
+        if cache_size < 1:
+            raise Exception("Cache must hold at least one curve.")
+
+        self._system = system
+        self._num_points = num_points
+        self._cache_size = cache_size
+        self._curves = collections.OrderedDict()
+        self._times = system.get_env().get_times()
+        if len(self._times) == 0:
+            raise Exception("Environment has no voxels.")
+
+        self._server = None
+        self._executor = None
+        self.num_requests = 0
+        self.num_points = 0
+
+    def _get_idx(self, time: float) -> int:
+        if time < self._times[0]:
+            raise Exception("Time before the first time of the environment.")
+        return int(np.searchsorted(self._times, time, side="right")) - 1
+
+    def _add_curve(self, idx: int, curve: OperatingCurve) -> None:
+        if len(self._curves) >= self._cache_size:
+            self._curves.popitem(last=False)
+        self._curves[idx] = curve
+
+    def get_curve(self, time: float) -> OperatingCurve:
+        """Get the operating curve of the system at an environment time.
+
+        Args:
+            time (float): Environment time. Seconds.
+
+        Returns:
+            OperatingCurve: Curve at the last measured time at or before.
+        """
+        idx = self._get_idx(time)
+        curve = self._curves.get(idx)
+        if curve is None:
+            curve = self._system.get_sys_curve(self._times[idx], self._num_points)
+            self._add_curve(idx, curve)
+        else:
+            self._curves.move_to_end(idx)
+        return curve
+
+    async def fetch_curve(self, time: float) -> OperatingCurve:
+        """Get the operating curve of the system at an environment time, from
+        the event loop. See get_curve.
+
+        Curves not yet kept are built on the worker thread, and the event loop
+        carries on serving other clients meanwhile.
+        """
+        idx = self._get_idx(time)
+        if idx not in self._curves:
+            loop = asyncio.get_running_loop()
+            curve = await loop.run_in_executor(
+                self._executor,
+                self._system.get_sys_curve,
+                self._times[idx],
+                self._num_points,
+            )
+            # Another client may have fetched it meanwhile.
+            if idx not in self._curves:
+                self._add_curve(idx, curve)
+        return self.get_curve(time)
+
+    def _get_points(self, curve: OperatingCurve, voltages: np.ndarray) -> np.ndarray:
+        voltages = np.asarray(voltages, dtype=float)
+        currents = curve.get_currents(voltages)
+        return np.column_stack([voltages, currents, voltages * currents])
+
+    def query(self, time: float, voltages: np.ndarray) -> np.ndarray:
+        """Get the operating points of the system at a batch of voltages.
+
+        Args:
+            time (float): Environment time. Seconds.
+            voltages (np.ndarray): Voltages across the system. Volts.
+
+        Returns:
+            np.ndarray: Voltage, current and power, of shape (N, 3).
+        """
+        return self._get_points(self.get_curve(time), voltages)
+
+    async def start(self, path: str = None, host: str = "127.0.0.1", port: int = 0):
+        """Start serving.
+
+        Args:
+            path (str, optional): Path of a Unix domain socket to serve on.
+                Defaults to None, serving on TCP.
+            host (str, optional): TCP host.
+            port (int, optional): TCP port. Defaults to 0, any free port.
+
+        Returns:
+            str | (str, int): Socket path, or TCP host and port served on.
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1)
+        if path is not None:
+            self._server = await asyncio.start_unix_server(self._handle, path=path)
+            return path
+
+        self._server = await asyncio.start_server(self._handle, host, port)
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def stop(self) -> None:
+        """Stop serving and close every connection."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def _error(self, writer: asyncio.StreamWriter, req_id: int, message: str):
+        message = message.encode()
+        writer.write(RESPONSE.pack(OP_ERROR, req_id, len(message)) + message)
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            while True:
+                header = await reader.readexactly(REQUEST.size)
+                op, req_id, num, time = REQUEST.unpack(header)
+                if num > MAX_POINTS:
+                    self._error(writer, req_id, "Too many points in request.")
+                    break
+
+                payload = await reader.readexactly(8 * num)
+                if op != OP_QUERY:
+                    self._error(writer, req_id, f"Unknown op {op}.")
+                else:
+                    # A query the system cannot answer, such as at a time
+                    # missing a voxel, fails only its own request.
+                    voltages = np.frombuffer(payload, dtype="<f8")
+                    try:
+                        curve = await self.fetch_curve(time)
+                        points = self._get_points(curve, voltages)
+                    except Exception as error:
+                        self._error(writer, req_id, str(error))
+                    else:
+                        writer.write(
+                            RESPONSE.pack(OP_QUERY, req_id, num)
+                            + points.astype("<f8").tobytes()
+                        )
+                        self.num_requests += 1
+                        self.num_points += num
+
+                # Only wait on the client when its responses back up.
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+class CoSimClient:
+    """Client of a CoSimServer, for tests and for controllers written in
+    python."""
+
+    def __init__(self) -> None:
+        self._reader = None
+        self._writer = None
+        self._next_id = 0
+
+    async def connect(self, path: str = None, host: str = "127.0.0.1", port: int = 0):
+        """Connect to a server.
+
+        Args:
+            path (str, optional): Path of a Unix domain socket. Defaults to
+                None, connecting over TCP.
+            host (str, optional): TCP host.
+            port (int, optional): TCP port.
+        """
+        if path is not None:
+            self._reader, self._writer = await asyncio.open_unix_connection(path)
+        else:
+            self._reader, self._writer = await asyncio.open_connection(host, port)
+
+    async def close(self) -> None:
+        """Close the connection."""
+        self._writer.close()
+        await self._writer.wait_closed()
+
+    async def query(self, time: float, voltages) -> np.ndarray:
+        """Query a batch of voltages and wait on the response.
+
+        Args:
+            time (float): Environment time. Seconds.
+            voltages (np.ndarray): Voltage setpoints. Volts.
+
+        Returns:
+            np.ndarray: Voltage, current and power, of shape (N, 3).
+        """
+        return (await self.query_many([(time, voltages)]))[0]
+
+    async def query_many(self, requests: list) -> list[np.ndarray]:
+        """Pipeline a sequence of queries, sending them all before reading
+        any response.
+
+        Args:
+            requests (list[(float, np.ndarray)]): Environment time and voltage
+                setpoints of each query.
+
+        Returns:
+            list[np.ndarray]: Voltage, current and power of each query, of
+                shape (N, 3).
+        """
+        first = self._next_id
+        self._next_id = (first + len(requests)) & 0xFFFFFFFF
+
+        # Read responses while still sending, so that neither end stalls on
+        # a full socket buffer.
+        read = asyncio.create_task(self._read(first, len(requests)))
+        self._writer.write(
+            b"".join(
+                pack_request((first + idx) & 0xFFFFFFFF, time, voltages)
+                for idx, (time, voltages) in enumerate(requests)
+            )
+        )
+        await self._writer.drain()
+        return await read
+
+    async def _read(self, first: int, num: int) -> list[np.ndarray]:
+        responses = []
+        for idx in range(num):
+            req_id, points = await read_response(self._reader)
+            if req_id != (first + idx) & 0xFFFFFFFF:
+                raise Exception("Response out of order.")
+            responses.append(points)
+        return responses
@@ -0,0 +1,303 @@
+"""
+@file       simulator.py
+@author     Matthew Yu (matthewjkyu@gmail.com)
+@brief      Time stepped co-simulation of a PV system and its converter.
+@version    0.4.0
+@date       2026-10-19
+"""
+
+import numpy as np
+import pandas as pd
+
+from converter.controller.controller import Controller
+from converter.converter import Converter
+from converter.sensor.sensor import SourceSensor
+from pv.operating_curve import OperatingCurveBatch
+from pv.pv_system import PVSystem
+from simulation.scheduler import Scheduler
+
+
+class Simulator:
+    """Runs the converter loop against a PV system over environment time, at
+    a fixed controller step:
+
+        converter (actuator, process) -> source -> sensor -> controller
+
+    The environment is held constant between its measured times. The
+    operating curve of the system is built once per measured time, or not at
+    all if the environment seen by the system is unchanged, and each step is a
+    constant time point query on it.
+    """
+
+    COLUMNS = ["Time (s)", "Voltage (V)", "Current (A)", "Power (W)", "Reference (V)"]
+
+    def __init__(
+        self,
+        system: PVSystem,
+        converter: Converter = None,
+        controller: Controller = None,
+        sensor: SourceSensor = None,
+        dt: float = 1e-4,
+        num_points: int = 256,
+    ) -> None:
+        """Create a simulator.
+
+        Args:
+            system (PVSystem): Source of the converter.
+            converter (Converter, optional): Converter regulating the source.
+                Defaults to an ideal converter.
+            controller (Controller, optional): Controller of the converter.
+                Defaults to a constant reference.
+            sensor (SourceSensor, optional): Sensor reading the source.
+                Defaults to an ideal sensor.
+            dt (float, optional): Controller step. Seconds.
+            num_points (int, optional): Number of voltage grid points of the
+                operating curves.
+        """
+        self._system = system
+        self._converter = converter if converter is not None else Converter()
+        self._controller = controller if controller is not None else Controller()
+        self._sensor = sensor if sensor is not None else SourceSensor(system)
+        self._dt = dt
+        self._num_points = num_points
+
+    def _get_segments(
+        self, t_start: float, num_steps: int
+    ) -> list[(float, int, int)]:
+        """Split the steps of a run into spans of constant environment.
+
+        Returns:
+            list[(float, int, int)]: Environment time, first and last (exclusive)
+                step of each span.
+        """
+        times = self._system.get_env().get_times()
+        if len(times) == 0:
+            raise Exception("Environment has no voxels.")
+
+        steps = t_start + self._dt * np.arange(num_steps)
+        env_idx = np.maximum(np.searchsorted(times, steps, side="right") - 1, 0)
+        bounds = np.flatnonzero(np.diff(env_idx)) + 1
+        starts = np.concatenate([[0], bounds]).astype(int)
+        ends = np.concatenate([bounds, [num_steps]]).astype(int)
+        return [
+            (float(times[env_idx[lo]]), int(lo), int(hi))
+            for lo, hi in zip(starts, ends)
+        ]
+
+    def run(self, t_start: float, t_end: float, stride: int = 1) -> pd.DataFrame:
+        """Simulate the converter loop over a span of environment time.
+
+        Args:
+            t_start (float): Start of the run. Seconds.
+            t_end (float): End of the run, exclusive. Seconds.
+            stride (int, optional): Record every stride-th step, to bound the
+                size of the trace of long runs. Defaults to 1.
+
+        Returns:
+            pd.DataFrame: Trace of time, source voltage, current, power and
+                the voltage reference after each recorded step.
+        """
+        chunks = [chunk for _, _, chunk in self.stream(t_start, t_end, stride)]
+        if not chunks:
+            return pd.DataFrame(np.zeros((0, len(self.COLUMNS))), columns=self.COLUMNS)
+        return pd.DataFrame(
+            {col: np.concatenate([chunk[col] for chunk in chunks]) for col in self.COLUMNS}
+        )
+
+    def stream(
+        self, t_start: float, t_end: float, stride: int = 1, chunk_size: int = 65536
+    ):
+        """Simulate the converter loop over a span of environment time, yielding
+        the trace in chunks as it is produced, so that long runs can be
+        consumed without holding the entire trace. Each chunk spans a constant
+        environment.
+
+        Args:
+            t_start (float): Start of the run. Seconds.
+            t_end (float): End of the run, exclusive. Seconds.
+            stride (int, optional): Record every stride-th step. Defaults to 1.
+            chunk_size (int, optional): Maximum number of steps per chunk.
+
+        Yields:
+            (float, OperatingCurve, dict[str, np.ndarray]): Environment time,
+                operating curve of the system and trace keyed by COLUMNS of
+                each chunk.
+        """
+        num_steps = int(round((t_end - t_start) / self._dt))
+        self._converter.setup()
+        self._controller.setup()
+        self._sensor.setup()
+
+        # Bind everything used in the inner loop locally.
+        dt = self._dt
+        step = self._converter.step
+        sample = self._sensor.sample
+        sense_v = self._sensor.get_voltage
+        sense_i = self._sensor.get_current
+        get_setpoint = self._controller.get_setpoint
+        v_ref = self._converter.get_voltage()
+
+        for time, lo, hi in self._get_segments(t_start, num_steps):
+            curve = self._system.get_sys_curve(time, self._num_points)
+            self._converter.set_source(curve)
+            get_current = curve.get_current
+
+            for chunk_lo in range(lo, hi, chunk_size):
+                chunk_hi = min(chunk_lo + chunk_size, hi)
+                trace = [[], [], [], []]
+                put_v, put_i, put_p, put_ref = [col.append for col in trace]
+
+                for k in range(chunk_lo, chunk_hi):
+                    v = step(v_ref, dt)
+                    i = get_current(v)
+                    sample(v, i)
+                    v_ref = get_setpoint(sense_v(), sense_i())
+
+                    if k % stride == 0:
+                        put_v(v)
+                        put_i(i)
+                        put_p(v * i)
+                        put_ref(v_ref)
+
+                first = -(-chunk_lo // stride) * stride
+                times = t_start + dt * np.arange(first, chunk_hi, stride)
+                chunk = dict(zip(self.COLUMNS, [times, *map(np.array, trace)]))
+                yield time, curve, chunk
+
+    def run_scheduled(
+        self,
+        t_start: float,
+        t_end: float,
+        controller_dt: float = None,
+        interp: bool = False,
+        stride: int = 1,
+    ) -> pd.DataFrame:
+        """Simulate the converter loop with each component at its own rate:
+        the converter at the simulator step, the controller at a slower step,
+        and the environment only when it changes, at its measured times.
+
+        The operating curve of the system is only fetched on environment
+        events, and is only rebuilt if the environment seen by the system
+        changed. Between events, the operating point is held from the last
+        measured time, or interpolated toward the next.
+
+        Args:
+            t_start (float): Start of the run. Seconds.
+            t_end (float): End of the run, exclusive. Seconds.
+            controller_dt (float, optional): Controller step. Seconds.
+                Defaults to the simulator step.
+            interp (bool, optional): Interpolate the operating point between
+                measured times rather than holding it. Defaults to False.
+            stride (int, optional): Record every stride-th converter step.
+                Defaults to 1.
+
+        Returns:
+            pd.DataFrame: Trace of time, source voltage, current, power and
+                the voltage reference after each recorded converter step.
+        """
+        if controller_dt is None:
+            controller_dt = self._dt
+        times = self._system.get_env().get_times()
+        if len(times) == 0:
+            raise Exception("Environment has no voxels.")
+
+        self._converter.setup()
+        self._controller.setup()
+        self._sensor.setup()
+        trace = [[], [], [], [], []]
+        state = {
+            "v_ref": self._converter.get_voltage(),
+            "step": 0,
+            "curves": None,
+            "span": (0.0, 0.0),
+        }
+
+        def update_env(time):
+            idx = max(int(np.searchsorted(times, time, side="right")) - 1, 0)
+            curve = self._system.get_sys_curve(times[idx], self._num_points)
+            after = None
+            if interp and idx + 1 < len(times):
+                after = self._system.get_sys_curve(times[idx + 1], self._num_points)
+                after = None if after is curve else after.get_current
+                state["span"] = (float(times[idx]), float(times[idx + 1]))
+            state["curves"] = (curve.get_current, after)
+            self._converter.set_source(curve)
+
+        def update_converter(time):
+            v = self._converter.step(state["v_ref"], self._dt)
+            before, after = state["curves"]
+            i = before(v)
+            if after is not None:
+                lo, hi = state["span"]
+                weight = (time - lo) / (hi - lo)
+                i += (after(v) - i) * weight
+            self._sensor.sample(v, i)
+
+            if state["step"] % stride == 0:
+                for col, value in zip(trace, [time, v, i, v * i, state["v_ref"]]):
+                    col.append(value)
+            state["step"] += 1
+
+        def update_controller(time):
+            state["v_ref"] = self._controller.get_setpoint(
+                self._sensor.get_voltage(), self._sensor.get_current()
+            )
+
+        # The environment is first fetched at the start of the run, then each
+        # time it changes. The controller acts on the readings of the
+        # converter step before it.
+        changes = times[(times > t_start) & (times < t_end)]
+        event_times = np.concatenate([[t_start], changes])
+        scheduler = Scheduler()
+        scheduler.add_events(update_env, event_times, priority=0)
+        scheduler.add_periodic(update_converter, self._dt, priority=1)
+        scheduler.add_periodic(
+            update_controller, controller_dt, offset=self._dt, priority=2
+        )
+        scheduler.run(t_start, t_end)
+
+        return pd.DataFrame(np.transpose(trace), columns=self.COLUMNS)
+
+    def run_batch(
+        self, curves: OperatingCurveBatch, num_steps: int, stride: int = 1
+    ) -> dict:
+        """Simulate the converter loop over N independent scenarios at once,
+        such as shading conditions, each held constant. The converter,
+        sensor and controller step every scenario in a single vectorized
+        update.
+
+        Args:
+            curves (OperatingCurveBatch): Operating curve of each scenario.
+            num_steps (int): Number of steps to run.
+            stride (int, optional): Record every stride-th step. Defaults to 1.
+
+        Returns:
+            dict[str, np.ndarray]: Trace keyed by COLUMNS. Time is of shape
+                (S,), and the rest of shape (S, N).
+        """
+        self._converter.setup()
+        self._controller.setup()
+        self._sensor.setup()
+
+        self._converter.set_source(curves)
+        num_rows = (num_steps + stride - 1) // stride
+        trace = {col: np.zeros((num_rows, len(curves))) for col in self.COLUMNS[1:]}
+        v_ref = np.full(len(curves), self._converter.get_voltage(), dtype=float)
+
+        for k in range(num_steps):
+            v = self._converter.step(v_ref, self._dt)
+            i = curves.get_currents(v)
+            self._sensor.sample(v, i)
+            v_ref = self._controller.get_setpoint(
+                self._sensor.get_voltage(), self._sensor.get_current()
+            )
+
+            if k % stride == 0:
+                row = k // stride
+                trace["Voltage (V)"][row] = v
+                trace["Current (A)"][row] = i
+                trace["Power (W)"][row] = v * i
+                trace["Reference (V)"][row] = v_ref
+
+        trace["Time (s)"] = self._dt * np.arange(0, num_steps, stride)
+        return trace
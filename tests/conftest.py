@@ -0,0 +1,35 @@
+"""
+@file       conftest.py
+@author     Matthew Yu (matthewjkyu@gmail.com)
+@brief      Shared pytest configuration.
+@version    0.4.0
+@date       2026-10-19
+"""
+
+import pytest
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--benchmark",
+        action="store_true",
+        help="Run wall clock benchmarks, which are skipped by default.",
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "benchmark: wall clock throughput check, run with --benchmark."
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    # Wall clock thresholds depend on the load of the machine, so they are
+    # only checked on request.
+    if config.getoption("--benchmark"):
+        return
+
+    skip = pytest.mark.skip(reason="Wall clock benchmark, run with --benchmark.")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip)
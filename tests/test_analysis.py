@@ -0,0 +1,155 @@
+"""
+@file       test_analysis.py
+@author     Matthew Yu (matthewjkyu@gmail.com)
+@brief      Tests for the streaming analysis.
+@version    0.4.0
+@date       2026-10-19
+"""
+
+import sys
+
+sys.path.extend(["."])
+
+import numpy as np
+import pytest
+
+from analysis.accumulator import RunningStats, WindowStats
+from analysis.analyzer import Analyzer
+from analysis.efficiency import EfficiencyAnalysis
+from analysis.stability import StabilityAnalysis
+from converter.controller.controller import Controller
+from converter.controller.mppt_algorithms.perturb_observe import PerturbObserve
+from converter.converter import Converter
+from environment.environment import Environment
+from pv.cell.three_param_cell import ThreeParamCell
+from pv.pv_system import PVSystem
+from simulation.simulator import Simulator
+
+
+@pytest.fixture
+def setup():
+    # Two of four cells are shaded for the second half of a 2 second run.
+    voxels = [
+        [x, 0, t, 1000.0 if x < 2 or t == 0 else 500.0, 298.15]
+        for x in range(4)
+        for t in range(2)
+    ]
+    env = Environment()
+    env.add_voxels(*np.transpose(voxels))
+
+    params = {
+        "ref_irrad": 1000.0,  # W/m^2
+        "ref_temp": 298.15,  # Kelvin
+        "ref_voc": 0.721,  # Volts
+        "ref_isc": 6.15,  # Amps
+        "fit_fwd_ideality_factor": 1.294,
+        "fit_rev_ideality_factor": 2,
+        "fit_rev_sat_curr": 1 * 10**-5,
+    }
+
+    system = PVSystem(env=env)
+    for x in range(4):
+        system.add_pv(x, ThreeParamCell(params=params), x, 0)
+
+    yield system
+
+
+def test_running_stats():
+    rng = np.random.default_rng(0)
+    values = rng.normal(3.0, 2.0, (1000, 4))
+    stats = RunningStats()
+    for chunk in np.array_split(values, [1, 10, 500, 501]):
+        stats.update(chunk)
+
+    assert stats.count == 1000
+    assert stats.mean == pytest.approx(values.mean(axis=0))
+    assert stats.get_std() == pytest.approx(values.std(axis=0))
+    assert stats.min.tolist() == values.min(axis=0).tolist()
+    assert stats.max.tolist() == values.max(axis=0).tolist()
+
+    stats.setup()
+    stats.update(1.0)
+    stats.update(3.0)
+    assert stats.mean == 2.0
+    assert stats.get_var() == 1.0
+
+
+def test_window_stats():
+    window = WindowStats(10)
+    assert np.isnan(window.get_mean())
+
+    window.update(np.arange(4.0))
+    assert window.get_values().tolist() == [0.0, 1.0, 2.0, 3.0]
+
+    # The window wraps around its end, and keeps only the last samples.
+    window.update(np.arange(4.0, 13.0))
+    assert window.get_values().tolist() == list(np.arange(3.0, 13.0))
+    window.update(np.arange(13.0, 40.0))
+    assert window.get_values().tolist() == list(np.arange(30.0, 40.0))
+    assert window.get_mean() == 34.5
+
+
+def test_efficiency():
+    analysis = EfficiencyAnalysis(window=2)
+    analysis.update([1.0, 1.0], 2.0)
+    analysis.update([4.0, 4.0], 4.0)
+    analysis.update([0.0], 0.0)
+
+    # Efficiency is weighed by energy, and samples without power are skipped.
+    assert analysis.get_efficiency() == pytest.approx(10.0 / 12.0)
+    assert analysis.get_window_efficiency() == 1.0
+    assert analysis.get_min_efficiency() == 0.5
+
+
+def test_stability():
+    analysis = StabilityAnalysis(window=10)
+
+    # A steady ramp never reverses.
+    ramp = np.arange(100) * 0.01
+    analysis.update(ramp[:50], ramp[:50])
+    analysis.update(ramp[50:], ramp[50:])
+    assert analysis.get_oscillation() == 0.0
+    assert analysis.get_tracking_error() == 0.0
+
+    # A three level oscillation reverses every other step, across chunks.
+    analysis.setup()
+    levels = np.tile([1.0, 1.01, 1.02, 1.01], 25)
+    for chunk in np.array_split(levels, 7):
+        analysis.update(chunk + 0.01, chunk)
+    assert analysis.get_oscillation() == pytest.approx(0.5, abs=0.02)
+    assert analysis.get_tracking_error() == pytest.approx(0.01)
+    assert analysis.get_ripple() == pytest.approx(np.std(levels[-10:]))
+
+
+def test_stream(setup):
+    system = setup
+    sim = Simulator(
+        system,
+        converter=Converter(tau=1e-6),
+        controller=Controller(PerturbObserve(v_ref=1.5, stride=0.01)),
+    )
+    df = sim.run(0, 2)
+
+    # The streamed trace matches the full trace, in bounded chunks.
+    chunks = list(sim.stream(0, 2, chunk_size=3000))
+    assert len(chunks) == 8
+    assert np.concatenate([chunk["Power (W)"] for _, _, chunk in chunks]) == (
+        pytest.approx(df["Power (W)"].to_numpy())
+    )
+
+    analyzer = Analyzer(1e-4, system=system)
+    summary = analyzer.consume(sim.stream(0, 2, chunk_size=3000))
+    assert summary["Energy (J)"] == pytest.approx(df["Power (W)"].sum() * 1e-4)
+    assert summary["Peak Power (W)"] == df["Power (W)"].max()
+
+    available = system.get_sys_curve(0).p_mpp + system.get_sys_curve(1).p_mpp
+    assert summary["Available Energy (J)"] == pytest.approx(available)
+    assert 0.9 < summary["Efficiency"] < 1.0
+
+    # Mismatch only arises once part of the system is shaded.
+    unshaded = sum(system.get_pv_curve(id, 0).p_mpp for id in range(4))
+    assert unshaded == pytest.approx(system.get_sys_curve(0).p_mpp, rel=1e-3)
+    assert summary["Mismatch Loss (J)"] > 0.0
+
+    # Perturb and observe oscillates about the peak for much of the run.
+    assert summary["Oscillation"] > 0.4
@@ -0,0 +1,157 @@
+"""
+@file       test_battery.py
+@author     Matthew Yu (matthewjkyu@gmail.com)
+@brief      Tests for the battery pack loads.
+@version    0.4.0
+@date       2026-10-19
+"""
+
+import sys
+
+sys.path.extend(["."])
+
+import time
+
+import numpy as np
+import pytest
+
+from converter.averaged_converter import AveragedConverter
+from load.battery.lead_acid import LeadAcid
+from load.battery.li_ion import LiIon
+from load.battery.li_ni_mn_co import LiNiMnCo
+from pv.operating_curve import OperatingCurve
+
+
+@pytest.mark.parametrize("chemistry", [LeadAcid, LiNiMnCo, LiIon])
+def test_ocv(chemistry):
+    pack = chemistry(num_series=10, num_parallel=2, soc=1.0)
+    assert pack.get_ocv() == pytest.approx(10 * chemistry.OCV_VOLTS[-1])
+    assert pack.get_resistance() == pytest.approx(10 * chemistry.RESISTANCE / 2)
+    assert pack.get_voltage(1.0) == pytest.approx(
+        pack.get_ocv() + pack.get_resistance()
+    )
+
+    pack = chemistry(num_series=2, soc=[0.0, 0.5])
+    assert pack.get_ocv() == pytest.approx(
+        chemistry.OCV_VOLTS[0] + chemistry.OCV_VOLTS[5]
+    )
+    assert pack.get_soc() == 0.25
+
+
+def test_charge():
+    pack = LiNiMnCo(
+        num_series=120, num_parallel=4, soc=0.2, capacity=np.linspace(2.5, 3.5, 120)
+    )
+
+    # Charge at 1 A for an hour.
+    for _ in range(3600):
+        pack.step(1.0, 1.0)
+
+    expected = 0.2 + LiNiMnCo.EFFICIENCY / (4 * np.linspace(2.5, 3.5, 120))
+    assert pack.get_cell_soc() == pytest.approx(expected)
+    assert pack.get_energy() > 3600 * pack.get_ocv() * 0.99
+
+    # Cells stop charging when full, and stop discharging when empty.
+    pack.step(1e6, 1.0)
+    assert np.all(pack.get_cell_soc() == 1.0)
+    pack.step(-1e6, 1.0)
+    assert np.all(pack.get_cell_soc() == 0.0)
+
+    pack.setup()
+    assert pack.get_soc() == pytest.approx(0.2)
+    assert pack.get_energy() == 0.0
+
+
+def test_round_trip():
+    pack = LiNiMnCo(num_series=4, soc=0.5, capacity=20.0)
+
+    # Charging at 5 A for an hour and discharging it again loses charge.
+    for current in [5.0, -5.0]:
+        for _ in range(3600):
+            pack.step(current, 1.0)
+
+    loss = 5.0 * (1 - LiNiMnCo.EFFICIENCY) / 20.0
+    assert pack.get_soc() == pytest.approx(0.5 - loss)
+    assert pack.get_soc() < 0.5
+
+    # Batched scenarios lose the same charge.
+    pack.setup()
+    currents = np.array([5.0, 0.0])
+    for sign in [1.0, -1.0]:
+        for _ in range(3600):
+            pack.step(sign * currents, 1.0)
+    assert pack.get_soc().tolist() == pytest.approx([0.5 - loss, 0.5])
+
+
+def test_batch():
+    pack = LeadAcid(num_series=6, soc=np.linspace(0.4, 0.6, 6), stride=10)
+    currents = np.array([0.0, 10.0, -10.0])
+    for _ in range(100):
+        pack.step(currents, 1.0)
+
+    assert pack.get_cell_soc().shape == (3, 6)
+    socs = pack.get_soc()
+    assert socs[0] == pytest.approx(0.5)
+    assert socs[1] > 0.5 > socs[2]
+    assert pack.get_ocv().shape == (3,)
+
+    trace = pack.get_trace()
+    assert trace["Time (s)"].tolist() == pytest.approx(np.arange(1, 101, 10))
+    assert trace["SOC"].shape == (10, 3)
+    assert np.all(trace["Min SOC"] <= trace["SOC"])
+    assert np.all(trace["SOC"] <= trace["Max SOC"])
+
+
+def test_sink():
+    chunks = []
+    pack = LeadAcid(num_series=6, stride=2, sink=chunks.append, chunk_size=16)
+    for _ in range(100):
+        pack.step(np.array([1.0, -1.0]), 1.0)
+
+    # Full chunks are passed on as they fill, and the rest on flush.
+    assert [len(chunk["Time (s)"]) for chunk in chunks] == [16, 16, 16]
+    assert len(pack.get_trace()["Time (s)"]) == 2
+    pack.flush()
+    assert len(pack.get_trace()["Time (s)"]) == 0
+    times = np.concatenate([chunk["Time (s)"] for chunk in chunks])
+    assert times.tolist() == pytest.approx(np.arange(1, 101, 2))
+    assert chunks[0]["SOC"].shape == (16, 2)
+
+    # Without a sink only the most recent records are held.
+    pack = LeadAcid(num_series=6, stride=1, chunk_size=16)
+    for _ in range(100):
+        pack.step(1.0, 1.0)
+    times = pack.get_trace()["Time (s)"]
+    assert 16 <= len(times) < 32
+    assert times[-1] == 100.0
+
+
+def test_converter():
+    volts = np.linspace(0.0, 3.0, 256)
+    curve = OperatingCurve(volts, 5.0 * (1 - np.exp((volts - 3.0) / 0.1)))
+    pack = LeadAcid(num_series=6, stride=100)
+    conv = AveragedConverter(load=pack)
+    conv.set_source(curve)
+
+    for _ in range(5000):
+        conv.step(2.5, 1e-4)
+    assert conv.get_voltage() == pytest.approx(2.5, abs=1e-3)
+
+    # The pack absorbs the converter output.
+    v_out, i_out = conv.get_output()
+    assert v_out == pytest.approx(pack.get_voltage(i_out))
+    assert v_out * i_out * 0.5 == pytest.approx(pack.get_energy(), rel=0.05)
+    assert pack.get_soc() > 0.5
+    assert len(pack.get_trace()["Energy (J)"]) == 50
+
+
+@pytest.mark.benchmark
+def test_throughput():
+    pack = LiNiMnCo(
+        num_series=120, num_parallel=4, soc=0.2, capacity=np.linspace(2.5, 3.5, 120)
+    )
+
+    start = time.perf_counter()
+    for _ in range(3600):
+        pack.step(1.0, 1.0)
+    assert time.perf_counter() - start < 1.0
@@ -0,0 +1,77 @@
+"""
+@file       test_cell_type.py
+@author     Matthew Yu (matthewjkyu@gmail.com)
+@brief      Tests for the shared cell parameter registry.
+@version    0.4.0
+@date       2026-10-19
+"""
+
+import sys
+
+sys.path.extend(["."])
+
+import pytest
+
+from pv.cell.cell_type import REGISTRY
+from pv.cell.three_param_cell import ThreeParamCell
+
+
+@pytest.fixture
+def setup():
+    params = {
+        "ref_irrad": 1000.0,  # W/m^2
+        "ref_temp": 298.15,  # Kelvin
+        "ref_voc": 0.721,  # Volts
+        "ref_isc": 6.15,  # Amps
+        "fit_fwd_ideality_factor": 1.294,
+        "fit_rev_ideality_factor": 2,
+        "fit_rev_sat_curr": 1 * 10**-5,
+    }
+
+    yield params
+
+
+def test_shared(setup):
+    params = setup
+
+    cells = [ThreeParamCell(params=dict(params)) for _ in range(3)]
+    assert cells[0].get_params() is cells[1].get_params()
+    assert REGISTRY.is_homogeneous(cells)
+
+    # Parameters are immutable.
+    with pytest.raises(TypeError):
+        cells[0].get_params()["ref_isc"] = 5.0
+
+    # Curves are shared between cells of the same type.
+    iv = cells[0].get_iv([1000], [298.15])
+    assert cells[1].get_iv([1000], [298.15]) is iv
+
+
+def test_group(setup):
+    params = setup
+
+    cells = [
+        ThreeParamCell(params=params),
+        ThreeParamCell(params={**params, "ref_isc": 5.0}),
+        ThreeParamCell(params=params),
+    ]
+    assert not REGISTRY.is_homogeneous(cells)
+
+    groups = REGISTRY.group(cells)
+    assert len(groups) == 2
+    assert groups[cells[0].get_params()] == [0, 2]
+    assert groups[cells[1].get_params()] == [1]
+
+
+def test_fit_data(setup):
+    params = setup
+
+    cell = ThreeParamCell(
+        params=params, data_fp="./tests/example_captures/example_cell.capture"
+    )
+    other = ThreeParamCell(params=params)
+    cell.fit_params(irradiance=1000, temperature=298.15)
+
+    # Fitting rebinds the fitted cell without touching cells that shared its
+    # original parameters.
+    assert other.get_params()["fit_rev_sat_curr"] == params["fit_rev_sat_curr"]
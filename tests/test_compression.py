@@ -0,0 +1,103 @@
+"""
+@file       test_compression.py
+@author     Matthew Yu (matthewjkyu@gmail.com)
+@brief      Tests for run length compression of environment voxels.
+@version    0.4.0
+@date       2026-10-19
+"""
+
+import sys
+
+sys.path.extend(["."])
+
+import numpy as np
+import pytest
+
+from environment.compression import CompressedVoxels
+from environment.environment import Environment
+from environment.generators import obstacle_shade, to_voxels
+
+
+def get_voxels():
+    # A mostly static canvas, with one cell shaded halfway through and one
+    # cell missing for a stretch.
+    times = np.arange(100.0)
+    irrad = np.full((100, 4, 3), 1000.0)
+    irrad[50:] *= obstacle_shade(times[50:], (4, 3), [[1, 2]], 0.5)
+    voxels = to_voxels(times, irrad, 298.15)
+    missing = (voxels[:, 0] == 3) & (voxels[:, 1] == 0) & (voxels[:, 2] < 10)
+    return voxels[~missing]
+
+
+def test_roundtrip():
+    voxels = get_voxels()
+    compressed = CompressedVoxels.compress(voxels)
+
+    assert np.array_equal(compressed.decompress(), voxels)
+    assert compressed.nbytes * 10 < voxels.nbytes
+
+
+def test_get_voxels_at():
+    compressed = CompressedVoxels.compress(get_voxels())
+
+    irrad, temp = compressed.get_voxels_at([1, 1, 0], [2, 2, 0], [49, 50, 99])
+    assert irrad.tolist() == [1000.0, 500.0, 1000.0]
+    assert temp.tolist() == [298.15] * 3
+
+    with pytest.raises(Exception):
+        compressed.get_voxels_at(3, 0, 5)
+    with pytest.raises(Exception):
+        compressed.get_voxels_at(0, 0, 0.5)
+
+    irrad, _ = compressed.get_voxels_at([3, 3, 7], [0, 0, 0], [5, 10, 0], "nan")
+    assert np.isnan(irrad[0]) and irrad[1] == 1000.0 and np.isnan(irrad[2])
+
+
+def test_unchanged_since():
+    compressed = CompressedVoxels.compress(get_voxels())
+
+    since = compressed.get_unchanged_since([1, 1, 0, 3], [2, 2, 0, 0], [40, 80, 80, 5])
+    assert since[:3].tolist() == [0.0, 50.0, 0.0]
+    assert np.isnan(since[3])
+
+    assert compressed.get_changed(0, 49).tolist() == [[3, 0]]
+    assert compressed.get_changed(49, 50).tolist() == [[1, 2]]
+    assert len(compressed.get_changed(50, 99)) == 0
+
+    # Spans end at the first change of any of the positions.
+    times = compressed.get_unchanged_times([0, 1], [0, 2], 20)
+    assert times.tolist() == list(range(50))
+    assert compressed.get_unchanged_times([0, 3], [0, 0], 20).tolist() == list(
+        range(10, 100)
+    )
+    assert len(compressed.get_unchanged_times([0, 3], [0, 0], 5)) == 0
+
+
+def test_resolution():
+    voxels = get_voxels()
+    voxels[:, 3] += np.random.default_rng(0).uniform(-1, 1, len(voxels))
+    compressed = CompressedVoxels.compress(voxels, resolution=[10.0, 1.0])
+
+    assert np.max(np.abs(compressed.decompress()[:, 3] - voxels[:, 3])) <= 5.0
+    assert compressed.nbytes * 10 < voxels.nbytes
+
+
+def test_environment(tmp_path):
+    env = Environment()
+    env.gen_voxels(get_voxels)
+
+    compressed = env.compress_voxels()
+    assert compressed.get_voxels_at(1, 2, 60)[0] == env.get_voxel(1, 2, 60)[0]
+
+    file_path = str(tmp_path / "test_env.rle.npz")
+    env.save_env(file_path)
+    env = Environment(filepath=file_path)
+    assert np.array_equal(env.np, get_voxels())
+
+    # The lossless runs are kept until the voxels change.
+    runs = env.get_compressed_voxels()
+    assert env.get_compressed_voxels() is runs
+    env.add_voxel(0, 0, 100, 1000.0, 298.15)
+    assert env.get_compressed_voxels() is not runs
+    env.interp_voxels()
+    assert env.get_compressed_voxels() is None
@@ -0,0 +1,149 @@
+"""
+@file       test_converter.py
+@author     Matthew Yu (matthewjkyu@gmail.com)
+@brief      Tests for the averaged converter model.
+@version    0.4.0
+@date       2026-10-19
+"""
+
+import sys
+
+sys.path.extend(["."])
+
+import time
+
+import numpy as np
+import pytest
+
+from converter.averaged_converter import AveragedConverter
+from converter.controller.controller import Controller
+from converter.controller.mppt_algorithms.perturb_observe import PerturbObserve
+from load.load import ResistiveLoad
+from pv.operating_curve import OperatingCurve, OperatingCurveBatch
+from simulation.simulator import Simulator
+
+
+@pytest.fixture
+def setup():
+    # Single peaked curves over a range of irradiance.
+    volts = np.linspace(0.0, 3.0, 256)
+    scales = np.linspace(0.4, 1.0, 8)[:, np.newaxis]
+    currs = 5.0 * scales * (1 - np.exp((volts - 3.0) / 0.1))
+    curves = OperatingCurveBatch(np.broadcast_to(volts, (8, 256)), currs)
+
+    yield curves
+
+
+def run(conv, v_ref, num_steps, dt=1e-4):
+    for _ in range(num_steps):
+        v = conv.step(v_ref, dt)
+    return v
+
+
+@pytest.mark.parametrize("topology,resistance", [("buck", 0.2), ("boost", 10.0)])
+def test_regulation(setup, topology, resistance):
+    curves = setup
+    curve = OperatingCurve(curves.volts[-1], curves.currs[-1])
+    conv = AveragedConverter(topology=topology, load=ResistiveLoad(resistance))
+    conv.set_source(curve)
+
+    v = run(conv, 2.5, 5000)
+    assert isinstance(v, float)
+    assert v == pytest.approx(2.5, abs=1e-3)
+
+    # Power is conserved, less the conduction loss.
+    i_in = curve.get_current(v)
+    v_out, i_out = conv.get_output()
+    loss = 0.05 * conv.get_current() ** 2
+    assert v_out * i_out == pytest.approx(v * i_in - loss, rel=1e-3)
+
+    # The conversion ratio follows the duty cycle.
+    duty = conv.get_duty()
+    if topology == "buck":
+        assert v_out < v
+        assert i_out * duty == pytest.approx(i_in, rel=1e-3)
+    else:
+        assert v_out > v
+        assert i_out == pytest.approx(i_in * (1 - duty), rel=1e-3)
+
+
+def test_batch(setup):
+    curves = setup
+    conv = AveragedConverter()
+    conv.set_source(curves)
+    v_refs = np.linspace(2.0, 2.7, len(curves))
+    volts = run(conv, v_refs, 2000)
+
+    for idx in [0, 5]:
+        single = AveragedConverter()
+        single.set_source(OperatingCurve(curves.volts[idx], curves.currs[idx]))
+        assert volts[idx] == pytest.approx(run(single, v_refs[idx], 2000))
+
+
+@pytest.mark.parametrize("topology", ["buck", "boost"])
+def test_scalar(setup, topology):
+    curves = setup
+    curve = OperatingCurve(curves.volts[-1], curves.currs[-1])
+
+    # A single converter steps on floats as a batch of one does.
+    scalar = AveragedConverter(topology=topology, substeps=2)
+    batch = AveragedConverter(topology=topology, substeps=2)
+    scalar.set_source(curve)
+    batch.set_source(curves)
+    v_refs = np.full(len(curves), 2.0)
+    for step in range(500):
+        v_ref = 2.0 if step < 250 else 2.5
+        v_refs[:] = v_ref
+        volt = scalar.step(v_ref, 1e-4)
+        volts = batch.step(v_refs, 1e-4)
+        assert isinstance(volt, float)
+        assert volt == pytest.approx(volts[-1], rel=1e-9, abs=1e-12)
+    assert scalar.get_output()[1] == pytest.approx(batch.get_output()[1][-1])
+
+
+def test_large_step(setup):
+    curves = setup
+    conv = AveragedConverter(substeps=100)
+    conv.set_source(curves)
+    volts = run(conv, np.full(len(curves), 2.5), 50, dt=1e-2)
+    assert np.all(np.isfinite(volts))
+    assert volts == pytest.approx(2.5, abs=1e-2)
+
+
+def test_tracking(setup):
+    curves = setup
+    sim = Simulator(
+        None,
+        converter=AveragedConverter(),
+        controller=Controller(PerturbObserve(v_ref=2.0, stride=0.01)),
+    )
+    trace = sim.run_batch(curves, 5000, stride=10)
+    efficiency = trace["Power (W)"][-50:].mean(axis=0) / curves.p_mpp
+    assert np.all(efficiency > 0.98)
+
+
+@pytest.mark.benchmark
+def test_throughput(setup):
+    curves = setup
+    curves = OperatingCurveBatch(
+        np.tile(curves.volts, (128, 1)), np.tile(curves.currs, (128, 1))
+    )
+    conv = AveragedConverter()
+    conv.set_source(curves)
+    v_refs = np.full(len(curves), 2.5)
+
+    start = time.perf_counter()
+    run(conv, v_refs, 1000)
+    elapsed = time.perf_counter() - start
+    assert 1000 * len(curves) / elapsed > 500000
+
+
+@pytest.mark.benchmark
+def test_scalar_throughput(setup):
+    curves = setup
+    conv = AveragedConverter()
+    conv.set_source(OperatingCurve(curves.volts[-1], curves.currs[-1]))
+
+    start = time.perf_counter()
+    run(conv, 2.5, 20000)
+    assert 20000 / (time.perf_counter() - start) > 100000
@@ -10,9 +10,11 @@ import sys
 
 sys.path.extend(["."])
 
+import os
 import random
 
 import numpy as np
+import pytest
 
 from environment.environment import Environment
 
@@ -43,6 +45,174 @@ def test_add_voxels():
     assert env.get_voxel(0, 1, 1) == [1000.0, 273.15]
 
 
+def test_get_voxels_cached():
+    env = Environment()
+    voxels = [
+        [1, 0, 1, 1000.0, 273.15],
+        [0, 1, 0, 500.0, 274.15],
+        [1, 1, 0, 250.0, 275.15],
+        [0, 0, 1, 750.0, 276.15],
+    ]
+    env.add_voxels(*np.transpose(voxels))
+
+    # Voxels are kept in T, X, Y order and the DataFrame is reused.
+    df = env.get_voxels()
+    assert df[["T", "X", "Y"]].values.tolist() == [
+        [0, 0, 1],
+        [0, 1, 1],
+        [1, 0, 0],
+        [1, 1, 0],
+    ]
+    assert env.get_voxels() is df
+    assert env.get_voxels_slice(1)["IRRAD"].tolist() == [750.0, 1000.0]
+    assert env.get_voxels_slice(1, axis="X")["T"].tolist() == [0, 1]
+
+    env.add_voxel(0, 0, 0, 0.0, 273.15)
+    assert env.get_voxels() is not df
+    assert len(env.get_voxels_slice(0)) == 3
+
+
+def test_get_voxels_grid():
+    env = Environment()
+    voxels = [
+        [0, 0, 0, 1000.0, 273.15],
+        [1, 0, 0, 500.0, 274.15],
+        [1, 2, 1, 250.0, 275.15],
+    ]
+    env.add_voxels(*np.transpose(voxels))
+
+    assert env.get_times().tolist() == [0, 1]
+
+    irrad, temp = env.get_voxels_grid(0)
+    assert irrad.shape == (2, 3)
+    assert irrad[0, 0] == 1000.0 and irrad[1, 0] == 500.0
+    assert temp[1, 0] == 274.15
+    assert np.isnan(irrad[1, 2])
+
+    irrad, temp = env.get_voxels_grid(1, shape=(2, 2))
+    assert np.all(np.isnan(irrad))
+
+
+def test_resample_voxels():
+    env = Environment()
+    times = np.arange(0, 10.0)
+    env.add_voxels(
+        np.zeros(10), np.zeros(10), times, 100.0 * times, np.full(10, 300.0)
+    )
+    env.add_voxels(
+        np.ones(5), np.zeros(5), times[::2], np.full(5, 500.0), np.full(5, 310.0)
+    )
+
+    # Downsampling averages each window.
+    coarse = env.resample_voxels(5)
+    assert coarse.get_voxels_slice(0)["IRRAD"].tolist() == [200.0, 500.0]
+    assert coarse.get_voxel(0, 0, 5) == [700.0, 300.0]
+
+    # Upsampling interpolates between measured times.
+    fine = env.resample_voxels(0.5, t_range=[0, 2])
+    assert fine.get_voxel(0, 0, 1.5) == [150.0, 300.0]
+    assert fine.get_voxel(1, 0, 1) == [500.0, 310.0]
+    assert len(fine.get_voxels()) == 2 * 5
+
+    with pytest.raises(Exception):
+        env.resample_voxels(0)
+
+
+def test_coarsen_voxels():
+    env = Environment()
+    voxels = [
+        [x, y, t, 100.0 * x + y, 273.15 + t]
+        for t in range(2)
+        for x in range(4)
+        for y in range(3)
+    ]
+    env.add_voxels(*np.transpose(voxels))
+
+    coarse = env.coarsen_voxels([2, 2])
+    assert len(coarse.get_voxels()) == 2 * 2 * 2
+    assert coarse.get_voxel(0, 0, 0) == [50.5, 273.15]
+    assert coarse.get_voxel(1, 1, 1) == [252.0, 274.15]
+
+
+def test_get_voxels_at():
+    env = Environment()
+    voxels = [
+        [1, 0, 0, 1000.0, 273.15],
+        [0, 1, 1, 500.0, 274.15],
+        [1, 1, 0, 250.0, 275.15],
+    ]
+
+    env.add_voxels(*np.transpose(voxels))
+    irrad, temp = env.get_voxels_at([1, 0, 1], [1, 1, 0], [0, 1, 0])
+    assert irrad.tolist() == [250.0, 500.0, 1000.0]
+    assert temp.tolist() == [275.15, 274.15, 273.15]
+
+    # Missing voxels either raise or are filled.
+    with pytest.raises(Exception):
+        env.get_voxels_at([0], [0], [0])
+    irrad, _ = env.get_voxels_at([0, 1], [0, 0], 0, missing="nan")
+    assert np.isnan(irrad[0]) and irrad[1] == 1000.0
+
+    # Index is rebuilt after the environment changes.
+    env.add_voxel(0, 0, 0, 750.0, 273.15)
+    assert env.get_voxel(0, 0, 0) == [750.0, 273.15]
+
+
+def test_interp_voxels():
+    env = Environment()
+    voxels = [
+        [0, 0, 0, 0.0, 273.15],
+        [2, 0, 0, 1000.0, 273.15],
+        [0, 2, 0, 0.0, 273.15],
+        [2, 2, 0, 1000.0, 273.15],
+        [0, 0, 10, 1000.0, 283.15],
+        [2, 2, 10, 1000.0, 283.15],
+    ]
+    env.add_voxels(*np.transpose(voxels))
+
+    with pytest.raises(Exception):
+        env.get_voxel(1, 1, 0)
+
+    # Interpolating a single query leaves later queries strict.
+    irrad, _ = env.get_voxels_at([1], [1], [0], missing="interp")
+    assert irrad.tolist() == pytest.approx([500.0])
+    with pytest.raises(Exception):
+        env.get_voxel(1, 1, 0)
+
+    env.interp_voxels()
+
+    # Measured voxels are returned as is.
+    assert env.get_voxel(2, 0, 0) == [1000.0, 273.15]
+    # Bilinear in space, linear in time.
+    irrad, temp = env.get_voxels_at([1, 1.5, 0], [1, 0, 0], [0, 0, 5])
+    assert irrad.tolist() == pytest.approx([500.0, 750.0, 500.0])
+    assert temp.tolist() == pytest.approx([273.15, 273.15, 278.15])
+
+    env.interp_voxels(method="nearest")
+    irrad, _ = env.get_voxels_at([1.6, 0], [0, 0], [0, 4])
+    assert irrad.tolist() == pytest.approx([1000.0, 0.0])
+
+    # Filled from the measured lattice rather than by triangulation.
+    env = Environment()
+    voxels = [
+        [0, 0, 0, 0.0, 273.15],
+        [2, 0, 0, 0.0, 273.15],
+        [0, 2, 0, 0.0, 273.15],
+        [2, 2, 0, 1000.0, 273.15],
+        [0, 0, 1, 0.0, 273.15],
+        [4, 0, 1, 400.0, 273.15],
+        [0, 2, 1, 0.0, 273.15],
+    ]
+    env.add_voxels(*np.transpose(voxels))
+    env.interp_voxels()
+    irrad, _ = env.get_voxels_at([1, 1, 2, 1, 3], [1, 0, 1, 0, 0], [0, 0, 0, 1, 1])
+    assert irrad.tolist() == pytest.approx([250.0, 0.0, 500.0, 100.0, 300.0])
+
+    # Unmeasured lattice points fall back to the nearest measured voxel.
+    irrad, _ = env.get_voxels_at([4, 3], [2, 2], [1, 1])
+    assert irrad.tolist() == pytest.approx([400.0, 400.0])
+
+
 def test_gen_voxels():
     def generator() -> list:
         rows, columns = 50, 50
@@ -90,6 +260,116 @@ def test_save_load_env():
     os.remove(file_path)
 
 
+@pytest.mark.parametrize("ext", ["npy", "npz", "rle.npz", "parquet"])
+def test_save_load_env_binary(ext, tmp_path):
+    if ext == "parquet":
+        pytest.importorskip("pyarrow")
+
+    file_path = str(tmp_path / f"test_env.{ext}")
+    voxels = [
+        [x, y, t, 1000.0 / (t + 1) + 0.123456789, 273.15 + x]
+        for t in range(5)
+        for x in range(3)
+        for y in range(2)
+    ]
+
+    env = Environment()
+    env.add_voxels(*np.transpose(voxels[::-1]))
+    env.save_env(file_path)
+
+    # Full precision is kept.
+    env = Environment(filepath=file_path)
+    assert env.get_voxel(1, 1, 2) == [1000.0 / 3 + 0.123456789, 274.15]
+
+    # Windows only load part of the environment.
+    env = Environment(filepath=file_path, t_range=[1, 2], x_range=[0, 1])
+    df = env.get_voxels()
+    assert len(df) == 2 * 2 * 2
+    assert set(df["T"]) == {1, 2} and set(df["X"]) == {0, 1}
+
+
+def test_out_of_core(tmp_path):
+    file_path = str(tmp_path / "test_env.npy")
+    voxels = [
+        [x, y, t, 100.0 * t + x, 273.15 + y]
+        for t in range(10)
+        for x in range(4)
+        for y in range(3)
+    ]
+
+    env = Environment()
+    env.add_voxels(*np.transpose(voxels))
+    env.save_env(file_path)
+
+    env = Environment(filepath=file_path, out_of_core=True)
+    assert isinstance(env.np, np.memmap)
+    assert env._df is None
+
+    irrad, temp = env.get_voxels_at([1, 3], [2, 0], [4, 9])
+    assert irrad.tolist() == [401.0, 903.0]
+    assert temp.tolist() == [275.15, 273.15]
+    assert len(env.get_voxels_slice(5)) == 4 * 3
+    with pytest.raises(Exception):
+        env.get_voxel(5, 0, 0)
+
+    # Slices are paged in on demand and only a bounded number are held.
+    env.SLICE_CACHE_SIZE = 2
+    env.get_voxels_at(0, 0, [0, 1, 2, 3])
+    assert len(env._slice_index) == 2
+    assert env._df is None
+
+    # Interpolation reads the slices it needs from the map.
+    irrad, temp = env.get_voxels_at([1], [1], [4.5], missing="interp")
+    assert irrad[0] == 451.0 and temp[0] == 274.15
+    assert isinstance(env._get_interpolator()._voxels, np.memmap)
+    assert list(env._get_interpolator()._cache) == [4, 5]
+
+    # Mutation loads the environment into memory.
+    env.add_voxel(5, 0, 0, 1000.0, 273.15)
+    assert not isinstance(env.np, np.memmap)
+    assert env.get_voxel(5, 0, 0) == [1000.0, 273.15]
+    assert env.get_voxel(3, 2, 9) == [903.0, 275.15]
+
+
+def test_stream_voxels(tmp_path):
+    def generator():
+        for t in range(20):
+            yield [[x, y, t, 50.0 * t, 273.15 + x] for x in range(3) for y in range(2)]
+
+    env = Environment()
+    env.stream_voxels(generator())
+    assert len(env.get_voxels()) == 20 * 3 * 2
+    assert env.get_voxel(2, 1, 19) == [950.0, 275.15]
+
+    # Write through, leaving the environment out of core on the file.
+    file_path = str(tmp_path / "test_env.npy")
+    env = Environment()
+    env.add_voxel(0, 0, -1, 0.0, 273.15)
+    env.stream_voxels(generator(), filepath=file_path, keep=False)
+    assert isinstance(env.np, np.memmap)
+    assert env.get_voxel(2, 1, 19) == [950.0, 275.15]
+    assert env.get_voxel(0, 0, -1) == [0.0, 273.15]
+
+    env = Environment(filepath=file_path)
+    assert len(env.get_voxels()) == 20 * 3 * 2 + 1
+
+    # A failed stream leaves the file as it was.
+    with pytest.raises(Exception):
+        env.stream_voxels(reversed(list(generator())), filepath=file_path)
+    assert len(Environment(filepath=file_path).get_voxels()) == 20 * 3 * 2 + 1
+    assert os.listdir(tmp_path) == ["test_env.npy"]
+
+    # Streaming onto the file the environment is out of core on replaces the
+    # file under the map only once the stream is done.
+    env = Environment(filepath=file_path, out_of_core=True)
+    env.stream_voxels(
+        [[[0, 0, 20, 1000.0, 273.15]]], filepath=file_path, keep=False
+    )
+    assert env.get_voxel(2, 1, 19) == [950.0, 275.15]
+    assert env.get_voxel(0, 0, 20) == [1000.0, 273.15]
+    assert len(env.get_voxels()) == 20 * 3 * 2 + 2
+
+
 if __name__ == "__main__":
 
     def generator() -> list:
@@ -0,0 +1,73 @@
+"""
+@file       test_generators.py
+@author     Matthew Yu (matthewjkyu@gmail.com)
+@brief      Tests for the procedural environment generators.
+@version    0.4.0
+@date       2026-10-19
+"""
+
+import sys
+
+sys.path.extend(["."])
+
+import time
+
+import numpy as np
+import pytest
+
+from environment.environment import Environment
+from environment.generators import (
+    cell_temperature,
+    clear_sky,
+    cloud_shadow,
+    obstacle_shade,
+    to_voxels,
+)
+
+
+def test_clear_sky():
+    times = np.array([0, 50, 100])
+    irrad = clear_sky(times, (2, 3), peak=1000.0, sunrise=0, sunset=100)
+    assert irrad.shape == (3, 2, 3)
+    assert irrad[1] == pytest.approx(np.full((2, 3), 1000.0))
+    assert irrad[0] == pytest.approx(np.zeros((2, 3)), abs=1e-9)
+
+
+def test_shading():
+    times = np.array([0, 10])
+    shadow = cloud_shadow(times, (10, 1), [0, 0], 1, [0.5, 0], opacity=0.5)
+    # The cloud moves 5 cells over 10 seconds.
+    assert shadow[0, 0, 0] == 0.5 and shadow[0, 5, 0] == 1.0
+    assert shadow[1, 5, 0] == 0.5 and shadow[1, 0, 0] == 1.0
+
+    shade = obstacle_shade(times, (3, 3), [[1, 1]])
+    assert shade[:, 1, 1].tolist() == [0.0, 0.0]
+    assert shade.sum() == 2 * 8
+
+
+def generate(times: np.ndarray, shape: tuple) -> np.ndarray:
+    irrad = clear_sky(times, shape, sunset=100)
+    irrad *= cloud_shadow(times, shape, [-20, 50], 20, [1, 0])
+    irrad *= obstacle_shade(times, shape, [[10, 10]])
+    temp = cell_temperature(irrad)
+    return to_voxels(times, irrad, temp)
+
+
+def test_gen_voxels():
+    times = np.arange(100)
+    voxels = generate(times, (100, 100))
+
+    env = Environment()
+    env.gen_voxels(lambda: voxels)
+    assert len(voxels) == 100 * 100 * 100
+    assert env.get_voxel(10, 10, 50) == [0.0, 298.15]
+    g, t = env.get_voxel(90, 50, 50)
+    assert g == pytest.approx(1000.0)
+    assert t == pytest.approx(298.15 + 25.0 / 800.0 * 1000.0)
+
+
+@pytest.mark.benchmark
+def test_throughput():
+    start = time.perf_counter()
+    generate(np.arange(100), (100, 100))
+    assert time.perf_counter() - start < 1.0
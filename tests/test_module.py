@@ -142,6 +142,29 @@ def test_equiv(setup):
         assert curr2 == pytest.approx(curr, rel=0.05)
 
 
+def test_exact(setup):
+    """Assert that the vectorized solvers are exact inverses of each other,
+    including under partial shading where the bypass diode conducts."""
+    _, params, _ = setup
+
+    module = Module(params=params)
+    for irrad in [[1000, 1000, 1000], [1000, 200, 1000]]:
+        temp = [273.15, 273.15, 273.15]
+
+        volts = np.linspace(-1.0, 2.0, 50)
+        currs = module.get_currents(volts, irrad, temp)
+        # The cell model steps slightly where it switches branches near I_SC,
+        # so the inverse there is only as exact as that step.
+        assert module.get_voltages(currs, irrad, temp) == pytest.approx(
+            volts, abs=1e-3
+        )
+
+        currs = np.linspace(-5.0, 10.0, 50)
+        assert [module.get_voltage(c, irrad, temp) for c in currs] == pytest.approx(
+            module.get_voltages(currs, irrad, temp)
+        )
+
+
 def test_pos(setup):
     _, params, _ = setup
 
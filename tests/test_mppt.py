@@ -0,0 +1,123 @@
+"""
+@file       test_mppt.py
+@author     Matthew Yu (matthewjkyu@gmail.com)
+@brief      Tests for the batched MPPT algorithms.
+@version    0.4.0
+@date       2026-10-19
+"""
+
+import sys
+
+sys.path.extend(["."])
+
+import numpy as np
+import pytest
+
+from converter.controller.controller import Controller
+from converter.controller.mppt_algorithms.global_scan import GlobalScan
+from converter.controller.mppt_algorithms.incremental_conductance import (
+    IncrementalConductance,
+)
+from converter.controller.mppt_algorithms.mppt_alg import MPPTAlg
+from converter.controller.mppt_algorithms.perturb_observe import PerturbObserve
+from converter.converter import Converter
+from pv.operating_curve import OperatingCurve, OperatingCurveBatch
+from simulation.simulator import Simulator
+
+
+@pytest.fixture
+def setup():
+    # Single peaked curves over a range of irradiance, followed by curves
+    # shaded past 1.5 V, where the global peak is on the left.
+    volts = np.linspace(0.0, 3.0, 256)
+    scales = np.linspace(0.2, 1.0, 20)[:, np.newaxis]
+    knee = 1 - np.exp((volts - 3.0) / 0.1)
+    single = 5.0 * scales * knee
+    step = 1 / (1 + np.exp((volts - 1.5) / 0.05))
+    shaded = 5.0 * (scales * 0.5 + (1 - scales * 0.5) * step) * knee
+    curves = OperatingCurveBatch(
+        np.broadcast_to(volts, (40, 256)), np.vstack([single, shaded])
+    )
+
+    yield curves
+
+
+def get_efficiency(alg, curves, num_steps=3000):
+    sim = Simulator(None, converter=Converter(tau=1e-6), controller=Controller(alg))
+    trace = sim.run_batch(curves, num_steps, stride=10)
+    return trace["Power (W)"][-50:].mean(axis=0) / curves.p_mpp
+
+
+def test_curve_batch(setup):
+    curves = setup
+    assert len(curves) == 40
+
+    curve = OperatingCurve(curves.volts[3], curves.currs[3])
+    assert curves.get_currents(np.full(40, 1.234))[3] == pytest.approx(
+        curve.get_current(1.234)
+    )
+    assert curves.p_mpp[3] == curve.p_mpp
+
+    batch = OperatingCurveBatch.from_curves(
+        [curve, OperatingCurve(np.zeros(1), np.zeros(1))]
+    )
+    assert batch.get_currents(np.array([1.234, 1.234])).tolist() == [
+        pytest.approx(curve.get_current(1.234)),
+        0.0,
+    ]
+
+
+def test_constant(setup):
+    alg = MPPTAlg(v_ref=1.0)
+    assert alg.get_setpoint(0.5, 1.0) == 1.0
+    assert alg.get_setpoint(np.zeros(3), np.zeros(3)).tolist() == [1.0] * 3
+
+
+@pytest.mark.parametrize(
+    "alg",
+    [
+        PerturbObserve(v_ref=2.5, stride=0.01),
+        IncrementalConductance(v_ref=2.5, stride=0.01, tolerance=0.05),
+    ],
+)
+def test_local(setup, alg):
+    curves = setup
+    efficiency = get_efficiency(alg, curves)
+
+    # Starting right of the shaded step, local trackers find the single peak
+    # but settle on the local peak of shaded curves.
+    assert np.all(efficiency[:20] > 0.97)
+    assert np.min(efficiency[20:]) < 0.8
+
+
+def test_global_scan(setup):
+    curves = setup
+    efficiency = get_efficiency(GlobalScan([0.0, 3.0], stride=0.01), curves)
+    assert np.all(efficiency > 0.9)
+
+
+@pytest.mark.parametrize(
+    "make_alg",
+    [
+        lambda: PerturbObserve(1.0, 0.01),
+        lambda: IncrementalConductance(1.0, 0.01, tolerance=0.05),
+        lambda: GlobalScan([0.0, 3.0], stride=0.01, num_scan=20, period=100),
+    ],
+)
+def test_scalar(setup, make_alg):
+    curves = setup
+    curve = OperatingCurve(curves.volts[25], curves.currs[25])
+
+    # A single scenario steps on floats exactly as a batch of one.
+    scalar, batch = make_alg(), make_alg()
+    v_ref, v_refs = 1.0, np.array([1.0])
+    for _ in range(300):
+        v_ref = scalar.get_setpoint(v_ref, curve.get_current(v_ref))
+        v_refs = batch.get_setpoint(v_refs, curve.get_currents(v_refs))
+        assert isinstance(v_ref, float)
+        assert v_ref == v_refs[0]
+
+    # Switching between a scenario and a batch reallocates the state.
+    batch.setup()
+    assert isinstance(batch.get_setpoint(1.0, 2.0), float)
+    assert batch.get_setpoint(np.ones(2), np.full(2, 2.0)).shape == (2,)
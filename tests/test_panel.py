@@ -10,9 +10,11 @@ import sys
 
 sys.path.extend(["."])
 
+import math as m
 
 import numpy as np
 import pytest
+from scipy import constants
 
 from environment.environment import Environment
 from pv.cell.three_param_cell import ThreeParamCell
@@ -158,9 +160,15 @@ def test_sanity(setup):
 
     assert panel.get_voltage(0, irrad, temp) >= 0.721 * 4
     assert panel.get_voltage(6.15, irrad, temp) == 0.0
-    assert panel.get_voltage(100, irrad, temp) == 0.0
 
-    assert panel.get_current(0, irrad, temp) >= 6.15
+    # Past short circuit the bypass diodes conduct nearly all of the current,
+    # holding each module about a diode drop below 0 V.
+    v_d = 1.5 * constants.k * 298.15 / constants.e * m.log(100 / (2 * 10**-4) + 1)
+    assert panel.get_voltage(100, irrad, temp) == pytest.approx(-2 * v_d, abs=0.01)
+
+    # Solved exactly, the short circuit current falls nanoamps short of the
+    # cell's, where the forward branch of the cells reaches 0 V.
+    assert panel.get_current(0, irrad, temp) == pytest.approx(6.15, abs=1e-6)
     assert panel.get_current(0.721 * 4, irrad, temp) == pytest.approx(0.0, abs=0.0001)
     assert panel.get_current(100, irrad, temp) == 0.0
 
@@ -15,6 +15,7 @@ import pytest
 
 from environment.environment import Environment
 from pv.cell.three_param_cell import ThreeParamCell
+from pv.operating_curve import OperatingCurve, OperatingCurveBatch
 from pv.pv_system import PVSystem
 
 
@@ -75,6 +76,236 @@ def test_pv_system(setup):
     assert system.get_pv_current(1, 100, 0) == 0.0
 
 
+def test_pv_system_cache(setup):
+    env, params, time_idx = setup
+    params = {
+        **params,
+        "fit_fwd_ideality_factor": 1.294,
+        "fit_rev_ideality_factor": 2,
+        "fit_rev_sat_curr": 1 * 10**-5,
+    }
+    env.add_voxels(*np.transpose([[0, 0, 1, 1000, 298.15], [0, 0, 2, 500, 298.15]]))
+
+    system = PVSystem(env=env)
+    system.add_pv(0, ThreeParamCell(params=params), 0, 0)
+
+    # Unchanged conditions between time steps reuse the cached curves.
+    iv = system.get_pv_iv(0, 0)
+    assert system.get_pv_iv(0, 1) is iv
+    assert system.get_pv_edge(0, 0) == system.get_pv_edge(0, 1)
+
+    # Changed conditions are re-evaluated.
+    assert system.get_pv_iv(0, 2) is not iv
+    assert system.get_pv_current(0, 0, 2) < system.get_pv_current(0, 0, 0)
+
+
+def test_sys_curve(setup):
+    env, params, time_idx = setup
+    params = {
+        **params,
+        "fit_fwd_ideality_factor": 1.294,
+        "fit_rev_ideality_factor": 2,
+        "fit_rev_sat_curr": 1 * 10**-5,
+    }
+
+    system = PVSystem(env=env)
+    system.add_pv(0, ThreeParamCell(params=params), 0, 0)
+    system.add_pv(1, ThreeParamCell(params=params), 1, 0)
+
+    curve = system.get_sys_curve(0)
+    assert system.get_sys_curve(0) is curve
+    assert curve.v_oc == pytest.approx(system.get_sys_voltage(0, 0))
+    assert curve.get_current(curve.v_oc + 1) == 0.0
+    assert curve.get_current(-1) == curve.i_sc
+
+    # Point queries agree with the system.
+    for volt in [0.1, 0.7, 1.2]:
+        curr = curve.get_current(volt)
+        assert system.get_sys_voltages([curr], 0)[0] == pytest.approx(volt, abs=1e-3)
+        assert curve.get_voltage(curr) == pytest.approx(volt, abs=1e-6)
+    assert curve.get_currents([0.1, 0.7]).tolist() == pytest.approx(
+        [curve.get_current(0.1), curve.get_current(0.7)]
+    )
+    assert 0 < curve.v_mpp < curve.v_oc
+
+
+def test_sys_cache(setup, monkeypatch):
+    env, params, time_idx = setup
+    params = {
+        **params,
+        "fit_fwd_ideality_factor": 1.294,
+        "fit_rev_ideality_factor": 2,
+        "fit_rev_sat_curr": 1 * 10**-5,
+    }
+
+    # Only the second cell is shaded at the second time step.
+    voxels = [
+        [x, 0, t, 300.0 if x == 1 and t == 1 else 1000.0, 298.15]
+        for x in range(2)
+        for t in range(2)
+    ]
+    env = Environment()
+    env.add_voxels(*np.transpose(voxels))
+
+    system = PVSystem(env=env)
+    cells = [ThreeParamCell(params=params), ThreeParamCell(params=params)]
+    calls = [0, 0]
+    for id, cell in enumerate(cells):
+        system.add_pv(id, cell, id, 0)
+
+        def count(*args, id=id, get_voltages=cell.get_voltages):
+            calls[id] += 1
+            return get_voltages(*args)
+
+        monkeypatch.setattr(cell, "get_voltages", count)
+
+    system.get_sys_curve(0)
+    calls[:] = [0, 0]
+
+    # The unshaded cell is not sampled again.
+    curve = system.get_sys_curve(1)
+    assert calls[0] == 0 and calls[1] > 0
+
+    # The shaded cell is reverse biased past its short circuit current.
+    assert curve.i_sc > cells[1].get_current(0.0, [300.0], [298.15])
+    for volt in [0.1, 0.5, 0.9]:
+        curr = curve.get_current(volt)
+        assert system.get_sys_voltages([curr], 1)[0] == pytest.approx(volt, abs=1e-3)
+
+
+def test_sys_runs(setup, monkeypatch):
+    env, params, time_idx = setup
+    params = {
+        **params,
+        "fit_fwd_ideality_factor": 1.294,
+        "fit_rev_ideality_factor": 2,
+        "fit_rev_sat_curr": 1 * 10**-5,
+    }
+
+    # The second cell is shaded from the third time step on, and a cell outside
+    # the system flickers every step.
+    shaded = [(1, t) for t in range(3, 6)] + [(2, t) for t in range(1, 6, 2)]
+    voxels = [
+        [x, 0, t, 300.0 if (x, t) in shaded else 1000.0, 298.15]
+        for x in range(3)
+        for t in range(6)
+    ]
+    env = Environment()
+    env.add_voxels(*np.transpose(voxels))
+
+    system = PVSystem(env=env)
+    system.add_pv(0, ThreeParamCell(params=params), 0, 0)
+    system.add_pv(1, ThreeParamCell(params=params), 1, 0)
+
+    calls = []
+    get_sys_env = system._get_sys_env
+    monkeypatch.setattr(
+        system, "_get_sys_env", lambda time: calls.append(time) or get_sys_env(time)
+    )
+
+    # The environment is gathered once per span the system is unchanged over.
+    curve = system.get_sys_curve(0)
+    assert system.get_sys_curve(1) is curve and system.get_sys_curve(2) is curve
+    shaded = system.get_sys_curve(3)
+    assert shaded is not curve and system.get_sys_curve(5) is shaded
+    assert calls == [0, 3]
+
+    # Times not measured are still gathered, and raise.
+    with pytest.raises(Exception):
+        system.get_sys_curve(4.5)
+
+    # Changed voxels and a moved system are gathered again.
+    env.add_voxel(0, 0, 6, 1000.0, 298.15)
+    env.add_voxel(1, 0, 6, 300.0, 298.15)
+    assert system.get_sys_curve(4) is shaded
+    system.set_sys_pos(1, 0)
+    assert system.get_sys_curve(4) is not shaded
+    assert calls == [0, 3, 4.5, 4, 4]
+
+
+def test_curve_batch():
+    # Diode curves of three sources, the last of them dark.
+    i_scs = np.array([6.0, 3.0, 0.0])
+
+    def get_voltages(currents, i_sc):
+        return 0.05 * np.log(np.maximum(i_sc - currents, 1e-300) / 1e-9 + 1.0)
+
+    batch = OperatingCurveBatch.build(
+        lambda currents: get_voltages(currents, i_scs[:, np.newaxis]), 3, 64
+    )
+    for idx in range(2):
+        curve = OperatingCurve.build(
+            lambda currents: get_voltages(currents, i_scs[idx]), 64
+        )
+        assert batch.volts[idx] == pytest.approx(curve.volts, rel=1e-12)
+        assert batch.currs[idx] == pytest.approx(curve.currs, rel=1e-9, abs=1e-12)
+    assert np.all(batch.volts[2] == 0.0) and np.all(batch.currs[2] == 0.0)
+    assert batch.p_mpp[2] == 0.0
+
+
+def test_sys_trajectory(setup, monkeypatch):
+    env, params, time_idx = setup
+    params = {
+        **params,
+        "fit_fwd_ideality_factor": 1.294,
+        "fit_rev_ideality_factor": 2,
+        "fit_rev_sat_curr": 1 * 10**-5,
+    }
+
+    # A shadow over X = 5 moves one step along X each second.
+    voxels = [
+        [x, 0, t, 300.0 if x == 5 + t else 1000.0, 298.15]
+        for x in range(12)
+        for t in range(3)
+    ]
+    env = Environment()
+    env.add_voxels(*np.transpose(voxels))
+
+    system = PVSystem(env=env)
+    system.add_pv(0, ThreeParamCell(params=params), 0, 0)
+    system.add_pv(1, ThreeParamCell(params=params), 1, 0)
+
+    # Drive along X at 2 voxels a second, posed every half second.
+    times = np.arange(0.0, 3.0, 0.5)
+    X = 3 + np.floor(2 * times)
+    calls = []
+    get_item_table = system._get_item_table
+    monkeypatch.setattr(
+        system,
+        "_get_item_table",
+        lambda *args: calls.append(args) or get_item_table(*args),
+    )
+    curves, inverse = system.get_sys_trajectory_curves(times, X, 0)
+    assert len(inverse) == 6
+    assert len(curves) == len(set(inverse.tolist())) < 6
+
+    # Each item is sampled once in and once out of the shadow.
+    assert len(calls) == 4
+    monkeypatch.undo()
+
+    # Poses before the environment begins have no conditions.
+    with pytest.raises(Exception, match="before the first time"):
+        system.get_sys_trajectory_curves([-0.5, 0.0], 3, 0)
+
+    # Curves solved together match those solved one at a time.
+    for time, x, idx in zip(times, X, inverse):
+        system.set_sys_pos(x, 0)
+        curve = system.get_sys_curve(int(time))
+        assert curves.p_mpp[idx] == pytest.approx(curve.p_mpp, rel=1e-9)
+        assert curves.currs[idx] == pytest.approx(curve.currs, rel=1e-9, abs=1e-9)
+
+    df = system.get_sys_trajectory(times, X, 0)
+    assert df["X"].tolist() == X.tolist()
+    assert df["Pmpp (W)"].tolist() == curves.p_mpp[inverse].tolist()
+    assert df["Energy (J)"].iloc[-1] == pytest.approx(
+        0.5 * df["Pmpp (W)"].iloc[:-1].sum()
+    )
+
+    # Poses under the shadow make less power.
+    shaded = (X == 5 + np.floor(times)) | (X + 1 == 5 + np.floor(times))
+    assert df["Pmpp (W)"][shaded].max() < df["Pmpp (W)"][~shaded].min()
+
+
 if __name__ == "__main__":
     voxels = [
         [0, 0, 0, 1000, 298.15],
@@ -0,0 +1,159 @@
+"""
+@file       test_realtime.py
+@author     Matthew Yu (matthewjkyu@gmail.com)
+@brief      Tests for the real time source.
+@version    0.4.0
+@date       2026-10-19
+"""
+
+import sys
+
+sys.path.extend(["."])
+
+import os
+import time
+
+import numpy as np
+import pytest
+
+from environment.environment import Environment
+from pv.cell.three_param_cell import ThreeParamCell
+from pv.pv_system import PVSystem
+from simulation.realtime import RealTimeSource
+
+
+def make_system(num_times, drop=20.0):
+    # Irradiance drops once a second.
+    voxels = [
+        [x, 0, t, 1000.0 - drop * t, 298.15]
+        for x in range(4)
+        for t in range(num_times)
+    ]
+    env = Environment()
+    env.add_voxels(*np.transpose(voxels))
+
+    params = {
+        "ref_irrad": 1000.0,  # W/m^2
+        "ref_temp": 298.15,  # Kelvin
+        "ref_voc": 0.721,  # Volts
+        "ref_isc": 6.15,  # Amps
+        "fit_fwd_ideality_factor": 1.294,
+        "fit_rev_ideality_factor": 2,
+        "fit_rev_sat_curr": 1 * 10**-5,
+    }
+
+    system = PVSystem(env=env)
+    for x in range(4):
+        system.add_pv(x, ThreeParamCell(params=params), x, 0)
+    return system
+
+
+@pytest.fixture
+def setup():
+    system = make_system(10)
+    expected = [system.get_sys_curve(t).get_current(2.5) for t in range(10)]
+    yield system, expected
+
+
+def wait_for(predicate, timeout=5.0):
+    start = time.perf_counter()
+    while not predicate():
+        assert time.perf_counter() - start < timeout
+        time.sleep(1e-3)
+
+
+def test_clock(setup):
+    system, expected = setup
+    now = [0.0]
+    source = RealTimeSource(system, speed=2.0, poll=1e-4, timer=lambda: now[0])
+    source.start(t_start=3.5)
+
+    # The present and next curves are ready on start.
+    assert source.get_current(2.5) == expected[3]
+    now[0] = 0.25
+    assert source.get_time() == 4.0
+    assert source.get_current(2.5) == expected[4]
+
+    # The builder moves on once the clock passes the next time.
+    wait_for(lambda: source._buffers[1] is not None and source._buffers[1][0] == 5)
+    now[0] = 0.75
+    assert source.get_current(2.5) == expected[5]
+
+    # When the clock skips ahead, it jumps straight to the present.
+    now[0] = 2.0
+    wait_for(lambda: source._buffers[0][0] == 7)
+    assert source.get_current(2.5) == expected[7]
+
+    # Past the end, the last time is held.
+    now[0] = 100.0
+    wait_for(lambda: source._buffers[0][0] == 9)
+    assert source.get_current(2.5) == expected[9]
+
+    # Without the builder, queries past the next curve are served late.
+    source.start(t_start=0.0)
+    source.stop()
+    now[0] = 102.0
+    assert source.get_current(2.5) == expected[1]
+
+    latency = source.get_latency()
+    assert latency["count"] == 6
+    assert latency["late"] == 1
+    assert latency["histogram"][1].sum() == 6
+
+
+def test_latency(setup):
+    system, expected = setup
+    source = RealTimeSource(system, speed=5.0)
+    source.start()
+
+    volts = np.random.default_rng(0).uniform(0.0, 2.8, 100000).tolist()
+    for volt in volts:
+        source.get_current(volt)
+    source.stop()
+
+    latency = source.get_latency()
+    assert latency["count"] == 100000
+    assert latency["p99"] < 100e-6
+    assert latency["late"] == 0
+
+    source.reset_latency()
+    assert source.get_latency()["count"] == 0
+
+
+def run(source, t_end):
+    volts = np.random.default_rng(0).uniform(0.0, 2.8, 1000).tolist()
+    while source.get_time() < t_end:
+        for volt in volts:
+            source.get_current(volt)
+
+
+def test_worker():
+    # Curves are built in the worker, which keeps ahead of a fast clock.
+    system = make_system(200, drop=2.0)
+    source = RealTimeSource(system, speed=20.0)
+    source.start()
+    run(source, 20.0)
+    source.stop()
+
+    assert source._buffers[0][0] >= 19
+    assert len(system._sys_cache) == 0
+    assert source.get_latency()["late"] == 0
+
+    # The curves match those built in this process.
+    idx = source._buffers[0][0]
+    assert source._buffers[0][3](2.5) == system.get_sys_curve(idx).get_current(2.5)
+
+
+@pytest.mark.benchmark
+@pytest.mark.skipif(os.cpu_count() < 2, reason="Builds need a core of their own.")
+def test_build_latency():
+    system = make_system(200, drop=2.0)
+    source = RealTimeSource(system, speed=20.0)
+    source.start()
+    run(source, 20.0)
+    source.stop()
+
+    # Builds run in another process, and never hold up a query.
+    latency = source.get_latency()
+    assert latency["late"] == 0
+    assert latency["max"] < 4e-3
@@ -0,0 +1,53 @@
+"""
+@file       test_scheduler.py
+@author     Matthew Yu (matthewjkyu@gmail.com)
+@brief      Tests for the multi-rate scheduler.
+@version    0.4.0
+@date       2026-10-19
+"""
+
+import sys
+
+sys.path.extend(["."])
+
+import pytest
+
+from simulation.scheduler import Scheduler
+
+
+def test_rates():
+    calls = []
+    scheduler = Scheduler(resolution=1e-6)
+    scheduler.add_periodic(lambda t: calls.append(("fast", t)), 1e-3, priority=1)
+    scheduler.add_periodic(
+        lambda t: calls.append(("slow", t)), 1e-2, offset=1e-3, priority=2
+    )
+    scheduler.add_events(lambda t: calls.append(("event", t)), [0.0, 0.005, 1.0])
+
+    assert scheduler.run(0.0, 0.02) == 20 + 2 + 2
+
+    names = [name for name, _ in calls]
+    assert names.count("fast") == 20
+    assert names.count("slow") == 2
+    assert names.count("event") == 2
+
+    # Tasks due together run by priority, in time order overall.
+    assert calls[0] == ("event", 0.0) and calls[1] == ("fast", 0.0)
+    assert calls.index(("fast", 0.001)) < calls.index(("slow", 0.001))
+    assert [t for _, t in calls] == sorted(t for _, t in calls)
+
+
+def test_no_drift():
+    times = []
+    scheduler = Scheduler()
+    scheduler.add_periodic(times.append, 0.1)
+    scheduler.run(0.0, 1000.0)
+
+    assert len(times) == 10000
+    assert times[-1] == pytest.approx(999.9, abs=1e-9)
+
+
+def test_invalid():
+    scheduler = Scheduler(resolution=1e-3)
+    with pytest.raises(Exception):
+        scheduler.add_periodic(print, 1e-6)
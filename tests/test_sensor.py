@@ -0,0 +1,104 @@
+"""
+@file       test_sensor.py
+@author     Matthew Yu (matthewjkyu@gmail.com)
+@brief      Tests for the sensor noise and ADC models.
+@version    0.4.0
+@date       2026-10-19
+"""
+
+import sys
+
+sys.path.extend(["."])
+
+import numpy as np
+import pytest
+
+from common.rng import BlockRNG
+from converter.sensor.sensor import LoadSensor, SensorChannel, SourceSensor
+
+
+def test_rng():
+    # Seeded streams reproduce, and differ between stream IDs.
+    a = BlockRNG(seed=1, stream=0, block_size=100)
+    b = BlockRNG(seed=1, stream=0, block_size=100)
+    c = BlockRNG(seed=1, stream=1, block_size=100)
+
+    samples = [a.normal() for _ in range(150)]
+    assert samples == b.normals(150).tolist()
+    assert samples[:10] != c.normals(10).tolist()
+
+    # Draws are standard normal.
+    draws = BlockRNG(seed=2).normals(100000)
+    assert np.mean(draws) == pytest.approx(0.0, abs=0.02)
+    assert np.std(draws) == pytest.approx(1.0, abs=0.02)
+
+
+def test_ideal():
+    sensor = SourceSensor(None)
+    sensor.sample(1.5, 2.5)
+    assert sensor.get_voltage() == 1.5 and sensor.get_current() == 2.5
+
+    sensor.sample(np.array([1.0, 2.0]), np.array([3.0, 4.0]))
+    assert sensor.get_voltage().tolist() == [1.0, 2.0]
+
+
+def test_channel():
+    # Gain and offset error.
+    channel = SensorChannel(offset=0.1, gain=1.1)
+    assert channel.measure(1.0) == pytest.approx(1.2)
+
+    # Quantization to the ADC, which clips to its span.
+    channel = SensorChannel(bits=2, span=[0.0, 4.0])
+    assert channel.measure(1.4) == 1.0
+    assert channel.measure(1.6) == 2.0
+    assert channel.measure(9.0) == 4.0
+    assert channel.measure(np.array([1.4, 1.6, -1.0])).tolist() == [1.0, 2.0, 0.0]
+
+    # Noise.
+    channel = SensorChannel(noise=0.5, rng=BlockRNG(seed=3))
+    readings = channel.measure(np.full(100000, 2.0))
+    assert np.mean(readings) == pytest.approx(2.0, abs=0.01)
+    assert np.std(readings) == pytest.approx(0.5, abs=0.01)
+
+
+def test_reproducible():
+    # Scalar and batch readings draw from the same stream.
+    scalar = SensorChannel(noise=0.1, rng=BlockRNG(seed=4))
+    batch = SensorChannel(noise=0.1, rng=BlockRNG(seed=4))
+    readings = [scalar.measure(1.0) for _ in range(10)]
+    assert readings == pytest.approx(batch.measure(np.ones(10)).tolist())
+
+
+def test_setup():
+    # Each setup restarts the noise, so repeated runs read the same values.
+    sensor = SourceSensor(
+        None,
+        voltage=SensorChannel(noise=0.1, rng=BlockRNG(block_size=16)),
+        current=SensorChannel(noise=0.1, bits=8, span=[0.0, 10.0]),
+    )
+    runs = []
+    for _ in range(2):
+        sensor.setup()
+        readings = []
+        for _ in range(40):
+            sensor.sample(1.0, 5.0)
+            readings.append((sensor.get_voltage(), sensor.get_current()))
+        sensor.sample(np.ones(8), np.full(8, 5.0))
+        readings.append((sensor.get_voltage().tolist(), sensor.get_current().tolist()))
+        runs.append(readings)
+
+    assert runs[0] == runs[1]
+    assert len(set(voltage for voltage, _ in runs[0][:40])) == 40
+
+
+def test_hold():
+    sensor = LoadSensor(None, voltage=SensorChannel(offset=1.0), hold=3)
+    values = []
+    for volt in range(6):
+        sensor.sample(float(volt), 0.0)
+        values.append(sensor.get_voltage())
+    assert values == [1.0, 1.0, 1.0, 4.0, 4.0, 4.0]
+
+    sensor.setup()
+    sensor.sample(10.0, 0.0)
+    assert sensor.get_voltage() == 11.0
@@ -0,0 +1,251 @@
+"""
+@file       test_server.py
+@author     Matthew Yu (matthewjkyu@gmail.com)
+@brief      Tests for the co-simulation server.
+@version    0.4.0
+@date       2026-10-19
+"""
+
+import sys
+
+sys.path.extend(["."])
+
+import asyncio
+import os
+import struct
+import tempfile
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from environment.environment import Environment
+from pv.cell.three_param_cell import ThreeParamCell
+from pv.pv_system import PVSystem
+from simulation.server import (
+    OP_ERROR,
+    REQUEST,
+    RESPONSE,
+    CoSimClient,
+    CoSimServer,
+    pack_request,
+)
+
+
+@pytest.fixture
+def setup():
+    # Irradiance drops once a second for 10 seconds.
+    voxels = [
+        [x, 0, t, 1000.0 - 20.0 * t, 298.15] for x in range(4) for t in range(10)
+    ]
+    env = Environment()
+    env.add_voxels(*np.transpose(voxels))
+
+    params = {
+        "ref_irrad": 1000.0,  # W/m^2
+        "ref_temp": 298.15,  # Kelvin
+        "ref_voc": 0.721,  # Volts
+        "ref_isc": 6.15,  # Amps
+        "fit_fwd_ideality_factor": 1.294,
+        "fit_rev_ideality_factor": 2,
+        "fit_rev_sat_curr": 1 * 10**-5,
+    }
+
+    system = PVSystem(env=env)
+    for x in range(4):
+        system.add_pv(x, ThreeParamCell(params=params), x, 0)
+
+    yield system
+
+
+def test_protocol(setup):
+    system = setup
+    frame = pack_request(7, 2.5, [1.0, 2.0])
+    assert len(frame) == REQUEST.size + 16
+    assert REQUEST.unpack(frame[: REQUEST.size]) == (1, 7, 2, 2.5)
+
+    server = CoSimServer(system, cache_size=2)
+    points = server.query(2.5, np.array([1.0, 2.0]))
+    curve = system.get_sys_curve(2)
+    assert points[:, 1].tolist() == [curve.get_current(1.0), curve.get_current(2.0)]
+    assert points[:, 2] == pytest.approx(points[:, 0] * points[:, 1])
+
+    # Curves are kept per environment time.
+    for t in [0.0, 1.0, 0.5, 2.0]:
+        server.get_curve(t)
+    assert list(server._curves) == [0, 2]
+
+    # Times before the environment have no curve.
+    with pytest.raises(Exception, match="before the first time"):
+        server.get_curve(-0.5)
+    with pytest.raises(Exception, match="at least one curve"):
+        CoSimServer(system, cache_size=0)
+
+
+def test_clients(setup):
+    system = setup
+    server = CoSimServer(system)
+    expected = [system.get_sys_curve(t).get_current(2.5) for t in range(10)]
+
+    async def run_client(port, seed):
+        client = CoSimClient()
+        await client.connect(port=port)
+        times = np.random.default_rng(seed).uniform(0.0, 10.0, 100)
+        responses = await client.query_many(
+            [(t, np.full(16, 2.5)) for t in times]
+        )
+        await client.close()
+        return [
+            points[:, 1] == pytest.approx(expected[int(t)])
+            for t, points in zip(times, responses)
+        ]
+
+    async def run():
+        host, port = await server.start()
+        results = await asyncio.gather(*[run_client(port, seed) for seed in range(8)])
+        await server.stop()
+        return results
+
+    results = asyncio.run(run())
+    assert all(all(result) for result in results)
+    assert server.num_requests == 800
+    assert server.num_points == 12800
+
+
+def test_unix_socket(setup):
+    system = setup
+    server = CoSimServer(system)
+
+    async def run(path):
+        await server.start(path=path)
+        client = CoSimClient()
+        await client.connect(path=path)
+        points = await client.query(0.0, [2.5])
+
+        # Unknown ops are answered with an error, and the connection lives on.
+        client._writer.write(REQUEST.pack(9, 5, 1, 0.0) + struct.pack("<d", 1.0))
+        op, req_id, num = RESPONSE.unpack(
+            await client._reader.readexactly(RESPONSE.size)
+        )
+        message = await client._reader.readexactly(num)
+        again = await client.query(0.0, [2.5])
+
+        await client.close()
+        await server.stop()
+        return points, (op, req_id, message), again
+
+    with tempfile.TemporaryDirectory() as dir:
+        points, error, again = asyncio.run(run(os.path.join(dir, "cosim.sock")))
+
+    assert points[0, 1] == system.get_sys_curve(0).get_current(2.5)
+    assert error == (OP_ERROR, 5, b"Unknown op 9.")
+    assert again.tolist() == points.tolist()
+
+
+def test_query_error():
+    # The last cell has no voxel at the second time.
+    voxels = [
+        [x, 0, t, 1000.0, 298.15]
+        for x in range(4)
+        for t in range(3)
+        if (x, t) != (3, 1)
+    ]
+    env = Environment()
+    env.add_voxels(*np.transpose(voxels))
+
+    params = {
+        "ref_irrad": 1000.0,  # W/m^2
+        "ref_temp": 298.15,  # Kelvin
+        "ref_voc": 0.721,  # Volts
+        "ref_isc": 6.15,  # Amps
+        "fit_fwd_ideality_factor": 1.294,
+        "fit_rev_ideality_factor": 2,
+        "fit_rev_sat_curr": 1 * 10**-5,
+    }
+
+    system = PVSystem(env=env)
+    for x in range(4):
+        system.add_pv(x, ThreeParamCell(params=params), x, 0)
+    server = CoSimServer(system)
+
+    async def run():
+        host, port = await server.start()
+        client = CoSimClient()
+        await client.connect(port=port)
+
+        # A time missing a voxel is answered with an error, and the
+        # connection lives on.
+        with pytest.raises(Exception, match="Voxel does not exist"):
+            await client.query(1.0, [2.5])
+        with pytest.raises(Exception, match="before the first time"):
+            await client.query(-1.0, [2.5])
+        points = await client.query(2.0, [2.5])
+
+        await client.close()
+        await server.stop()
+        return points
+
+    points = asyncio.run(run())
+    assert points[0, 1] == system.get_sys_curve(2).get_current(2.5)
+    assert server.num_requests == 1
+
+
+def test_build_off_loop(setup):
+    system = setup
+    server = CoSimServer(system)
+    server.get_curve(0.0)
+
+    # Hold the build of a new curve until a cached curve has been served.
+    release = threading.Event()
+    get_sys_curve = system.get_sys_curve
+
+    def blocked_get_sys_curve(time, num_points):
+        assert release.wait(5.0)
+        return get_sys_curve(time, num_points)
+
+    system.get_sys_curve = blocked_get_sys_curve
+
+    async def run():
+        host, port = await server.start()
+        slow, fast = CoSimClient(), CoSimClient()
+        await slow.connect(port=port)
+        await fast.connect(port=port)
+
+        building = asyncio.create_task(slow.query(5.0, [2.5]))
+        points = await fast.query(0.0, [2.5])
+        assert not building.done()
+        release.set()
+        built = await building
+
+        await slow.close()
+        await fast.close()
+        await server.stop()
+        return points, built
+
+    points, built = asyncio.run(run())
+    assert points[0, 1] == get_sys_curve(0).get_current(2.5)
+    assert built[0, 1] == get_sys_curve(5).get_current(2.5)
+
+
+@pytest.mark.benchmark
+def test_throughput(setup):
+    system = setup
+    server = CoSimServer(system)
+
+    async def run():
+        host, port = await server.start()
+        client = CoSimClient()
+        await client.connect(port=port)
+        await client.query(0.0, [2.5])
+
+        start = time.perf_counter()
+        requests = [(0.0, [2.5])] * 20000
+        await client.query_many(requests)
+        elapsed = time.perf_counter() - start
+
+        await client.close()
+        await server.stop()
+        return 20000 / elapsed
+
+    assert asyncio.run(run()) > 10000
@@ -0,0 +1,166 @@
+"""
+@file       test_simulator.py
+@author     Matthew Yu (matthewjkyu@gmail.com)
+@brief      Tests for the converter co-simulation.
+@version    0.4.0
+@date       2026-10-19
+"""
+
+import sys
+
+sys.path.extend(["."])
+
+import time
+
+import numpy as np
+import pytest
+
+from converter.controller.controller import Controller
+from converter.controller.mppt_algorithms.mppt_alg import MPPTAlg
+from converter.controller.mppt_algorithms.perturb_observe import PerturbObserve
+from converter.converter import Converter
+from environment.environment import Environment
+from pv.cell.three_param_cell import ThreeParamCell
+from pv.operating_curve import OperatingCurveBatch
+from pv.pv_system import PVSystem
+from simulation.simulator import Simulator
+
+
+@pytest.fixture
+def setup():
+    # Irradiance drops once a second for 10 seconds.
+    voxels = [
+        [x, 0, t, 1000.0 - 20.0 * t, 298.15] for x in range(4) for t in range(10)
+    ]
+    env = Environment()
+    env.add_voxels(*np.transpose(voxels))
+
+    params = {
+        "ref_irrad": 1000.0,  # W/m^2
+        "ref_temp": 298.15,  # Kelvin
+        "ref_voc": 0.721,  # Volts
+        "ref_isc": 6.15,  # Amps
+        "fit_fwd_ideality_factor": 1.294,
+        "fit_rev_ideality_factor": 2,
+        "fit_rev_sat_curr": 1 * 10**-5,
+    }
+
+    system = PVSystem(env=env)
+    for x in range(4):
+        system.add_pv(x, ThreeParamCell(params=params), x, 0)
+
+    yield system
+
+
+def test_run(setup):
+    system = setup
+    sim = Simulator(
+        system,
+        converter=Converter(tau=1e-3),
+        controller=Controller(MPPTAlg(v_ref=2.5)),
+        dt=1e-4,
+    )
+
+    df = sim.run(0, 2, stride=10)
+    assert len(df) == 2000
+    assert df["Time (s)"].iloc[1] == pytest.approx(1e-3)
+
+    # The process settles onto the reference, and the source is on its curve.
+    settled = df.iloc[999]
+    assert settled["Voltage (V)"] == pytest.approx(2.5)
+    assert settled["Current (A)"] == pytest.approx(
+        system.get_sys_curve(0).get_current(2.5)
+    )
+    assert system.get_sys_voltages([settled["Current (A)"]], 0)[0] == pytest.approx(
+        2.5, abs=1e-3
+    )
+
+    # Conditions change at 1 second.
+    assert df["Current (A)"].iloc[-1] < settled["Current (A)"]
+
+
+def test_operations(setup, monkeypatch):
+    system = setup
+    sim = Simulator(
+        system,
+        controller=Controller(PerturbObserve(v_ref=2.5, stride=0.01)),
+        dt=1e-4,
+    )
+
+    # The PV models are only evaluated once per change of environment, never
+    # per step.
+    calls = []
+    build = system._build_sys_curve
+    monkeypatch.setattr(
+        system, "_build_sys_curve", lambda *args: calls.append(args) or build(*args)
+    )
+    df = sim.run(0, 10, stride=100)
+    assert len(df) == 1000
+    assert len(calls) == 10
+
+
+@pytest.mark.benchmark
+def test_throughput(setup):
+    system = setup
+    sim = Simulator(
+        system,
+        controller=Controller(PerturbObserve(v_ref=2.5, stride=0.01)),
+        dt=1e-4,
+    )
+
+    start = time.perf_counter()
+    df = sim.run(0, 10, stride=100)
+    rate = 100000 / (time.perf_counter() - start)
+    assert len(df) == 1000
+    assert rate > 100000
+
+
+def test_run_scheduled(setup):
+    system = setup
+    sim = Simulator(
+        system,
+        converter=Converter(tau=1e-5),
+        controller=Controller(MPPTAlg(v_ref=2.5)),
+        dt=1e-5,
+    )
+
+    # The controller runs at a tenth of the converter rate.
+    df = sim.run_scheduled(0, 2, controller_dt=1e-4, stride=100)
+    assert len(df) == 2000
+    assert df["Reference (V)"].iloc[0] == 0.0
+    assert df["Reference (V)"].iloc[-1] == 2.5
+
+    # Operating points are held between measured times.
+    held = df[df["Time (s)"] == 0.5]["Current (A)"].iloc[0]
+    assert held == pytest.approx(system.get_sys_curve(0).get_current(2.5))
+
+    # Or interpolated between them.
+    df = sim.run_scheduled(0, 2, controller_dt=1e-4, interp=True, stride=100)
+    blend = df[df["Time (s)"] == 0.5]["Current (A)"].iloc[0]
+    assert blend == pytest.approx(
+        (
+            system.get_sys_curve(0).get_current(2.5)
+            + system.get_sys_curve(1).get_current(2.5)
+        )
+        / 2
+    )
+
+
+def test_run_batch(setup):
+    system = setup
+    curves = OperatingCurveBatch.from_curves(
+        [system.get_sys_curve(time) for time in range(10)]
+    )
+    sim = Simulator(
+        system,
+        converter=Converter(tau=1e-6),
+        controller=Controller(PerturbObserve(v_ref=1.0, stride=0.01)),
+    )
+
+    trace = sim.run_batch(curves, 1000, stride=10)
+    assert trace["Time (s)"].shape == (100,)
+    assert trace["Power (W)"].shape == (100, 10)
+
+    # Every scenario is tracked to its own maximum power point.
+    efficiency = trace["Power (W)"][-10:].mean(axis=0) / curves.p_mpp
+    assert np.all(efficiency > 0.99)
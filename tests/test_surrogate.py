@@ -0,0 +1,89 @@
+"""
+@file       test_surrogate.py
+@author     Matthew Yu (matthewjkyu@gmail.com)
+@brief      Tests for the cell lookup table surrogate.
+@version    0.4.0
+@date       2026-10-19
+"""
+
+import sys
+
+sys.path.extend(["."])
+
+import numpy as np
+import pytest
+
+from pv.cell.surrogate import CellSurrogate
+from pv.cell.three_param_cell import ThreeParamCell
+
+
+@pytest.fixture
+def setup():
+    params = {
+        "ref_irrad": 1000.0,  # W/m^2
+        "ref_temp": 298.15,  # Kelvin
+        "ref_voc": 0.721,  # Volts
+        "ref_isc": 6.15,  # Amps
+        "fit_fwd_ideality_factor": 1.294,
+        "fit_rev_ideality_factor": 2,
+        "fit_rev_sat_curr": 1 * 10**-5,
+    }
+
+    surrogate = CellSurrogate.build(
+        ThreeParamCell(params=params),
+        volt_range=[-0.5, 0.8],
+        num_irrad=10,
+        num_temp=6,
+        num_volt=200,
+        workers=1,
+    )
+
+    yield params, surrogate
+
+
+def test_error_bound(setup):
+    params, surrogate = setup
+
+    cell = ThreeParamCell(params=params)
+    rng = np.random.default_rng(0)
+    for _ in range(50):
+        volt = rng.uniform(-0.5, 0.8)
+        irrad = rng.uniform(100, 1000)
+        temp = rng.uniform(273.15, 398.15)
+        exact = cell.get_current(volt, [irrad], [temp])
+        approx = surrogate.get_currents(volt, irrad, temp)
+        assert approx == pytest.approx(exact, abs=surrogate.error)
+
+
+def test_set_surrogate(setup):
+    params, surrogate = setup
+
+    cell = ThreeParamCell(params=params)
+    cell.set_surrogate(surrogate)
+    assert cell.get_current(0.0, [1000], [298.15]) == pytest.approx(6.15, abs=0.05)
+
+    with pytest.raises(Exception):
+        cell.get_current(0.0, [10], [298.15])
+
+    # Voltages past the table are not clamped to its edge.
+    assert surrogate.get_currents([-0.5, 0.8], 1000, 298.15).shape == (2,)
+    with pytest.raises(Exception):
+        cell.get_current(0.9, [1000], [298.15])
+    with pytest.raises(Exception):
+        surrogate.get_currents([0.0, -0.6], 1000, 298.15)
+
+    other = ThreeParamCell(params={**params, "ref_isc": 5.0})
+    with pytest.raises(Exception):
+        other.set_surrogate(surrogate)
+
+
+def test_save_load(setup, tmp_path):
+    _, surrogate = setup
+
+    file_path = tmp_path / "surrogate.npz"
+    surrogate.save(file_path)
+    loaded = CellSurrogate.load(file_path)
+
+    assert loaded.key == surrogate.key
+    assert loaded.error == surrogate.error
+    assert np.array_equal(loaded.table, surrogate.table)
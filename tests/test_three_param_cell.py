@@ -111,6 +111,23 @@ def test_fit_data(setup):
     params = cell.fit_params(irradiance=1000, temperature=298.15)
 
 
+def test_state(setup):
+    _, params, _ = setup
+
+    cell = ThreeParamCell(params=params)
+    curr = cell.get_current(0.5, [1000], [298.15])
+    state = cell._get_state(1000, 298.15)
+    assert cell._get_state(1000, 298.15) is state
+
+    # Rebinding the parameters, as fitting does, drops the state.
+    cell._params = cell._params.replace(fit_fwd_ideality_factor=1.5)
+    assert cell._get_state(1000, 298.15) is not state
+    assert cell.get_current(0.5, [1000], [298.15]) != curr
+
+    with pytest.raises(Exception):
+        cell.get_current(0.5, [0.0], [298.15])
+
+
 if __name__ == "__main__":
     env = Environment()
     env.add_voxel(0, 0, 0, 1000, 273.15)